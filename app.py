@@ -4,10 +4,17 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from datetime import datetime, timedelta
 from backend.models.models import db
+from backend.migrations import run_migrations
 from backend.routes.auth_routes import auth_bp
 from backend.routes.user_routes import user_bp
 from backend.routes.admin_routes import admin_bp
+from backend.config import load_config, init_database
 from backend.cache import init_cache
+from backend.ingestion import init_ingestion
+from backend.leaderboards import init_leaderboards
+from backend.passwords import init_passwords
+from backend.search import init_search
+from backend.suggestions import init_suggestions
 from celery_app import make_celery
 import os
 
@@ -26,8 +33,8 @@ def create_app():
     
     # Configuration
     app.config['SECRET_KEY'] = 'your-secret-key-here'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///quizmaster.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Database engine profile: DATABASE_PROFILE=sqlite|sqlite-wal|postgres
+    load_config(app)
     app.config['JWT_SECRET_KEY'] = 'jwt-secret-key'
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
     app.config['JWT_TOKEN_LOCATION'] = ['headers']
@@ -40,14 +47,43 @@ def create_app():
     app.config['REDIS_HOST'] = 'localhost'
     app.config['REDIS_PORT'] = 6379
     app.config['REDIS_CACHE_DB'] = 1
+    app.config['REDIS_QUEUE_DB'] = 2
+    app.config['REDIS_LEADERBOARD_DB'] = 3
+    app.config['REDIS_MAX_CONNECTIONS'] = 50
+    app.config['CACHE_SERIALIZER'] = os.environ.get('CACHE_SERIALIZER', 'orjson')
+    
+    # In-process cache tier in front of Redis (per worker, pub/sub invalidated)
+    app.config['LOCAL_CACHE_ENABLED'] = True
+    app.config['LOCAL_CACHE_MAX_ENTRIES'] = 2048
+    app.config['LOCAL_CACHE_TTL'] = 30
+    
+    # Bearer token metrics scrapers send to /api/admin/cache/metrics; unset closes it
+    app.config['METRICS_SCRAPE_TOKEN'] = os.environ.get('METRICS_SCRAPE_TOKEN')
+    
+    # 'sync' commits each submission; 'queue' acknowledges and writes in batches
+    app.config['SUBMISSION_INGESTION_MODE'] = os.environ.get('SUBMISSION_INGESTION_MODE', 'sync')
+    
+    # Password hashing: logins over the queue limit get a 503 with Retry-After
+    app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    app.config['PASSWORD_HASH_QUEUE_LIMIT'] = app.config['PASSWORD_HASH_WORKERS'] * 16
+    app.config['PASSWORD_HASH_TIMEOUT'] = 10
+    app.config['PASSWORD_HASH_RETRY_AFTER'] = 2
     
     # Initialize extensions
-    db.init_app(app)
+    init_database(app, db)
     jwt = JWTManager(app)
     CORS(app)
     
+    # Hashing workers fork first, before the cache listener threads start
+    init_passwords(app)
+    
     # Initialize cache
     init_cache(app)
+    init_ingestion(app)
+    init_search(app)
+    init_suggestions(app)
+    init_leaderboards(app)
     
     # JWT Error Handlers
     @jwt.expired_token_loader
@@ -202,7 +238,7 @@ app = create_app()
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        run_migrations()
     print("🚀 Starting Quiz Master API on port 5001...")
     print("📱 Frontend: http://localhost:8080")
     print("🔧 Backend API: http://localhost:5001")
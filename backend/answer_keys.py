@@ -0,0 +1,108 @@
+# backend/answer_keys.py - Precompiled answer keys for quiz grading
+
+import threading
+from array import array
+from backend.models.models import db, Question
+from backend.cache import get_cache, set_cache, delete_cache, CacheKeys, CacheExpiry
+
+# In-process tier: quiz_id -> AnswerKey, bounded so it cannot grow without limit
+MAX_LOCAL_KEYS = 1024
+_local_keys = {}
+_local_keys_lock = threading.Lock()  # Request threads evict concurrently
+
+class AnswerKey:
+    """Immutable, array-backed answer key for one quiz version"""
+
+    __slots__ = ('quiz_id', 'version', 'question_ids', 'correct_options')
+
+    def __init__(self, quiz_id, version, question_ids, correct_options):
+        object.__setattr__(self, 'quiz_id', quiz_id)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'question_ids', array('q', question_ids))
+        object.__setattr__(self, 'correct_options', bytes(correct_options))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('AnswerKey is immutable')
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def grade(self, answers):
+        """Grade {question_id (str): 0-based option} in one pass
+
+        Returns (correct_answers, detailed_results).
+        """
+        correct_answers = 0
+        detailed_results = []
+        for question_id, correct_option in zip(self.question_ids, self.correct_options):
+            user_answer_index = answers.get(str(question_id))
+
+            is_correct = False
+            user_option = None
+            if user_answer_index is not None:
+                user_option = user_answer_index + 1
+                is_correct = user_option == correct_option
+                if is_correct:
+                    correct_answers += 1
+
+            detailed_results.append({
+                'question_id': question_id,
+                'correct_option': correct_option,
+                'user_answer': user_option,
+                'is_correct': is_correct
+            })
+        return correct_answers, detailed_results
+
+    def to_payload(self):
+        return {
+            'version': self.version,
+            'question_ids': self.question_ids.tolist(),
+            'correct_options': list(self.correct_options)
+        }
+
+def answer_key_version(quiz):
+    """Version of a quiz's answer key
+
+    Question create/delete routes bump updated_at and question_count, and
+    update_question bumps updated_at, so any change yields a new version.
+    """
+    updated_at = quiz.updated_at.isoformat() if quiz.updated_at else ''
+    return f"{updated_at}:{quiz.question_count or 0}"
+
+def answer_key_cache_key(quiz_id):
+    return f"{CacheKeys.ANSWER_KEY}:{quiz_id}"
+
+def build_answer_key(quiz_id, version):
+    """Build an answer key from (question_id, correct_option) columns only"""
+    rows = db.session.query(Question.question_id, Question.correct_option).filter(
+        Question.quiz_id == quiz_id
+    ).order_by(Question.question_id).all()
+    return AnswerKey(quiz_id, version, [row[0] for row in rows], [row[1] for row in rows])
+
+def get_answer_key(quiz):
+    """Get the answer key for a quiz from process memory, Redis or the database"""
+    version = answer_key_version(quiz)
+
+    key = _local_keys.get(quiz.quiz_id)
+    if key is not None and key.version == version:
+        return key
+
+    payload = get_cache(answer_key_cache_key(quiz.quiz_id))
+    if payload and payload.get('version') == version:
+        key = AnswerKey(quiz.quiz_id, version, payload['question_ids'], payload['correct_options'])
+    else:
+        key = build_answer_key(quiz.quiz_id, version)
+        set_cache(answer_key_cache_key(quiz.quiz_id), key.to_payload(), CacheExpiry.VERY_LONG)
+
+    with _local_keys_lock:
+        if len(_local_keys) >= MAX_LOCAL_KEYS and quiz.quiz_id not in _local_keys:
+            # Drop the oldest entry (dicts keep insertion order)
+            _local_keys.pop(next(iter(_local_keys)), None)
+        _local_keys[quiz.quiz_id] = key
+    return key
+
+def invalidate_answer_key(quiz_id):
+    """Drop a quiz's answer key from both tiers"""
+    with _local_keys_lock:
+        _local_keys.pop(quiz_id, None)
+    delete_cache(answer_key_cache_key(quiz_id))
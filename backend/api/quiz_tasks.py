@@ -3,17 +3,30 @@
 from celery_app import celery
 from datetime import datetime, timedelta
 from backend.models.models import db, Quiz, User, Score
+from backend.cache import invalidate_subject_cache, clear_cache_pattern
+from backend.grading import grade_and_save_batch
+from backend.ingestion import is_queue_enabled, drain_submission_stream
+from backend.cache_warmup import warm_cache, WARMUP_HOURS_AHEAD, WARMUP_CONCURRENCY
+from backend.user_import import import_users
+from backend.leaderboards import is_leaderboard_enabled, rebuild_leaderboards
+import io
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Quizzes locked per UPDATE statement by the expiry sweep
+EXPIRY_SWEEP_BATCH_SIZE = 500
+
 @celery.task(bind=True)
 def check_and_expire_quizzes(self):
     """
     Background task to automatically expire quizzes
     Runs every 2 minutes via Celery Beat
+
+    Request handlers only compute expiry, so this sweep is the one place
+    that persists is_active=False, using batched UPDATE statements.
     """
     try:
         logger.info(f"[{datetime.now()}] Starting quiz expiry check...")
@@ -21,24 +34,22 @@ def check_and_expire_quizzes(self):
         # Find all active quizzes that should be expired
         now = datetime.utcnow()
         
-        # Get quizzes that should be expired
-        expired_quizzes = Quiz.query.filter(
+        # Get quizzes that should be expired (only the columns the sweep needs)
+        candidates = db.session.query(
+            Quiz.quiz_id, Quiz.title, Quiz.chapter_id, Quiz.end_date_time, Quiz.grace_period
+        ).filter(
             Quiz.is_active == True,
             Quiz.auto_expire == True,
             Quiz.end_date_time.isnot(None),
             Quiz.end_date_time <= now
         ).all()
         
-        expired_count = 0
         locked_quizzes = []
         
-        for quiz in expired_quizzes:
-            # Double-check expiry with model method
-            if quiz.is_expired():
-                quiz.is_active = False
-                quiz.updated_at = now
-                expired_count += 1
-                
+        for quiz in candidates:
+            # Double-check expiry including the grace period
+            effective_end = quiz.end_date_time + timedelta(minutes=quiz.grace_period or 0)
+            if now > effective_end:
                 locked_quizzes.append({
                     'quiz_id': quiz.quiz_id,
                     'title': quiz.title,
@@ -48,9 +59,20 @@ def check_and_expire_quizzes(self):
                 
                 logger.info(f" Locked expired quiz: {quiz.title} (ID: {quiz.quiz_id})")
         
+        # Lock in batches within a single transaction
+        expired_count = 0
+        quiz_ids = [quiz['quiz_id'] for quiz in locked_quizzes]
+        for start in range(0, len(quiz_ids), EXPIRY_SWEEP_BATCH_SIZE):
+            batch = quiz_ids[start:start + EXPIRY_SWEEP_BATCH_SIZE]
+            expired_count += Quiz.query.filter(
+                Quiz.quiz_id.in_(batch),
+                Quiz.is_active == True
+            ).update({Quiz.is_active: False, Quiz.updated_at: now}, synchronize_session=False)
+        
         # Commit all changes
         if expired_count > 0:
             db.session.commit()
+            invalidate_subject_cache()
             logger.info(f"  📊 Total quizzes auto-locked: {expired_count}")
         else:
             logger.info("  ℹ️  No quizzes needed to be expired")
@@ -236,6 +258,164 @@ def expire_single_quiz(quiz_id):
             'quiz_id': quiz_id
         }
 
+@celery.task(bind=True)
+def grade_submission_batch(self, quiz_id, submissions):
+    """
+    Grade a batch of submissions for one quiz and bulk-insert the scores
+    Used by exam-hall deployments that collect submissions offline
+    """
+    try:
+        quiz = Quiz.query.get(quiz_id)
+        if not quiz:
+            return {
+                'success': False,
+                'error': f'Quiz {quiz_id} not found'
+            }
+        
+        report = grade_and_save_batch(quiz, submissions)
+        logger.info(f" Batch graded quiz {quiz_id}: {report['graded']} scored, {report['skipped']} skipped")
+        
+        report['success'] = True
+        report['task_id'] = self.request.id
+        return report
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f" Error grading batch for quiz {quiz_id}: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'quiz_id': quiz_id
+        }
+
+@celery.task(bind=True)
+def drain_submissions(self):
+    """
+    Persist queued quiz submissions from the Redis stream in batches
+    Runs every 5 seconds when SUBMISSION_INGESTION_MODE is 'queue'
+    """
+    if not is_queue_enabled():
+        return {
+            'success': True,
+            'message': 'Submission queue is not enabled'
+        }
+    
+    try:
+        totals = drain_submission_stream()
+        if totals['batches']:
+            logger.info(f" Drained submissions: {totals['saved']} saved, {totals['rejected']} rejected")
+        
+        totals['success'] = True
+        totals['task_id'] = self.request.id
+        return totals
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f" Error draining submission stream: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'task_id': self.request.id
+        }
+
+@celery.task(bind=True)
+def clear_cache_pattern_task(self, pattern):
+    """
+    Clear cache entries matching a pattern with an incremental SCAN
+    Keeps the keyspace walk off the request path
+    """
+    try:
+        cleared = clear_cache_pattern(pattern)
+        logger.info(f" Cleared cache entries matching {pattern}")
+        return {
+            'success': cleared,
+            'pattern': pattern,
+            'task_id': self.request.id
+        }
+        
+    except Exception as e:
+        logger.error(f" Error clearing cache pattern {pattern}: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'pattern': pattern
+        }
+
+@celery.task(bind=True)
+def warm_cache_task(self, hours_ahead=WARMUP_HOURS_AHEAD, concurrency=WARMUP_CONCURRENCY):
+    """
+    Prefetch hot cache entries after a deploy or seed run
+    Subject list, per-subject quiz listings, upcoming quiz payloads and admin stats
+    """
+    try:
+        report = warm_cache(hours_ahead, concurrency)
+        logger.info(f" Warmed {report['warmed']} cache keys in {report['duration_seconds']}s")
+        
+        report['success'] = not report['errors']
+        report['task_id'] = self.request.id
+        return report
+        
+    except Exception as e:
+        logger.error(f" Error warming cache: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'task_id': self.request.id
+        }
+
+@celery.task(bind=True)
+def import_users_task(self, csv_text):
+    """
+    Create users from an uploaded CSV in chunked bulk inserts
+    Prefork workers hash inline; run with --pool=threads or solo for parallel hashing
+    """
+    try:
+        report = import_users(io.StringIO(csv_text))
+        logger.info(f" Imported users: {report['created']} created, {report['skipped']} skipped, {report['failed']} failed")
+        
+        report['success'] = True
+        report['task_id'] = self.request.id
+        return report
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f" Error importing users: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'task_id': self.request.id
+        }
+
+@celery.task(bind=True)
+def rebuild_leaderboards_task(self):
+    """
+    Recompute every leaderboard and quiz score distribution from the scores table
+    Repairs drift from failed incremental updates and drops boards of deleted quizzes
+    """
+    if not is_leaderboard_enabled():
+        return {
+            'success': True,
+            'message': 'Leaderboards are not enabled'
+        }
+    
+    try:
+        counts = rebuild_leaderboards()
+        logger.info(f" Rebuilt leaderboards: {counts}")
+        
+        return {
+            'success': True,
+            'boards': counts,
+            'task_id': self.request.id
+        }
+        
+    except Exception as e:
+        logger.error(f" Error rebuilding leaderboards: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e),
+            'task_id': self.request.id
+        }
+
 def get_users_with_ongoing_attempts(quiz_id):
     """
     Helper function to find users who might have ongoing quiz attempts
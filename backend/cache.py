@@ -3,29 +3,178 @@
 import redis
 import json
 import pickle
+import hashlib
+import math
+import os
+import random
+import socket
+import time
 from datetime import timedelta
 from functools import wraps
-from flask import current_app
+from flask import current_app, request, make_response
+from flask_jwt_extended import get_jwt
+from backend.local_cache import LocalCache
+from backend.cache_metrics import CacheMetrics, to_prometheus
 
-# Redis client for caching
+# orjson is optional; it writes the same JSON text several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Redis client for caching, backed by an explicit connection pool
 redis_client = None
+cache_pool = None
+
+# 'orjson' or 'json'; both produce JSON, so either can read the other's entries
+cache_serializer = 'json'
+
+# Keys per MGET/pipeline round trip in get_many/set_many
+CACHE_BATCH_SIZE = 500
+
+# In-process tier in front of Redis; kept coherent across nodes via pub/sub
+local_cache = None
+invalidation_listener = None
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Lookups that reached Redis (local hits never get here)
+redis_stats = {'hits': 0, 'misses': 0}
 
 def init_cache(app):
     """Initialize Redis cache"""
-    global redis_client
+    global redis_client, cache_pool, cache_serializer, local_cache
+    cache_serializer = app.config.get('CACHE_SERIALIZER', 'orjson' if orjson else 'json')
+    if cache_serializer == 'orjson' and orjson is None:
+        cache_serializer = 'json'
+
     try:
-        redis_client = redis.Redis(
+        cache_pool = redis.ConnectionPool(
             host=app.config.get('REDIS_HOST', 'localhost'),
             port=app.config.get('REDIS_PORT', 6379),
             db=app.config.get('REDIS_CACHE_DB', 1),  # Use DB 1 for cache
+            max_connections=app.config.get('REDIS_MAX_CONNECTIONS', 50),
+            health_check_interval=30,  # PING idle connections before reuse
+            socket_connect_timeout=2,
+            socket_timeout=2,
             decode_responses=True
         )
+        redis_client = redis.Redis(connection_pool=cache_pool)
         # Test connection
         redis_client.ping()
         print("✅ Redis cache initialized successfully")
     except Exception as e:
         print(f"⚠️  Redis cache not available: {e}")
         redis_client = None
+        cache_pool = None
+        local_cache = None
+        return
+
+    # Without the invalidation channel other nodes' writes could not reach us
+    if app.config.get('LOCAL_CACHE_ENABLED', True):
+        local_cache = LocalCache(
+            max_entries=app.config.get('LOCAL_CACHE_MAX_ENTRIES', 2048),
+            default_ttl=app.config.get('LOCAL_CACHE_TTL', 30)
+        )
+        start_invalidation_listener()
+
+def process_id():
+    # Computed per call so forked workers get distinct ids
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def apply_invalidation(message):
+    """Drop local entries named by an invalidation message"""
+    if local_cache is None:
+        return
+    if message.get('flush'):
+        local_cache.clear()
+    if message.get('keys'):
+        local_cache.delete(*message['keys'])
+    if message.get('namespace'):
+        local_cache.delete(f"{NAMESPACE_VERSION_PREFIX}:{message['namespace']}")
+        local_cache.delete_prefix(f"{message['namespace']}:")
+    if message.get('pattern'):
+        local_cache.delete_pattern(message['pattern'])
+
+def broadcast_invalidation(**message):
+    """Apply an invalidation locally and publish it to every other worker
+
+    Publishes even without a local tier here: other workers may still hold copies.
+    """
+    if not redis_client:
+        return
+    apply_invalidation(message)
+    try:
+        message['origin'] = process_id()
+        redis_client.publish(INVALIDATION_CHANNEL, serialize(message))
+    except Exception as e:
+        # Other workers fall back to their local TTL
+        print(f"Cache invalidation publish error: {e}")
+
+def start_invalidation_listener():
+    """Subscribe to the invalidation channel on a background thread"""
+    global invalidation_listener, local_cache
+
+    def on_message(message):
+        data = deserialize(message['data'])
+        if data.get('origin') != process_id():
+            apply_invalidation(data)
+
+    def on_error(error, pubsub, thread):
+        # Losing the channel means losing coherence: serve from Redis only
+        global local_cache
+        print(f"⚠️  Cache invalidation listener stopped, disabling local cache: {error}")
+        local_cache = None
+        pubsub.close()
+        thread.stop()
+
+    try:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: on_message})
+        invalidation_listener = pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=on_error
+        )
+    except Exception as e:
+        print(f"⚠️  Cache invalidation listener not available, disabling local cache: {e}")
+        local_cache = None
+
+def serialize(value):
+    """Encode a value as JSON text with the configured serializer"""
+    if cache_serializer == 'orjson':
+        # Passthrough + default=str keeps datetimes identical to json.dumps(default=str)
+        return orjson.dumps(
+            value, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(value, default=str)
+
+def deserialize(value):
+    """Decode JSON text written by either serializer"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+def load_entry(key, text, local=False):
+    """Deserialize a cached entry, recording the hit for its key prefix"""
+    start = time.perf_counter_ns()
+    value = deserialize(text)
+    cache_metrics.record(
+        key, redis_client, hits=1, local_hits=int(local), bytes_read=len(text),
+        deserialize_us=(time.perf_counter_ns() - start) // 1000
+    )
+    return value
+
+def dump_entry(key, value):
+    """Serialize an entry for storage, recording the write for its key prefix"""
+    start = time.perf_counter_ns()
+    text = serialize(value)
+    cache_metrics.record(
+        key, redis_client, sets=1, bytes_written=len(text),
+        serialize_us=(time.perf_counter_ns() - start) // 1000
+    )
+    return text
+
+def record_invalidations(keys):
+    for key in keys:
+        cache_metrics.record(key, invalidations=1)
 
 def cache_key(prefix, *args, **kwargs):
     """Generate cache key from prefix and arguments"""
@@ -42,35 +191,107 @@ def cache_key(prefix, *args, **kwargs):
     return ":".join(key_parts)
 
 def get_cache(key, default=None):
-    """Get value from cache"""
+    """Get value from cache, checking the in-process tier first"""
     if not redis_client:
         return default
     
+    if local_cache is not None:
+        text = local_cache.get(key)
+        if text is not None:
+            return load_entry(key, text, local=True)
+
     try:
-        value = redis_client.get(key)
+        # Fetch the remaining TTL too so the local copy never outlives Redis'
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        value, ttl_ms = pipe.execute()
         if value:
-            return json.loads(value)
+            redis_stats['hits'] += 1
+            if local_cache is not None and ttl_ms != -2:
+                local_cache.set(key, value, None if ttl_ms == -1 else ttl_ms / 1000)
+            return load_entry(key, value)
+        redis_stats['misses'] += 1
+        cache_metrics.record(key, redis_client, misses=1)
         return default
     except Exception as e:
         print(f"Cache get error: {e}")
         return default
 
-def set_cache(key, value, expire_seconds=300):
-    """Set value in cache with expiration"""
+def set_cache(key, value, expire_seconds=300, tags=None):
+    """Set value in cache with expiration, optionally registering it under tags"""
     if not redis_client:
         return False
     
     try:
-        redis_client.setex(
-            key,
-            expire_seconds,
-            json.dumps(value, default=str)
-        )
+        text = dump_entry(key, value)
+        redis_client.setex(key, expire_seconds, text)
+        if tags:
+            tag_cache(key, tags, expire_seconds)
+        # Other workers may hold an older copy of this key
+        broadcast_invalidation(keys=[key])
+        if local_cache is not None:
+            local_cache.set(key, text, expire_seconds)
         return True
     except Exception as e:
         print(f"Cache set error: {e}")
         return False
 
+def get_many(keys):
+    """Get several values in batched MGETs; returns {key: value} for hits only
+
+    Local hits are served in-process; Redis hits are not copied into the
+    local tier because MGET does not return their TTLs.
+    """
+    if not redis_client or not keys:
+        return {}
+
+    found = {}
+    keys = list(keys)
+    if local_cache is not None:
+        for key in keys:
+            text = local_cache.get(key)
+            if text is not None:
+                found[key] = load_entry(key, text, local=True)
+        keys = [key for key in keys if key not in found]
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for start in range(0, len(keys), CACHE_BATCH_SIZE):
+            pipe.mget(keys[start:start + CACHE_BATCH_SIZE])
+        values = [value for batch in pipe.execute() for value in batch]
+        hits = {}
+        for key, value in zip(keys, values):
+            if value:
+                hits[key] = load_entry(key, value)
+            else:
+                cache_metrics.record(key, misses=1)
+        redis_stats['hits'] += len(hits)
+        redis_stats['misses'] += len(keys) - len(hits)
+        found.update(hits)
+        return found
+    except Exception as e:
+        print(f"Cache get_many error: {e}")
+        return {}
+
+def set_many(mapping, expire_seconds=300):
+    """Set several values with one pipelined round trip per batch"""
+    if not redis_client or not mapping:
+        return False
+
+    items = list(mapping.items())
+    try:
+        for start in range(0, len(items), CACHE_BATCH_SIZE):
+            pipe = redis_client.pipeline(transaction=False)
+            for key, value in items[start:start + CACHE_BATCH_SIZE]:
+                pipe.setex(key, expire_seconds, dump_entry(key, value))
+            pipe.execute()
+        broadcast_invalidation(keys=[key for key, _ in items])
+        return True
+    except Exception as e:
+        print(f"Cache set_many error: {e}")
+        return False
+
 def delete_cache(key):
     """Delete value from cache"""
     if not redis_client:
@@ -78,57 +299,332 @@ def delete_cache(key):
     
     try:
         redis_client.delete(key)
+        record_invalidations([key])
+        broadcast_invalidation(keys=[key])
         return True
     except Exception as e:
         print(f"Cache delete error: {e}")
         return False
 
 def clear_cache_pattern(pattern):
-    """Clear cache entries matching pattern"""
+    """Clear cache entries matching pattern
+
+    Walks the keyspace incrementally with SCAN, so Redis keeps serving other
+    clients in between. Request paths should invalidate namespaces or tags
+    instead; run this from a background task.
+    """
     if not redis_client:
         return False
     
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
+        batch = []
+        for key in redis_client.scan_iter(match=pattern, count=CACHE_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= CACHE_BATCH_SIZE:
+                redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            redis_client.unlink(*batch)
+        cache_metrics.record(pattern, invalidations=1)
+        broadcast_invalidation(pattern=pattern)
         return True
     except Exception as e:
         print(f"Cache clear pattern error: {e}")
         return False
 
-def cache_decorator(prefix, expire_seconds=300):
-    """Decorator for caching function results"""
+def clear_all_cache():
+    """Drop every entry in the cache database without blocking Redis"""
+    if not redis_client:
+        return False
+
+    try:
+        # The cache has its own Redis DB, so flushing it touches nothing else
+        redis_client.flushdb(asynchronous=True)
+        broadcast_invalidation(flush=True)
+        return True
+    except Exception as e:
+        print(f"Cache clear error: {e}")
+        return False
+
+# ============= NAMESPACES AND TAGS =============
+#
+# Namespaced keys embed a version counter: {namespace}:v{version}:...
+# Bumping the counter makes every old entry unreachable in O(1); they then
+# age out through their TTLs. Tags are Redis sets of keys, for invalidating
+# a specific group of entries in O(tagged keys).
+
+NAMESPACE_VERSION_PREFIX = "cache:version"
+TAG_PREFIX = "cache:tag"
+
+def get_namespace_version(namespace):
+    """Current version of a namespace (0 until first invalidated)"""
+    if not redis_client:
+        return 0
+
+    version_key = f"{NAMESPACE_VERSION_PREFIX}:{namespace}"
+    if local_cache is not None:
+        version = local_cache.get(version_key)
+        if version is not None:
+            return int(version)
+
+    try:
+        version = int(redis_client.get(version_key) or 0)
+        if local_cache is not None:
+            local_cache.set(version_key, str(version))
+        return version
+    except Exception as e:
+        print(f"Cache version error: {e}")
+        return 0
+
+def versioned_key(namespace, *args, **kwargs):
+    """Cache key inside the current version of a namespace"""
+    return cache_key(f"{namespace}:v{get_namespace_version(namespace)}", *args, **kwargs)
+
+def invalidate_namespace(namespace):
+    """Invalidate every entry of a namespace by bumping its version"""
+    if not redis_client:
+        return False
+
+    try:
+        redis_client.incr(f"{NAMESPACE_VERSION_PREFIX}:{namespace}")
+        cache_metrics.record(f"{namespace}:", invalidations=1)
+        broadcast_invalidation(namespace=namespace)
+        return True
+    except Exception as e:
+        print(f"Cache namespace invalidation error: {e}")
+        return False
+
+def tag_cache(key, tags, expire_seconds=300):
+    """Register a cached key under one or more tags"""
+    if not redis_client or not tags:
+        return False
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.sadd(f"{TAG_PREFIX}:{tag}", key)
+            # Outlive the entries; stale members only cost a no-op delete
+            pipe.expire(f"{TAG_PREFIX}:{tag}", max(expire_seconds, CacheExpiry.VERY_LONG))
+        pipe.execute()
+        return True
+    except Exception as e:
+        print(f"Cache tag error: {e}")
+        return False
+
+def invalidate_tags(*tags):
+    """Delete every entry registered under the given tags"""
+    if not redis_client or not tags:
+        return False
+
+    try:
+        tag_keys = [f"{TAG_PREFIX}:{tag}" for tag in tags]
+        pipe = redis_client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = [key for members in pipe.execute() for key in members]
+        record_invalidations(keys)
+        keys += tag_keys
+        for start in range(0, len(keys), CACHE_BATCH_SIZE):
+            redis_client.unlink(*keys[start:start + CACHE_BATCH_SIZE])
+        broadcast_invalidation(keys=keys)
+        return True
+    except Exception as e:
+        print(f"Cache tag invalidation error: {e}")
+        return False
+
+# ============= STAMPEDE PROTECTION =============
+#
+# get_or_compute stores {'value', 'fresh_until', 'delta'} envelopes that stay
+# in Redis for stale_seconds past freshness. One worker at a time holds the
+# recompute lease for a key; the others keep serving the previous value, or
+# wait briefly for the first value on a cold miss. Refreshes also start
+# early with a probability that grows as expiry nears (XFetch), weighted by
+# how long the value took to compute.
+
+LOCK_PREFIX = "cache:lock"
+STALE_SECONDS = 60
+LOCK_LEASE_SECONDS = 30
+LOCK_WAIT_INTERVAL = 0.05
+
+def should_refresh(envelope, beta=1.0, now=None):
+    """True once the entry is stale, or earlier with XFetch probability"""
+    now = now or time.time()
+    # -log(U) for U in (0, 1] is exponentially distributed around 1
+    early = envelope['delta'] * beta * -math.log(1.0 - random.random())
+    return now + early >= envelope['fresh_until']
+
+def get_envelope(key):
+    """Cached envelope for key, ignoring entries written in another format"""
+    envelope = get_cache(key)
+    if isinstance(envelope, dict) and 'fresh_until' in envelope:
+        return envelope
+    return None
+
+def store_envelope(key, value, delta, expire_seconds, stale_seconds, tags=None):
+    envelope = {'value': value, 'fresh_until': time.time() + expire_seconds, 'delta': delta}
+    set_cache(key, envelope, expire_seconds + stale_seconds, tags=tags)
+    return envelope
+
+def compute_envelope(key, compute, expire_seconds, stale_seconds, tags=None):
+    """Run compute and store its result; a None result is not cached"""
+    start = time.time()
+    value = compute()
+    if value is None:
+        return None
+    return store_envelope(key, value, time.time() - start, expire_seconds, stale_seconds, tags)
+
+def get_or_compute(key, compute, expire_seconds=300, stale_seconds=STALE_SECONDS,
+                   lock_timeout=LOCK_LEASE_SECONDS, beta=1.0, tags=None):
+    """Get a cached value, recomputing it at most once across all workers
+
+    Returns compute()'s result; compute may return None to skip caching.
+    """
+    if not redis_client:
+        return compute()
+
+    envelope = get_envelope(key)
+    if envelope is not None and not should_refresh(envelope, beta):
+        return envelope['value']
+
+    try:
+        lock = redis_client.lock(f"{LOCK_PREFIX}:{key}", timeout=lock_timeout, blocking=False)
+        acquired = lock.acquire()
+    except Exception as e:
+        print(f"Cache lock error: {e}")
+        lock, acquired = None, False
+
+    if acquired:
+        try:
+            # Another worker may have refreshed between our read and the lock
+            latest = get_envelope(key)
+            if latest is not None and latest != envelope and time.time() < latest['fresh_until']:
+                return latest['value']
+            fresh = compute_envelope(key, compute, expire_seconds, stale_seconds, tags)
+            return fresh['value'] if fresh else None
+        finally:
+            try:
+                lock.release()
+            except redis.exceptions.LockError:
+                # The lease ran out during a slow compute; it is already free
+                pass
+
+    if envelope is not None:
+        # Stale-while-revalidate: someone else holds the lease
+        return envelope['value']
+
+    if lock is not None:
+        # Cold miss: wait for the lease holder instead of piling onto the database
+        deadline = time.time() + lock_timeout
+        while time.time() < deadline:
+            time.sleep(LOCK_WAIT_INTERVAL)
+            # Check the lease before the value: the holder stores, then releases
+            lease_held = redis_client.exists(f"{LOCK_PREFIX}:{key}")
+            envelope = get_envelope(key)
+            if envelope is not None:
+                return envelope['value']
+            if not lease_held:
+                break
+
+    # Lease holder gave up (error or non-cacheable result): compute ourselves
+    return compute()
+
+def response_entry(response):
+    """Serializable cache entry for a successful view response"""
+    return {
+        'body': response.get_data(as_text=True),
+        'status': response.status_code,
+        'headers': [
+            [name, value] for name, value in response.headers.items()
+            if name.lower() != 'content-length'
+        ],
+        'etag': hashlib.sha256(response.get_data()).hexdigest()
+    }
+
+def response_cache_key(prefix, owner, query_string='', *args, **kwargs):
+    return versioned_key(prefix, owner, query_string, *args, **kwargs)
+
+def response_cache(prefix, expire_seconds=300, scope='user'):
+    """Cache a JSON view's response per caller and answer conditional GETs
+
+    scope='user' keys entries by the caller's numeric user id and tags them
+    user:<id> so invalidate_user_cache drops them (unknown callers bypass the
+    cache); scope='role' shares one entry per role.
+    Place it below the JWT decorator. Hits and 304s do no database work.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate cache key
-            key = cache_key(prefix, *args, **kwargs)
-            
-            # Try to get from cache
-            cached_result = get_cache(key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function
-            result = func(*args, **kwargs)
-            
-            # Cache the result
-            set_cache(key, result, expire_seconds)
-            
-            return result
+            tags = None
+            if scope == 'user':
+                # Deferred: identity imports this module. Resolving the numeric
+                # id for claim-less tokens keeps the user:<id> tag invalidatable.
+                from backend.identity import current_identity
+                identity = current_identity()
+                if identity is None:
+                    return func(*args, **kwargs)
+                owner = identity.user_id
+                tags = [f"user:{owner}"]
+            else:
+                owner = 'admin' if get_jwt().get('is_admin') else 'user'
+
+            key = response_cache_key(prefix, owner, request.query_string.decode(), *args, **kwargs)
+            uncached = []
+
+            def render():
+                response = make_response(func(*args, **kwargs))
+                # Only successful responses are shared with later requests
+                if response.status_code != 200:
+                    uncached.append(response)
+                    return None
+                return response_entry(response)
+
+            # Single-flight: one worker renders, the rest serve the previous body
+            cached = get_or_compute(key, render, expire_seconds, tags=tags)
+            if cached is None:
+                return uncached[0]
+            response = current_app.response_class(
+                cached['body'], status=cached['status'], headers=cached['headers']
+            )
+
+            response.set_etag(cached['etag'])
+            # Browsers must revalidate, which costs a 304 when nothing changed
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response.make_conditional(request)
         return wrapper
     return decorator
 
+def warm_response_cache(prefix, view, owner, expire_seconds=300, path='/'):
+    """Render a response_cache-decorated view outside a request and store it
+
+    view is the decorated function; owner is the user id or role the entry
+    is keyed by. Returns the key warmed, or None if the view did not succeed.
+    """
+    # Skip the JWT and response_cache wrappers and call the view body itself
+    while hasattr(view, '__wrapped__'):
+        view = view.__wrapped__
+
+    with current_app.test_request_context(path):
+        response = make_response(view())
+        if response.status_code != 200:
+            return None
+        key = response_cache_key(prefix, owner)
+        store_envelope(key, response_entry(response), 0, expire_seconds, STALE_SECONDS)
+        return key
+
 # Cache keys for different data types
 class CacheKeys:
     USER_DASHBOARD = "user:dashboard"
-    USER_SCORES = "user:scores"
     SUBJECT_LIST = "subjects:list"
     QUIZ_LIST = "quiz:list"
     QUIZ_DETAILS = "quiz:details"
     ADMIN_STATS = "admin:stats"
     USER_PROFILE = "user:profile"
+    ANSWER_KEY = "quiz:answer_key"
+
+# Counters per CacheKeys prefix, shared across workers through Redis hashes
+cache_metrics = CacheMetrics(
+    value for name, value in vars(CacheKeys).items() if not name.startswith('_')
+)
 
 # Cache expiration times (in seconds)
 class CacheExpiry:
@@ -140,37 +636,32 @@ class CacheExpiry:
 # Cache invalidation functions
 def invalidate_user_cache(user_id):
     """Invalidate all cache entries for a specific user"""
-    patterns = [
-        f"{CacheKeys.USER_DASHBOARD}:{user_id}",
-        f"{CacheKeys.USER_SCORES}:{user_id}",
-        f"{CacheKeys.USER_PROFILE}:{user_id}"
-    ]
-    for pattern in patterns:
-        clear_cache_pattern(pattern)
+    invalidate_users_cache([user_id])
+
+def invalidate_users_cache(user_ids):
+    """Invalidate the cache entries of many users in a few round trips
+
+    Every per-user entry is registered under its user:<id> tag.
+    """
+    user_ids = list(user_ids)
+    if user_ids:
+        invalidate_tags(*[f"user:{user_id}" for user_id in user_ids])
 
 def invalidate_quiz_cache(quiz_id=None):
     """Invalidate quiz-related cache"""
     if quiz_id:
-        patterns = [
-            f"{CacheKeys.QUIZ_DETAILS}:{quiz_id}",
-            f"{CacheKeys.QUIZ_LIST}:*"
-        ]
+        invalidate_tags(f"quiz:{quiz_id}")
     else:
-        patterns = [
-            f"{CacheKeys.QUIZ_DETAILS}:*",
-            f"{CacheKeys.QUIZ_LIST}:*"
-        ]
-    
-    for pattern in patterns:
-        clear_cache_pattern(pattern)
+        invalidate_namespace(CacheKeys.QUIZ_DETAILS)
+    invalidate_namespace(CacheKeys.QUIZ_LIST)
 
 def invalidate_subject_cache():
     """Invalidate subject-related cache"""
-    clear_cache_pattern(f"{CacheKeys.SUBJECT_LIST}:*")
+    invalidate_namespace(CacheKeys.SUBJECT_LIST)
 
 def invalidate_admin_cache():
     """Invalidate admin-related cache"""
-    clear_cache_pattern(f"{CacheKeys.ADMIN_STATS}:*")
+    invalidate_namespace(CacheKeys.ADMIN_STATS)
 
 # Performance monitoring
 def get_cache_stats():
@@ -180,7 +671,17 @@ def get_cache_stats():
     
     try:
         info = redis_client.info()
+        redis_lookups = redis_stats['hits'] + redis_stats['misses']
         return {
+            "serializer": cache_serializer,
+            "local_tier": local_cache.stats() if local_cache is not None else {"enabled": False},
+            "redis_tier": {
+                "hits": redis_stats['hits'],
+                "misses": redis_stats['misses'],
+                "hit_ratio": round(redis_stats['hits'] / redis_lookups, 4) if redis_lookups else 0
+            },
+            "prefixes": cache_metrics.collect(redis_client),
+            "pool_max_connections": cache_pool.max_connections,
             "connected_clients": info.get("connected_clients", 0),
             "used_memory_human": info.get("used_memory_human", "0B"),
             "keyspace_hits": info.get("keyspace_hits", 0),
@@ -188,4 +689,10 @@ def get_cache_stats():
             "total_commands_processed": info.get("total_commands_processed", 0)
         }
     except Exception as e:
-        return {"error": str(e)} 
\ No newline at end of file
+        return {"error": str(e)} 
+
+def get_cache_metrics():
+    """Per-prefix counters in the Prometheus text format"""
+    if not redis_client:
+        return ""
+    return to_prometheus(cache_metrics.collect(redis_client))
@@ -0,0 +1,87 @@
+# backend/cache_metrics.py - Per-prefix cache counters aggregated across workers
+
+import threading
+import time
+
+METRICS_PREFIX = "cache:metrics"
+METRICS_REGISTRY = f"{METRICS_PREFIX}:prefixes"
+METRICS_FLUSH_INTERVAL = 10  # Seconds between pushes of local counters to Redis
+
+FIELDS = (
+    'hits', 'local_hits', 'misses', 'sets', 'invalidations',
+    'bytes_read', 'bytes_written', 'serialize_us', 'deserialize_us'
+)
+
+class CacheMetrics:
+    """Counts cache activity per key prefix in memory and flushes it to Redis
+
+    Recording is a dict update under a lock; Redis sees one pipelined
+    HINCRBY batch per worker every METRICS_FLUSH_INTERVAL seconds.
+    """
+
+    def __init__(self, prefixes, flush_interval=METRICS_FLUSH_INTERVAL):
+        # Keys look like "<prefix>:..."; the first two segments name the prefix
+        self.prefixes = set(prefixes)
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def prefix_of(self, key):
+        prefix = ':'.join(key.split(':', 2)[:2])
+        return prefix if prefix in self.prefixes else 'other'
+
+    def record(self, key, client=None, **counts):
+        """Add counts (field=amount) for the prefix of key"""
+        prefix = self.prefix_of(key)
+        with self._lock:
+            pending = self._pending.setdefault(prefix, dict.fromkeys(FIELDS, 0))
+            for field, amount in counts.items():
+                pending[field] += amount
+        if client is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush(client)
+
+    def flush(self, client):
+        """Push pending counters into the shared Redis hashes"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for prefix, counts in pending.items():
+                pipe.sadd(METRICS_REGISTRY, prefix)
+                for field, amount in counts.items():
+                    if amount:
+                        pipe.hincrby(f"{METRICS_PREFIX}:{prefix}", field, amount)
+            pipe.execute()
+        except Exception as e:
+            print(f"Cache metrics flush error: {e}")
+
+    def collect(self, client):
+        """Flush, then read the cluster-wide counters for every prefix"""
+        self.flush(client)
+        prefixes = sorted(client.smembers(METRICS_REGISTRY))
+        pipe = client.pipeline(transaction=False)
+        for prefix in prefixes:
+            pipe.hgetall(f"{METRICS_PREFIX}:{prefix}")
+
+        report = {}
+        for prefix, raw in zip(prefixes, pipe.execute()):
+            counts = {field: int(raw.get(field, 0)) for field in FIELDS}
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_ratio'] = round(counts['hits'] / lookups, 4) if lookups else 0
+            report[prefix] = counts
+        return report
+
+def to_prometheus(report):
+    """Render collect() output in the Prometheus text exposition format"""
+    lines = []
+    for field in FIELDS + ('hit_ratio',):
+        metric = f"quizmaster_cache_{field}" if field == 'hit_ratio' else f"quizmaster_cache_{field}_total"
+        lines.append(f"# TYPE {metric} {'gauge' if field == 'hit_ratio' else 'counter'}")
+        for prefix, counts in report.items():
+            lines.append(f'{metric}{{prefix="{prefix}"}} {counts[field]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,88 @@
+# backend/cache_warmup.py - Prefetch hot cache entries after deploys and seed runs
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from backend.models.models import db, Subject, Quiz
+from backend import cache
+from backend.cache import CacheKeys, CacheExpiry, warm_response_cache
+from backend.dashboard import refresh_subject_summaries
+from backend.quiz_listing import refresh_subject_quiz_summaries, subject_quizzes_key
+from backend.quiz_payloads import refresh_quiz_payload
+
+WARMUP_HOURS_AHEAD = 12
+WARMUP_CONCURRENCY = 4
+
+def upcoming_quiz_ids(now, hours_ahead):
+    """Active quizzes that are open now or start within hours_ahead"""
+    horizon = now + timedelta(hours=hours_ahead)
+    rows = db.session.query(Quiz.quiz_id).filter(
+        Quiz.is_active == True,
+        Quiz.date_of_quiz <= horizon,
+        db.or_(Quiz.end_date_time == None, Quiz.end_date_time > now)
+    ).order_by(Quiz.date_of_quiz).all()
+    return [quiz_id for (quiz_id,) in rows]
+
+def warm_admin_stats():
+    from backend.routes.admin_routes import get_admin_stats
+    key = warm_response_cache(CacheKeys.ADMIN_STATS, get_admin_stats, 'admin', CacheExpiry.MEDIUM)
+    return [key] if key else []
+
+def warm_subject_list():
+    return [refresh_subject_summaries()[0]]
+
+def warm_subject_quizzes(subject_id):
+    refresh_subject_quiz_summaries(subject_id)
+    return [subject_quizzes_key(subject_id)]
+
+def warm_quiz_payload(quiz_id):
+    quiz = db.session.get(Quiz, quiz_id)
+    return [refresh_quiz_payload(quiz)[0]] if quiz else []
+
+def warm_cache(hours_ahead=WARMUP_HOURS_AHEAD, concurrency=WARMUP_CONCURRENCY):
+    """Rebuild the subject list, per-subject quiz listings, payloads of
+    upcoming quizzes and admin stats with at most `concurrency` jobs at once
+
+    Returns a report with the keys warmed, failures and the time taken.
+    """
+    start = time.perf_counter()
+    if not cache.redis_client:
+        return {'warmed': 0, 'keys': [], 'errors': ['Redis not available'], 'duration_seconds': 0}
+
+    app = current_app._get_current_object()
+    subject_ids = [subject_id for (subject_id,) in db.session.query(Subject.subject_id).filter(
+        Subject.is_active == True
+    ).all()]
+    quiz_ids = upcoming_quiz_ids(datetime.utcnow(), hours_ahead)
+
+    jobs = [('subject list', warm_subject_list, ()), ('admin stats', warm_admin_stats, ())]
+    jobs += [(f'subject {subject_id} quizzes', warm_subject_quizzes, (subject_id,)) for subject_id in subject_ids]
+    jobs += [(f'quiz {quiz_id} payload', warm_quiz_payload, (quiz_id,)) for quiz_id in quiz_ids]
+
+    def run(job):
+        label, func, args = job
+        # Each worker thread needs its own app context and session
+        with app.app_context():
+            try:
+                return func(*args), None
+            except Exception as e:
+                return [], f"{label}: {e}"
+            finally:
+                db.session.remove()
+
+    keys, errors = [], []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for job_keys, error in pool.map(run, jobs):
+            keys.extend(job_keys)
+            if error:
+                errors.append(error)
+
+    return {
+        'warmed': len(keys),
+        'keys': keys,
+        'errors': errors,
+        'subjects': len(subject_ids),
+        'upcoming_quizzes': len(quiz_ids),
+        'duration_seconds': round(time.perf_counter() - start, 3)
+    }
@@ -1,7 +1,101 @@
 import os
+from sqlalchemy import event
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
 class Config:
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'quiz_master.db')
+    """Settings shared by every database profile"""
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///quizmaster.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLITE_PRAGMAS = {}
+
+class SQLiteConfig(Config):
+    """Stock SQLite settings (rollback journal, synchronous=FULL)"""
+
+class SQLiteWALConfig(Config):
+    """Single-node installs: WAL journaling so readers never block the writer"""
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',   # Safe with WAL; fsync only at checkpoints
+        'busy_timeout': 5000,      # Wait up to 5s for the write lock
+        'mmap_size': 268435456,    # 256 MB memory-mapped reads
+        'cache_size': -65536,      # 64 MB page cache (negative = KiB)
+        'temp_store': 'MEMORY'
+    }
+
+class PostgresConfig(Config):
+    """Multi-node installs: pooled PostgreSQL connections (DATABASE_URL required)"""
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        'pool_pre_ping': True,     # Drop connections the server closed
+        'pool_recycle': 1800       # Reconnect before idle timeouts on proxies
+    }
+
+PROFILES = {
+    'sqlite': SQLiteConfig,
+    'sqlite-wal': SQLiteWALConfig,
+    'postgres': PostgresConfig
+}
+
+DEFAULT_PROFILE = 'sqlite-wal'
+
+# Environment overrides for pooled profiles: variable -> (engine option, type)
+POOL_ENVIRONMENT = {
+    'DB_POOL_SIZE': ('pool_size', int),
+    'DB_MAX_OVERFLOW': ('max_overflow', int),
+    'DB_POOL_TIMEOUT': ('pool_timeout', int),
+    'DB_POOL_RECYCLE': ('pool_recycle', int)
+}
+
+def load_config(app, profile=None):
+    """Apply a database profile to the app config
+
+    The profile comes from the argument or DATABASE_PROFILE; DATABASE_URL
+    overrides the database location and DB_POOL_* the pool settings.
+    """
+    profile = profile or os.environ.get('DATABASE_PROFILE', DEFAULT_PROFILE)
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Available: {', '.join(PROFILES)}")
+
+    config = PROFILES[profile]
+    app.config.from_object(config)
+    app.config['DATABASE_PROFILE'] = profile
+
+    database_url = os.environ.get('DATABASE_URL')
+    if database_url:
+        # Heroku-style URLs use the scheme SQLAlchemy 1.4+ no longer accepts
+        if database_url.startswith('postgres://'):
+            database_url = 'postgresql://' + database_url[len('postgres://'):]
+        app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    elif profile == 'postgres':
+        raise ValueError("DATABASE_URL must be set for the 'postgres' profile")
+
+    engine_options = dict(config.SQLALCHEMY_ENGINE_OPTIONS)
+    if engine_options:
+        for variable, (option, cast) in POOL_ENVIRONMENT.items():
+            if os.environ.get(variable):
+                engine_options[option] = cast(os.environ[variable])
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+    app.config['SQLITE_PRAGMAS'] = dict(config.SQLITE_PRAGMAS)
+    return profile
+
+def register_sqlite_pragmas(engine, pragmas):
+    """Run the PRAGMA statements on every new SQLite connection"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def init_database(app, db):
+    """Bind Flask-SQLAlchemy to the app and apply the profile's connection setup"""
+    db.init_app(app)
+    with app.app_context():
+        register_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS'))
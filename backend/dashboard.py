@@ -0,0 +1,73 @@
+# backend/dashboard.py - Aggregated subject summaries for the user dashboard
+
+from datetime import datetime
+from sqlalchemy import func, case, and_
+from backend.models.models import db, Subject, Chapter, Quiz
+from backend.cache import get_cache, set_cache, versioned_key, CacheKeys, CacheExpiry
+
+def subject_summary_key():
+    """Lives in the subject list namespace so invalidate_subject_cache() clears it"""
+    return versioned_key(CacheKeys.SUBJECT_LIST, 'summary')
+
+def compute_subject_summaries(now=None):
+    """Compute chapter and available-quiz counts for every active subject in one query
+
+    Returns (summaries, next_quiz_start) where next_quiz_start is the earliest
+    start time of an active quiz that is not available yet. The available
+    counts are only valid until that moment.
+    """
+    now = now or datetime.utcnow()
+
+    is_available = and_(Quiz.is_active == True, Quiz.date_of_quiz <= now)
+    is_upcoming = and_(Quiz.is_active == True, Quiz.date_of_quiz > now)
+
+    rows = db.session.query(
+        Subject.subject_id,
+        Subject.name,
+        Subject.description,
+        func.count(func.distinct(Chapter.chapter_id)).label('chapter_count'),
+        func.count(func.distinct(case((is_available, Quiz.quiz_id)))).label('available_quizzes'),
+        func.min(case((is_upcoming, Quiz.date_of_quiz))).label('next_quiz_start')
+    ).outerjoin(
+        Chapter, Chapter.subject_id == Subject.subject_id
+    ).outerjoin(
+        Quiz, Quiz.chapter_id == Chapter.chapter_id
+    ).filter(
+        Subject.is_active == True
+    ).group_by(Subject.subject_id).order_by(Subject.subject_id).all()
+
+    summaries = []
+    next_quiz_start = None
+    for row in rows:
+        summaries.append({
+            'id': row.subject_id,
+            'name': row.name,
+            'description': row.description,
+            'chapter_count': row.chapter_count,
+            'available_quizzes': row.available_quizzes
+        })
+        if row.next_quiz_start and (next_quiz_start is None or row.next_quiz_start < next_quiz_start):
+            next_quiz_start = row.next_quiz_start
+
+    return summaries, next_quiz_start
+
+def refresh_subject_summaries():
+    """Compute the dashboard subject summaries and cache them; returns (key, summaries)"""
+    now = datetime.utcnow()
+    summaries, next_quiz_start = compute_subject_summaries(now)
+
+    # Expire no later than the next scheduled quiz start so counts stay accurate
+    expire_seconds = CacheExpiry.MEDIUM
+    if next_quiz_start:
+        expire_seconds = min(expire_seconds, int((next_quiz_start - now).total_seconds()) + 1)
+
+    key = subject_summary_key()
+    set_cache(key, summaries, max(expire_seconds, 1))
+    return key, summaries
+
+def get_subject_summaries():
+    """Get dashboard subject summaries, served from cache when possible"""
+    cached = get_cache(subject_summary_key())
+    if cached is not None:
+        return cached
+    return refresh_subject_summaries()[1]
@@ -0,0 +1,140 @@
+# backend/grading.py - Batch grading of many submissions for one quiz
+
+from datetime import datetime
+from backend.models.models import db, User, Score
+from backend.answer_keys import get_answer_key
+from backend.cache import invalidate_users_cache
+from backend.leaderboards import record_score_rows
+from backend.user_stats import record_user_stats
+
+# NumPy is optional; without it batches are graded with the pure-Python path
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Rows per INSERT statement when saving a graded batch
+SCORE_INSERT_CHUNK_SIZE = 1000
+
+VALID_ANSWER_INDEXES = (0, 1, 2, 3)
+
+def answer_matrix(answer_key, submissions):
+    """Build a submissions x questions matrix of 1-based options (0 = unanswered)"""
+    matrix = np.zeros((len(submissions), len(answer_key)), dtype=np.int8)
+    columns = {str(question_id): index for index, question_id in enumerate(answer_key.question_ids)}
+    for row, submission in enumerate(submissions):
+        for question_id, answer_index in submission['answers'].items():
+            column = columns.get(str(question_id))
+            # Options are 1-4, so anything outside 0-3 is simply a wrong answer
+            if column is not None and answer_index in VALID_ANSWER_INDEXES:
+                matrix[row, column] = answer_index + 1
+    return matrix
+
+def grade_batch(answer_key, submissions):
+    """Count correct answers for every submission; returns a list of ints"""
+    if np is not None:
+        key_vector = np.frombuffer(answer_key.correct_options, dtype=np.uint8).astype(np.int8)
+        return (answer_matrix(answer_key, submissions) == key_vector).sum(axis=1).tolist()
+
+    return [answer_key.grade(submission['answers'])[0] for submission in submissions]
+
+def is_int(value):
+    # bool is an int subclass, but True/False are not user ids or option indexes
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def submission_error(submission):
+    """Why a batch entry is malformed, or None if its shape is valid"""
+    if not isinstance(submission, dict):
+        return 'Submission must be an object'
+    if not is_int(submission.get('user_id')):
+        return 'user_id must be an integer'
+    answers = submission.get('answers') or {}
+    if not isinstance(answers, dict) or not all(answer is None or is_int(answer) for answer in answers.values()):
+        return 'answers must map question ids to option indexes'
+    time_taken = submission.get('time_taken', 0)
+    if time_taken is not None and not (is_int(time_taken) and time_taken >= 0):
+        return 'time_taken must be a non-negative integer'
+    return None
+
+def grade_and_save_batch(quiz, submissions):
+    """Grade a batch of submissions for one quiz and bulk-insert the Score rows
+
+    Each submission is {'user_id', 'answers', 'time_taken'}. Returns a report
+    with per-row errors for submissions that were skipped.
+    """
+    answer_key = get_answer_key(quiz)
+    if not len(answer_key):
+        raise ValueError('No questions found for this quiz')
+
+    errors = []
+    accepted = []
+    seen_users = set()
+
+    # Shape checks first, so only well-formed entries reach the queries below
+    valid = []
+    for index, submission in enumerate(submissions):
+        error = submission_error(submission)
+        if error:
+            user_id = submission.get('user_id') if isinstance(submission, dict) else None
+            errors.append({'index': index, 'user_id': user_id, 'error': error})
+        else:
+            valid.append((index, submission))
+    user_ids = {submission['user_id'] for _, submission in valid}
+
+    # Set-based validation: one query for known users, one for prior attempts
+    # (unique_user_quiz_attempt allows a single Score per user and quiz)
+    known_users = {
+        user_id for (user_id,) in db.session.query(User.user_id).filter(User.user_id.in_(user_ids)).all()
+    }
+    attempted = {
+        user_id for (user_id,) in db.session.query(Score.user_id).filter(
+            Score.quiz_id == quiz.quiz_id,
+            Score.user_id.in_(user_ids)
+        ).all()
+    }
+
+    for index, submission in valid:
+        user_id = submission['user_id']
+        answers = submission.get('answers') or {}
+        if user_id not in known_users:
+            errors.append({'index': index, 'user_id': user_id, 'error': 'User not found'})
+        elif user_id in attempted or user_id in seen_users:
+            errors.append({'index': index, 'user_id': user_id, 'error': 'Quiz already attempted'})
+        else:
+            seen_users.add(user_id)
+            accepted.append(dict(submission, answers=answers))
+    errors.sort(key=lambda error: error['index'])
+
+    total_questions = len(answer_key)
+    correct_counts = grade_batch(answer_key, accepted)
+
+    now = datetime.utcnow()
+    rows = [{
+        'quiz_id': quiz.quiz_id,
+        'user_id': submission['user_id'],
+        'total_questions': total_questions,
+        'correct_answers': correct,
+        'total_score': round((correct / total_questions) * 100, 2),
+        'time_taken': submission.get('time_taken') or 0,
+        'attempt_datetime': now
+    } for submission, correct in zip(accepted, correct_counts)]
+
+    for start in range(0, len(rows), SCORE_INSERT_CHUNK_SIZE):
+        db.session.execute(Score.__table__.insert(), rows[start:start + SCORE_INSERT_CHUNK_SIZE])
+    record_user_stats(rows)
+    db.session.commit()
+    invalidate_users_cache(row['user_id'] for row in rows)
+    record_score_rows(rows)
+
+    return {
+        'quiz_id': quiz.quiz_id,
+        'graded': len(rows),
+        'skipped': len(errors),
+        'vectorized': np is not None,
+        'scores': [{
+            'user_id': row['user_id'],
+            'correct_answers': row['correct_answers'],
+            'percentage_score': row['total_score']
+        } for row in rows],
+        'errors': errors
+    }
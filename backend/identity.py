@@ -0,0 +1,77 @@
+# backend/identity.py - Request-scoped caller identity resolved from JWT claims
+
+from flask import g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from backend.models.models import db, User
+from backend.cache import get_cache, set_cache, CacheKeys, CacheExpiry
+
+class Identity:
+    """The authenticated caller as described by the access token"""
+    __slots__ = ('user_id', 'user_name', 'is_admin', 'full_name')
+
+    def __init__(self, user_id, user_name, is_admin=False, full_name=None):
+        self.user_id = user_id
+        self.user_name = user_name
+        self.is_admin = bool(is_admin)
+        self.full_name = full_name
+
+def load_identity(claims):
+    """Build the identity from the token, querying only for tokens without claims
+
+    Claims are trusted as issued, so a user deleted or changed after login
+    keeps read access until the token expires: JWT_ACCESS_TOKEN_EXPIRES is
+    the revocation window. Write paths re-check the row via current_writer.
+    """
+    user_name = get_jwt_identity()
+    if claims.get('user_id') is not None:
+        return Identity(claims['user_id'], user_name, claims.get('is_admin'), claims.get('full_name'))
+
+    # Tokens issued before login added the user_id claim
+    row = db.session.query(User.user_id, User.is_admin, User.full_name).filter(
+        User.user_name == user_name
+    ).first()
+    return Identity(row.user_id, user_name, row.is_admin, row.full_name) if row else None
+
+def current_identity():
+    """The caller's identity, resolved at most once per request (None if unknown)"""
+    claims = get_jwt()
+    # Requests inside an outer app context share g, so tie the entry to the decoded token
+    cached = g.get('current_identity')
+    if cached is None or cached[0] is not claims:
+        cached = g.current_identity = (claims, load_identity(claims))
+    return cached[1]
+
+def current_writer():
+    """The caller's identity if their user row still exists, for views that write scores"""
+    identity = current_identity()
+    if identity is None:
+        return None
+    exists = db.session.query(User.query.filter(User.user_id == identity.user_id).exists()).scalar()
+    return identity if exists else None
+
+def user_profile_key(user_id):
+    return f"{CacheKeys.USER_PROFILE}:{user_id}"
+
+def current_user_profile():
+    """The caller's User.to_dict(), cached briefly for views that show profile fields
+
+    The entry is dropped by invalidate_user_cache along with the user's other keys.
+    """
+    identity = current_identity()
+    if identity is None:
+        return None
+
+    key = user_profile_key(identity.user_id)
+    profile = get_cache(key)
+    if profile is None:
+        user = db.session.get(User, identity.user_id)
+        if user is None:
+            return None
+        profile = user.to_dict()
+        set_cache(key, profile, CacheExpiry.SHORT, tags=[f"user:{identity.user_id}"])
+    return profile
+
+def current_user_row():
+    """The caller's User row, for views that modify it"""
+    identity = current_identity()
+    return db.session.get(User, identity.user_id) if identity else None
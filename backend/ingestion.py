@@ -0,0 +1,247 @@
+# backend/ingestion.py - Queued submission ingestion over a Redis stream
+
+import json
+import os
+import socket
+import uuid
+from datetime import datetime
+import redis
+from backend.models.models import db, Score
+from backend.cache import invalidate_users_cache
+from backend.leaderboards import record_score_rows
+from backend.user_stats import record_user_stats, UPSERT_INSERTS
+
+SUBMISSION_STREAM = "submissions:stream"
+CONSUMER_GROUP = "score-writers"
+RECEIPT_PREFIX = "submissions:receipt"
+PENDING_PREFIX = "submissions:pending"
+RECEIPT_TTL = 86400  # Receipts are kept for a day
+CLAIM_MIN_IDLE_MS = 60000  # Un-acked entries older than this belong to a dead consumer
+
+# Rejects a receipt unless it is already saved (an entry processed twice
+# finds its own row) or has expired
+REJECT_RECEIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status and status ~= 'saved' then
+    redis.call('HSET', KEYS[1], 'status', 'rejected', 'error', ARGV[1])
+    return 1
+end
+return 0
+"""
+
+# Separate client so cache clears never touch queued submissions
+queue_client = None
+reject_receipt = None
+ingestion_mode = 'sync'
+
+def init_ingestion(app):
+    """Initialize the submission queue if queue mode is enabled"""
+    global queue_client, reject_receipt, ingestion_mode
+    ingestion_mode = app.config.get('SUBMISSION_INGESTION_MODE', 'sync')
+    if ingestion_mode != 'queue':
+        return
+
+    try:
+        queue_client = redis.Redis(
+            host=app.config.get('REDIS_HOST', 'localhost'),
+            port=app.config.get('REDIS_PORT', 6379),
+            db=app.config.get('REDIS_QUEUE_DB', 2),
+            decode_responses=True
+        )
+        queue_client.ping()
+        reject_receipt = queue_client.register_script(REJECT_RECEIPT)
+        ensure_consumer_group()
+        print("✅ Submission queue initialized successfully")
+    except Exception as e:
+        print(f"⚠️  Submission queue not available, falling back to synchronous writes: {e}")
+        queue_client = None
+
+def is_queue_enabled():
+    return ingestion_mode == 'queue' and queue_client is not None
+
+def ensure_consumer_group():
+    try:
+        queue_client.xgroup_create(SUBMISSION_STREAM, CONSUMER_GROUP, id='0', mkstream=True)
+    except redis.exceptions.ResponseError as e:
+        # BUSYGROUP: the group already exists
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+def receipt_key(receipt_id):
+    return f"{RECEIPT_PREFIX}:{receipt_id}"
+
+def pending_key(quiz_id, user_id):
+    return f"{PENDING_PREFIX}:{quiz_id}:{user_id}"
+
+def enqueue_submission(quiz_id, user_id, total_questions, correct_answers, total_score, time_taken):
+    """Append a graded submission to the stream and return its receipt id
+
+    Returns None if the user already has a submission for this quiz queued.
+    """
+    # Guard against double submits while the first one is still queued
+    if not queue_client.set(pending_key(quiz_id, user_id), 1, nx=True, ex=RECEIPT_TTL):
+        return None
+
+    receipt_id = uuid.uuid4().hex
+    submission = {
+        'receipt_id': receipt_id,
+        'quiz_id': quiz_id,
+        'user_id': user_id,
+        'total_questions': total_questions,
+        'correct_answers': correct_answers,
+        'total_score': total_score,
+        'time_taken': time_taken or 0,
+        'submitted_at': datetime.utcnow().isoformat()
+    }
+
+    pipe = queue_client.pipeline()
+    pipe.hset(receipt_key(receipt_id), mapping={
+        'status': 'queued',
+        'quiz_id': quiz_id,
+        'user_id': user_id,
+        'correct_answers': correct_answers,
+        'total_score': total_score,
+        'submitted_at': submission['submitted_at']
+    })
+    pipe.expire(receipt_key(receipt_id), RECEIPT_TTL)
+    pipe.xadd(SUBMISSION_STREAM, {'data': json.dumps(submission)})
+    try:
+        pipe.execute()
+    except Exception:
+        # Nothing was queued; don't lock the user out of the quiz for RECEIPT_TTL
+        queue_client.delete(pending_key(quiz_id, user_id))
+        raise
+    return receipt_id
+
+def get_receipt(receipt_id):
+    """Get the status of a queued submission, or None if unknown/expired"""
+    receipt = queue_client.hgetall(receipt_key(receipt_id))
+    if not receipt:
+        return None
+    receipt['quiz_id'] = int(receipt['quiz_id'])
+    receipt['user_id'] = int(receipt['user_id'])
+    receipt['correct_answers'] = int(receipt['correct_answers'])
+    receipt['total_score'] = float(receipt['total_score'])
+    return receipt
+
+def persist_submissions(submissions):
+    """Insert a batch of submissions, enforcing unique_user_quiz_attempt
+
+    Returns (saved receipt ids, {receipt id: reason} for rejected ones).
+    """
+    rejected = {}
+    unique = {}
+    for submission in submissions:
+        pair = (submission['user_id'], submission['quiz_id'])
+        if pair in unique:
+            rejected[submission['receipt_id']] = 'Duplicate submission'
+        else:
+            unique[pair] = submission
+
+    # One query for attempts that already exist for any pair in the batch
+    if unique:
+        existing = db.session.query(Score.user_id, Score.quiz_id).filter(
+            Score.user_id.in_({user_id for user_id, _ in unique}),
+            Score.quiz_id.in_({quiz_id for _, quiz_id in unique})
+        ).all()
+        for pair in existing:
+            if pair in unique:
+                rejected[unique.pop(pair)['receipt_id']] = 'You have already attempted this quiz'
+
+    rows = [{
+        'quiz_id': submission['quiz_id'],
+        'user_id': submission['user_id'],
+        'total_questions': submission['total_questions'],
+        'correct_answers': submission['correct_answers'],
+        'total_score': submission['total_score'],
+        'time_taken': submission['time_taken'],
+        'attempt_datetime': datetime.fromisoformat(submission['submitted_at'])
+    } for submission in unique.values()]
+
+    # A synchronous submit may have raced the check above. ON CONFLICT skips
+    # those rows inside this transaction and RETURNING names the ones written,
+    # so scores and rollups still commit together.
+    inserted = set()
+    if rows:
+        statement = UPSERT_INSERTS[db.session.get_bind().dialect.name](Score.__table__)
+        statement = statement.on_conflict_do_nothing(index_elements=['user_id', 'quiz_id']).returning(
+            Score.user_id, Score.quiz_id
+        )
+        inserted = set(db.session.execute(statement, rows).tuples().all())
+
+    saved, saved_rows = [], []
+    for (pair, submission), row in zip(unique.items(), rows):
+        if pair in inserted:
+            saved.append(submission['receipt_id'])
+            saved_rows.append(row)
+        else:
+            rejected[submission['receipt_id']] = 'You have already attempted this quiz'
+    record_user_stats(saved_rows)
+    db.session.commit()
+
+    return saved, rejected
+
+def consumer_name():
+    """One consumer per worker process, so overlapping drains never read the same entries"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def mark_receipts(saved, rejected):
+    """Record batch outcomes; a receipt that is already saved is never rejected"""
+    pipe = queue_client.pipeline()
+    for receipt_id in saved:
+        pipe.hset(receipt_key(receipt_id), 'status', 'saved')
+    for receipt_id, reason in rejected.items():
+        reject_receipt(keys=[receipt_key(receipt_id)], args=[reason], client=pipe)
+    pipe.execute()
+
+def drain_submission_stream(batch_size=500, max_batches=20):
+    """Consume queued submissions in batched transactions; returns counts
+
+    Entries another consumer read but never acknowledged (a worker that died
+    mid-batch) are claimed first, once idle for CLAIM_MIN_IDLE_MS; then new
+    entries are read.
+    """
+    consumer = consumer_name()
+    totals = {'saved': 0, 'rejected': 0, 'batches': 0}
+
+    claim_from = '0-0'
+    for _ in range(max_batches):
+        if claim_from is not None:
+            claimed = queue_client.xautoclaim(
+                SUBMISSION_STREAM, CONSUMER_GROUP, consumer, CLAIM_MIN_IDLE_MS, start_id=claim_from, count=batch_size
+            )
+            # The scan cursor returns to 0-0 once the whole pending list was visited
+            claim_from = None if claimed[0] == '0-0' else claimed[0]
+            messages = claimed[1]
+            if not messages:
+                continue
+        else:
+            response = queue_client.xreadgroup(
+                CONSUMER_GROUP, consumer, {SUBMISSION_STREAM: '>'}, count=batch_size
+            )
+            messages = response[0][1] if response else []
+            if not messages:
+                break
+
+        # Entries deleted while pending come back without fields; they only need acknowledging
+        submissions = [json.loads(fields['data']) for _, fields in messages if fields]
+        saved, rejected = persist_submissions(submissions)
+        saved_receipts = set(saved)
+        saved_submissions = [submission for submission in submissions if submission['receipt_id'] in saved_receipts]
+        invalidate_users_cache(submission['user_id'] for submission in saved_submissions)
+        record_score_rows(saved_submissions)
+        mark_receipts(saved, rejected)
+
+        message_ids = [message_id for message_id, _ in messages]
+        pipe = queue_client.pipeline()
+        for submission in submissions:
+            pipe.delete(pending_key(submission['quiz_id'], submission['user_id']))
+        pipe.xack(SUBMISSION_STREAM, CONSUMER_GROUP, *message_ids)
+        pipe.xdel(SUBMISSION_STREAM, *message_ids)
+        pipe.execute()
+
+        totals['saved'] += len(saved)
+        totals['rejected'] += len(rejected)
+        totals['batches'] += 1
+
+    return totals
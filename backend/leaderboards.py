@@ -0,0 +1,293 @@
+# backend/leaderboards.py - Global, per-subject and per-quiz leaderboards in Redis sorted sets
+
+import redis
+from sqlalchemy import func, inspect, null
+from backend.models.models import db, User, Chapter, Quiz, Score
+
+LEADERBOARD_PREFIX = "leaderboard"
+REBUILD_PREFIX = "leaderboard-rebuild"
+REBUILD_BATCH_SIZE = 1000
+MAX_PAGE_SIZE = 100
+MAX_RADIUS = 50
+
+# 'global' and 'subject' rank users by average score, 'quiz' by their best score
+BOARD_KINDS = ('global', 'subject', 'quiz')
+AVERAGED_KINDS = ('global', 'subject')
+
+# Separate client so cache clears never touch the boards
+leaderboard_client = None
+record_average = None
+
+# Averaged boards keep running sums and counts in hashes next to the sorted
+# set, so a new score is two hash increments and one O(log n) ZADD
+RECORD_AVERAGE = """
+local total = redis.call('HINCRBYFLOAT', KEYS[2], ARGV[1], ARGV[2])
+local count = redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+redis.call('ZADD', KEYS[1], tostring(total / count), ARGV[1])
+return count
+"""
+
+def init_leaderboards(app):
+    """Connect to the leaderboard database and build the boards on first use"""
+    global leaderboard_client, record_average
+    try:
+        leaderboard_client = redis.Redis(
+            host=app.config.get('REDIS_HOST', 'localhost'),
+            port=app.config.get('REDIS_PORT', 6379),
+            db=app.config.get('REDIS_LEADERBOARD_DB', 3),
+            decode_responses=True
+        )
+        leaderboard_client.ping()
+        record_average = leaderboard_client.register_script(RECORD_AVERAGE)
+        print("✅ Leaderboards initialized successfully")
+    except Exception as e:
+        print(f"⚠️  Leaderboards not available: {e}")
+        leaderboard_client = None
+        return
+
+    with app.app_context():
+        if not leaderboard_client.exists(board_key('global')) and inspect(db.engine).has_table(Score.__tablename__):
+            print(f"✅ Leaderboards built: {rebuild_leaderboards()}")
+
+def is_leaderboard_enabled():
+    return leaderboard_client is not None
+
+def board_key(kind, board_id=None, prefix=LEADERBOARD_PREFIX):
+    return f"{prefix}:{kind}" if kind == 'global' else f"{prefix}:{kind}:{board_id}"
+
+def board_keys(kind, board_id=None, prefix=LEADERBOARD_PREFIX):
+    """Sorted set key, plus the sums and counts hashes of averaged boards
+    or the score distribution hash of a quiz board"""
+    key = board_key(kind, board_id, prefix)
+    return [key, f"{key}:sums", f"{key}:counts"] if kind in AVERAGED_KINDS else [key, f"{key}:distribution"]
+
+def score_field(total_score):
+    return str(float(total_score))
+
+# ============= INCREMENTAL UPDATES =============
+
+def record_scores(entries):
+    """Add (user_id, quiz_id, subject_id, total_score) tuples to every board
+
+    One pipelined round trip for the whole batch. Errors are logged, not
+    raised: the score is already committed and the repair task catches up.
+    """
+    if leaderboard_client is None or not entries:
+        return
+    try:
+        pipe = leaderboard_client.pipeline(transaction=False)
+        for user_id, quiz_id, subject_id, total_score in entries:
+            record_average(keys=board_keys('global'), args=[user_id, total_score], client=pipe)
+            record_average(keys=board_keys('subject', subject_id), args=[user_id, total_score], client=pipe)
+            # One attempt per quiz is the norm; GT keeps the best if several are allowed
+            quiz_board, distribution = board_keys('quiz', quiz_id)
+            pipe.zadd(quiz_board, {user_id: total_score}, gt=True)
+            pipe.hincrby(distribution, score_field(total_score), 1)
+        pipe.execute()
+    except Exception as e:
+        print(f"Leaderboard update error: {e}")
+
+def record_score(user, quiz, total_score):
+    """Update the boards for one committed submission"""
+    if leaderboard_client is None or user.is_admin:
+        return
+    record_scores([(user.user_id, quiz.quiz_id, quiz.chapter.subject_id, total_score)])
+
+def record_score_rows(rows):
+    """Update the boards for bulk-inserted scores (dicts with user_id, quiz_id and total_score)"""
+    rows = list(rows)
+    if leaderboard_client is None or not rows:
+        return
+    subjects = dict(db.session.query(Quiz.quiz_id, Chapter.subject_id).join(
+        Chapter, Quiz.chapter_id == Chapter.chapter_id
+    ).filter(Quiz.quiz_id.in_({row['quiz_id'] for row in rows})).all())
+    admins = {
+        user_id for (user_id,) in db.session.query(User.user_id).filter(
+            User.user_id.in_({row['user_id'] for row in rows}), User.is_admin == True
+        ).all()
+    }
+    record_scores([
+        (row['user_id'], row['quiz_id'], subjects[row['quiz_id']], row['total_score'])
+        for row in rows if row['user_id'] not in admins and row['quiz_id'] in subjects
+    ])
+
+# ============= REPAIR =============
+
+def rebuild_leaderboards():
+    """Recompute every board from the scores table and swap it in; returns board counts
+
+    Boards are written under temporary keys and renamed over the live ones,
+    so readers never see a half-built board. Boards with no scores left
+    (deleted quizzes, subjects and users) are removed.
+    """
+    student_scores = db.session.query(Score).join(User, Score.user_id == User.user_id).filter(
+        User.is_admin == False
+    ).join(Quiz, Score.quiz_id == Quiz.quiz_id).join(Chapter, Quiz.chapter_id == Chapter.chapter_id)
+
+    averaged = {
+        'global': student_scores.with_entities(
+            null(), Score.user_id, func.sum(Score.total_score), func.count(Score.score_id)
+        ).group_by(Score.user_id),
+        'subject': student_scores.with_entities(
+            Chapter.subject_id, Score.user_id, func.sum(Score.total_score), func.count(Score.score_id)
+        ).group_by(Chapter.subject_id, Score.user_id),
+    }
+    best = student_scores.with_entities(
+        Score.quiz_id, Score.user_id, func.max(Score.total_score)
+    ).group_by(Score.quiz_id, Score.user_id)
+
+    built = set()
+    pipe = leaderboard_client.pipeline(transaction=False)
+
+    def flush():
+        if len(pipe) >= REBUILD_BATCH_SIZE:
+            pipe.execute()
+
+    for board in list(leaderboard_client.scan_iter(match=f"{REBUILD_PREFIX}:*", count=REBUILD_BATCH_SIZE)):
+        pipe.delete(board)  # Leftovers of an interrupted rebuild
+
+    for kind, query in averaged.items():
+        for board_id, user_id, total, count in query.yield_per(REBUILD_BATCH_SIZE):
+            key, sums, counts = board_keys(kind, board_id, REBUILD_PREFIX)
+            pipe.zadd(key, {user_id: total / count})
+            pipe.hset(sums, user_id, total)
+            pipe.hset(counts, user_id, count)
+            built.add((kind, board_id))
+            flush()
+    for quiz_id, user_id, total_score in best.yield_per(REBUILD_BATCH_SIZE):
+        quiz_board, distribution = board_keys('quiz', quiz_id, REBUILD_PREFIX)
+        pipe.zadd(quiz_board, {user_id: total_score})
+        pipe.hincrby(distribution, score_field(total_score), 1)
+        built.add(('quiz', quiz_id))
+        flush()
+    pipe.execute()
+
+    live = set()
+    for kind, board_id in built:
+        for temporary, key in zip(board_keys(kind, board_id, REBUILD_PREFIX), board_keys(kind, board_id)):
+            pipe.rename(temporary, key)
+            live.add(key)
+        flush()
+    pipe.execute()
+
+    stale = [key for key in leaderboard_client.scan_iter(match=f"{LEADERBOARD_PREFIX}:*", count=REBUILD_BATCH_SIZE)
+             if key not in live]
+    for start in range(0, len(stale), REBUILD_BATCH_SIZE):
+        leaderboard_client.unlink(*stale[start:start + REBUILD_BATCH_SIZE])
+
+    return {kind: sum(1 for built_kind, _ in built if built_kind == kind) for kind in BOARD_KINDS}
+
+# ============= READS =============
+
+def describe(kind, board_id, members, start):
+    """Leaderboard entries for (member, score) pairs ranked from start + 1"""
+    user_ids = [int(member) for member, _ in members]
+    counts = leaderboard_client.hmget(board_keys(kind, board_id)[2], user_ids) if (
+        kind in AVERAGED_KINDS and user_ids
+    ) else [1] * len(user_ids)
+    # Boards are open to every student: show display names, never user_name (the email)
+    names = dict(
+        db.session.query(User.user_id, User.full_name).filter(User.user_id.in_(user_ids)).all()
+    ) if user_ids else {}
+
+    entries = []
+    for rank, (user_id, (_, score), count) in enumerate(zip(user_ids, members, counts), start + 1):
+        entries.append({
+            'rank': rank,
+            'user_id': user_id,
+            'full_name': names.get(user_id),
+            'score': round(score, 2),
+            'quiz_count': int(count or 0)
+        })
+    return entries
+
+def leaderboard_page(kind, board_id=None, page=1, per_page=20):
+    """One page of a board, best first; two Redis round trips and one users lookup"""
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), MAX_PAGE_SIZE)
+    key = board_key(kind, board_id)
+    start = (page - 1) * per_page
+
+    pipe = leaderboard_client.pipeline(transaction=False)
+    pipe.zcard(key)
+    pipe.zrevrange(key, start, start + per_page - 1, withscores=True)
+    total, members = pipe.execute()
+    return {
+        'board': kind,
+        'board_id': board_id,
+        'entries': describe(kind, board_id, members, start),
+        'total': total,
+        'pages': -(-total // per_page),
+        'current_page': page
+    }
+
+def leaderboard_around(kind, board_id, user_id, radius=5):
+    """The user's rank plus the radius entries either side of it"""
+    radius = min(max(radius, 0), MAX_RADIUS)
+    key = board_key(kind, board_id)
+
+    pipe = leaderboard_client.pipeline(transaction=False)
+    pipe.zrevrank(key, user_id)
+    pipe.zcard(key)
+    rank, total = pipe.execute()
+    if rank is None:
+        return {'board': kind, 'board_id': board_id, 'rank': None, 'entries': [], 'total': total}
+
+    start = max(rank - radius, 0)
+    members = leaderboard_client.zrevrange(key, start, rank + radius, withscores=True)
+    return {
+        'board': kind,
+        'board_id': board_id,
+        'rank': rank + 1,
+        'entries': describe(kind, board_id, members, start),
+        'total': total
+    }
+
+# ============= QUIZ SCORE DISTRIBUTIONS =============
+#
+# Each quiz board keeps a {score: attempts} hash beside it. A score is
+# correct / total * 100, so a quiz has at most total_questions + 1 distinct
+# scores: the histogram is an exact, mergeable quantile sketch a few dozen
+# fields long, and percentiles never sort the scores table.
+
+def quiz_distribution(quiz_id):
+    """{score: attempts} for a quiz; one GROUP BY over its scores without Redis"""
+    if leaderboard_client is not None:
+        try:
+            distribution = leaderboard_client.hgetall(board_keys('quiz', quiz_id)[1])
+            return {float(score): int(count) for score, count in distribution.items()}
+        except Exception as e:
+            print(f"Score distribution read error: {e}")
+
+    return dict(db.session.query(Score.total_score, func.count(Score.score_id)).join(
+        User, Score.user_id == User.user_id
+    ).filter(Score.quiz_id == quiz_id, User.is_admin == False).group_by(Score.total_score).all())
+
+def score_standing(distribution, total_score):
+    """Percentile rank of total_score and the median of a distribution
+
+    The percentile counts ties as half below, so a quiz everyone aces puts
+    everyone at the 50th percentile.
+    """
+    attempts = sum(distribution.values())
+    if not attempts:
+        return {'percentile': None, 'median_score': None, 'total_attempts': 0}
+
+    below = sum(count for score, count in distribution.items() if score < total_score)
+    tied = distribution.get(float(total_score), 0)
+
+    def score_at(position):
+        seen = 0
+        for score in sorted(distribution):
+            seen += distribution[score]
+            if seen > position:
+                return score
+
+    return {
+        'percentile': round((below + tied / 2) / attempts * 100, 1),
+        'median_score': round((score_at((attempts - 1) // 2) + score_at(attempts // 2)) / 2, 2),
+        'total_attempts': attempts
+    }
+
+def quiz_standing(quiz_id, total_score):
+    return score_standing(quiz_distribution(quiz_id), total_score)
@@ -0,0 +1,102 @@
+# backend/migrations.py - Versioned schema migrations for existing databases
+
+from datetime import datetime
+from sqlalchemy import inspect, select, text
+from backend.models.models import db, SchemaMigration
+from backend.user_stats import rebuild_user_stats
+
+# db.create_all() builds new databases and new tables whole, but never alters
+# a table that already exists. Migrations cover those changes. Each one runs
+# once, in its own transaction with its schema_migrations row, and is written
+# to be a no-op on a schema create_all() already built.
+
+def column_names(connection, table):
+    return {column['name'] for column in inspect(connection).get_columns(table)}
+
+def add_anytime_quiz(connection):
+    if 'is_anytime_quiz' not in column_names(connection, 'quizzes'):
+        connection.execute(text("ALTER TABLE quizzes ADD COLUMN is_anytime_quiz BOOLEAN DEFAULT FALSE"))
+
+def add_question_count(connection):
+    if 'question_count' not in column_names(connection, 'quizzes'):
+        connection.execute(text("ALTER TABLE quizzes ADD COLUMN question_count INTEGER NOT NULL DEFAULT 0"))
+    connection.execute(text("""
+        UPDATE quizzes SET question_count = (
+            SELECT COUNT(*) FROM questions WHERE questions.quiz_id = quizzes.quiz_id
+        )
+    """))
+
+def add_score_history_index(connection):
+    connection.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_scores_user_history ON scores (
+            user_id, attempt_datetime, score_id,
+            quiz_id, total_score, correct_answers, total_questions, time_taken
+        )
+    """))
+
+# Foreign keys and hot filters that were full scans; see the __table_args__ in models.py
+HOT_QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_chapters_subject_id ON chapters (subject_id)",
+    "CREATE INDEX IF NOT EXISTS ix_quizzes_chapter_id ON quizzes (chapter_id)",
+    "CREATE INDEX IF NOT EXISTS ix_quizzes_expiry ON quizzes (is_active, auto_expire, end_date_time)",
+    "CREATE INDEX IF NOT EXISTS ix_questions_quiz_id ON questions (quiz_id)",
+    "CREATE INDEX IF NOT EXISTS ix_scores_quiz_score ON scores (quiz_id, total_score)",
+    "CREATE INDEX IF NOT EXISTS ix_scores_attempt_datetime ON scores (attempt_datetime)",
+]
+
+def add_hot_query_indexes(connection):
+    for statement in HOT_QUERY_INDEXES:
+        connection.execute(text(statement))
+    # Refresh planner statistics so the new indexes are costed from real row counts
+    connection.execute(text("ANALYZE"))
+
+def backfill_user_stats(connection):
+    # create_all() adds the rollup tables empty; fill them before the next
+    # submit folds a score into a partial row
+    rebuild_user_stats(connection)
+
+# (version, name, function) in the order they must run; never renumber or edit a shipped entry
+MIGRATIONS = [
+    (1, 'add quizzes.is_anytime_quiz', add_anytime_quiz),
+    (2, 'add and backfill quizzes.question_count', add_question_count),
+    (3, 'add covering score history index', add_score_history_index),
+    (4, 'add hot query index pack', add_hot_query_indexes),
+    (5, 'backfill user_stats and user_subject_stats rollups', backfill_user_stats),
+]
+
+def applied_migrations():
+    """{version: applied_at}; empty before the schema_migrations table exists"""
+    table = SchemaMigration.__table__
+    with db.engine.connect() as connection:
+        if not inspect(connection).has_table(table.name):
+            return {}
+        return dict(connection.execute(select(table.c.version, table.c.applied_at)).all())
+
+def pending_migrations():
+    applied = applied_migrations()
+    return [migration for migration in MIGRATIONS if migration[0] not in applied]
+
+def run_migrations():
+    """Create missing tables, then apply pending migrations in order
+
+    Returns the (version, name) of each migration applied.
+    """
+    db.create_all()
+    applied = []
+    for version, name, migrate in pending_migrations():
+        with db.engine.begin() as connection:
+            migrate(connection)
+            connection.execute(SchemaMigration.__table__.insert().values(
+                version=version, name=name, applied_at=datetime.utcnow()
+            ))
+        applied.append((version, name))
+    return applied
+
+def migration_status():
+    """Every known migration with its applied_at time (None while pending)"""
+    applied = applied_migrations()
+    return [{
+        'version': version,
+        'name': name,
+        'applied_at': applied.get(version)
+    } for version, name, _ in MIGRATIONS]
@@ -1,7 +1,7 @@
 # backend/models/models.py - FIXED VERSION
 
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from backend.passwords import hash_password, verify_password
 from datetime import datetime,timedelta
 
 db = SQLAlchemy()
@@ -21,12 +21,12 @@ class User(db.Model):
     scores = db.relationship('Score', backref='user', lazy=True, cascade="all, delete-orphan")
 
     def set_password(self, password):
-        """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set password (in the hashing pool when one is configured)"""
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         """Check if provided password matches hash"""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)[0]
     
     def to_dict(self):
         """Convert user object to dictionary"""
@@ -98,8 +98,12 @@ class Chapter(db.Model):
 
     quizzes = db.relationship('Quiz', backref='chapter', lazy=True, cascade="all, delete-orphan")
 
-    # Combination of name and subject_id must be unique
-    __table_args__ = (db.UniqueConstraint('name', 'subject_id', name='unique_chapter_name_per_subject'),)
+    __table_args__ = (
+        # Combination of name and subject_id must be unique
+        db.UniqueConstraint('name', 'subject_id', name='unique_chapter_name_per_subject'),
+        # The unique constraint leads with name, so subject lookups need their own index
+        db.Index('ix_chapters_subject_id', 'subject_id'),
+    )
 
     def to_dict(self):
         return {
@@ -135,6 +139,16 @@ class Quiz(db.Model):
     allow_multiple_attempts = db.Column(db.Boolean, default=False)
     show_results_immediately = db.Column(db.Boolean, default=True)
     remarks = db.Column(db.Text)
+    
+    # Denormalized counter maintained by the question create/delete routes
+    question_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        db.Index('ix_quizzes_chapter_id', 'chapter_id'),
+        # The expiry sweep and warnings filter on exactly these columns; is_active alone
+        # (cache warm-up, reports) uses the prefix
+        db.Index('ix_quizzes_expiry', 'is_active', 'auto_expire', 'end_date_time'),
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -157,7 +171,7 @@ class Quiz(db.Model):
         
         return end_time
 
-    def is_expired(self):
+    def is_expired(self, now=None):
         """Check if quiz has expired"""
         if not self.auto_expire:
             return False
@@ -166,15 +180,15 @@ class Quiz(db.Model):
         if not effective_end:
             return False
             
-        return datetime.utcnow() > effective_end
+        return (now or datetime.utcnow()) > effective_end
 
     def should_auto_lock(self):
         """Check if quiz should be automatically locked"""
         return self.auto_expire and self.is_expired()
 
-    def get_status(self):
+    def get_status(self, now=None):
         """Get current quiz status with auto-expiry logic"""
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
         
         # Check if manually deactivated
         if not self.is_active:
@@ -189,7 +203,7 @@ class Quiz(db.Model):
             return 'upcoming'
         
         # Check if quiz has expired
-        if self.is_expired():
+        if self.is_expired(now):
             return 'expired'
         
         # Check if quiz is ending soon (within 30 minutes)
@@ -209,18 +223,21 @@ class Quiz(db.Model):
             return True
         return False
 
-    def is_available_for_attempt(self, user_id=None):
-        """Check if quiz is available for attempts (with auto-expiry check)"""
-        # Auto-lock if expired
-        was_locked = self.auto_lock_if_expired()
-        if was_locked:
-            db.session.commit()  # Save the auto-lock
-        
+    def is_available_for_attempt(self, user_id=None, now=None):
+        """Check if quiz is available for attempts (with auto-expiry check)
+
+        Read-only: an expired quiz is treated as locked here, and persisting
+        is_active=False is left to the check_and_expire_quizzes sweep.
+        """
         # Check basic availability
         if not self.is_active:
             return False, "Quiz is not active"
         
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
+        
+        # Expired quizzes are locked even before the sweep persists it
+        if self.is_expired(now):
+            return False, "Quiz has expired"
         
         # For anytime quizzes, skip time-based checks
         if self.is_anytime_quiz:
@@ -241,10 +258,6 @@ class Quiz(db.Model):
         if now < self.date_of_quiz:
             return False, "Quiz has not started yet"
         
-        # Check if quiz has expired
-        if self.is_expired():
-            return False, "Quiz has expired"
-        
         # Check multiple attempts if user specified
         if user_id and not self.allow_multiple_attempts:
             existing_attempt = Score.query.filter_by(
@@ -257,20 +270,34 @@ class Quiz(db.Model):
         
         return True, "Quiz is available"
 
-    def get_time_remaining(self):
+    def is_open(self, now=None):
+        """Check if quiz is open for attempts right now, without side effects"""
+        now = now or datetime.utcnow()
+        if not self.is_active or self.is_expired(now):
+            return False
+        return self.is_anytime_quiz or now >= self.date_of_quiz
+
+    def get_time_remaining(self, now=None):
         """Get time remaining until quiz expires (in minutes)"""
         effective_end = self.get_effective_end_time()
         if not effective_end:
             return None
             
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
         if now > effective_end:
             return 0
             
         diff = effective_end - now
         return int(diff.total_seconds() / 60)
 
-    def to_dict(self):
+    def to_dict(self, now=None):
+        """Serialize quiz without touching the database
+
+        Temporal fields are all derived from a single `now`, which callers
+        serializing many quizzes should compute once and pass in.
+        """
+        now = now or datetime.utcnow()
+        effective_end = self.get_effective_end_time()
         return {
             'id': self.quiz_id,
             'quiz_id': self.quiz_id,
@@ -278,7 +305,7 @@ class Quiz(db.Model):
             'chapter_id': self.chapter_id,
             'date_of_quiz': self.date_of_quiz.isoformat() if self.date_of_quiz else None,
             'end_date_time': self.end_date_time.isoformat() if self.end_date_time else None,
-            'effective_end_time': self.get_effective_end_time().isoformat() if self.get_effective_end_time() else None,
+            'effective_end_time': effective_end.isoformat() if effective_end else None,
             'time_duration': self.time_duration,
             'is_anytime_quiz': self.is_anytime_quiz,
             'is_active': self.is_active,
@@ -289,13 +316,33 @@ class Quiz(db.Model):
             'remarks': self.remarks,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'question_count': len(self.questions) if self.questions else 0,
-            'status': self.get_status(),
-            'time_remaining': self.get_time_remaining(),
-            'is_expired': self.is_expired(),
-            'is_available': self.is_available_for_attempt()[0]
+            'question_count': self.question_count or 0,
+            'status': self.get_status(now),
+            'time_remaining': self.get_time_remaining(now),
+            'is_expired': self.is_expired(now),
+            'is_available': self.is_open(now)
         }
 
+def sync_question_counts(quiz_ids=None):
+    """Recompute Quiz.question_count from the questions table"""
+    counts = db.session.query(
+        Question.quiz_id, db.func.count(Question.question_id)
+    ).group_by(Question.quiz_id)
+    quizzes = Quiz.query
+    if quiz_ids is not None:
+        counts = counts.filter(Question.quiz_id.in_(quiz_ids))
+        quizzes = quizzes.filter(Quiz.quiz_id.in_(quiz_ids))
+    counts = dict(counts.all())
+
+    updated = 0
+    for quiz in quizzes.all():
+        count = counts.get(quiz.quiz_id, 0)
+        if quiz.question_count != count:
+            quiz.question_count = count
+            updated += 1
+    db.session.commit()
+    return updated
+
 class Question(db.Model):
     __tablename__ = 'questions'
 
@@ -310,6 +357,8 @@ class Question(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (db.Index('ix_questions_quiz_id', 'quiz_id'),)
+
     def to_dict(self):
         return {
             'id': self.question_id,
@@ -337,7 +386,16 @@ class Score(db.Model):
     attempt_datetime = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Ensure one attempt per user per quiz (unless multiple attempts allowed)
-    __table_args__ = (db.UniqueConstraint('user_id', 'quiz_id', name='unique_user_quiz_attempt'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'quiz_id', name='unique_user_quiz_attempt'),
+        # Covering index for the score history: keyset pages are a range scan with no table lookups
+        db.Index('ix_scores_user_history', 'user_id', 'attempt_datetime', 'score_id',
+                 'quiz_id', 'total_score', 'correct_answers', 'total_questions', 'time_taken'),
+        # Per-quiz score distributions and cascades from quiz deletes
+        db.Index('ix_scores_quiz_score', 'quiz_id', 'total_score'),
+        # Site-wide activity windows (daily report)
+        db.Index('ix_scores_attempt_datetime', 'attempt_datetime'),
+    )
 
     def to_dict(self):
         return {
@@ -349,4 +407,47 @@ class Score(db.Model):
             'total_score': self.total_score,
             'time_taken': self.time_taken,
             'attempt_datetime': self.attempt_datetime.isoformat() if self.attempt_datetime else None
-        }
\ No newline at end of file
+        }
+
+class UserStats(db.Model):
+    """Per-user rollup of the scores table
+
+    Updated in the same transaction as every Score insert (backend/user_stats.py),
+    so profile and summary endpoints read one row instead of every score.
+    """
+    __tablename__ = 'user_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), primary_key=True)
+    attempt_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+    best_score = db.Column(db.Float, nullable=False, default=0)
+    total_time = db.Column(db.Integer, nullable=False, default=0)  # Seconds
+    last_attempt_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def average_score(self):
+        return round(self.score_sum / self.attempt_count, 2) if self.attempt_count else 0
+
+class UserSubjectStats(db.Model):
+    """Per-user, per-subject rollup of the scores table (same upkeep as UserStats)"""
+    __tablename__ = 'user_subject_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), primary_key=True)
+    subject_id = db.Column(db.Integer, db.ForeignKey("subjects.subject_id"), primary_key=True)
+    attempt_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+    best_score = db.Column(db.Float, nullable=False, default=0)
+    total_time = db.Column(db.Integer, nullable=False, default=0)  # Seconds
+    last_attempt_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def average_score(self):
+        return round(self.score_sum / self.attempt_count, 2) if self.attempt_count else 0
+
+class SchemaMigration(db.Model):
+    """A migration applied by backend/migrations.py"""
+    __tablename__ = 'schema_migrations'
+
+    version = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
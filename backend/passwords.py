@@ -0,0 +1,133 @@
+# backend/passwords.py - Password hashing offloaded to a bounded process pool
+
+import os
+import multiprocessing
+import threading
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'  # Werkzeug's default cost
+DEFAULT_RETRY_AFTER = 2  # Seconds clients are told to wait when the pool is saturated
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503"""
+
+    def __init__(self, retry_after=DEFAULT_RETRY_AFTER):
+        super().__init__('Password hashing queue is full')
+        self.retry_after = retry_after
+
+# Settings from init_passwords; without it hashing runs inline (scripts, shells)
+hash_method = DEFAULT_HASH_METHOD
+hash_prefix = DEFAULT_HASH_METHOD
+hash_workers = 0
+hash_timeout = 10
+retry_after = DEFAULT_RETRY_AFTER
+
+_executor = None
+_executor_pid = None
+_slots = None  # Bounds queued plus running jobs
+_lock = threading.Lock()
+_bulk_lock = threading.Lock()  # One hash_many at a time, so imports cannot flood the pool
+
+def init_passwords(app):
+    """Configure the hash cost and the worker pool from the app config
+
+    PASSWORD_HASH_WORKERS=0 hashes inline in the request thread.
+    """
+    global hash_method, hash_prefix, hash_workers, hash_timeout, retry_after, _slots
+    hash_method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+    # Werkzeug fills in default parameters, so compare against what it actually writes
+    hash_prefix = generate_password_hash('', hash_method).split('$', 1)[0]
+    hash_workers = app.config.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+    hash_timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+    retry_after = app.config.get('PASSWORD_HASH_RETRY_AFTER', DEFAULT_RETRY_AFTER)
+    queue_limit = app.config.get('PASSWORD_HASH_QUEUE_LIMIT', hash_workers * 16)
+    _slots = threading.BoundedSemaphore(queue_limit) if hash_workers else None
+    shutdown_pool()
+    if hash_workers:
+        # Start the workers now: create_app calls this before the cache and
+        # suggestion listeners start, while a plain fork is still safe
+        get_executor().submit(os.getpid).result()
+
+def pool_context():
+    """fork while this process runs no other thread, forkserver once it does
+
+    A fork copies locks other threads hold mid-use, which can deadlock a
+    worker and keep its queue slot forever. forkserver re-imports the
+    __main__ script in each worker (app.py builds an app at import), so it
+    is kept for pools started late: a forked server worker or a restart
+    after BrokenProcessPool.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()  # Windows: spawn is the only choice
+    return multiprocessing.get_context('fork' if threading.active_count() == 1 else 'forkserver')
+
+def get_executor():
+    """The worker pool, created by init_passwords or on first use in a forked server process"""
+    global _executor, _executor_pid
+    with _lock:
+        # Forked server workers must not share their parent's pool
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(max_workers=hash_workers, mp_context=pool_context())
+            _executor_pid = os.getpid()
+        return _executor
+
+def shutdown_pool():
+    global _executor
+    with _lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def run_hashing(func, *args):
+    """Run a hashing call in the pool, or raise PasswordHasherBusy if it is saturated"""
+    if not hash_workers:
+        return func(*args)
+
+    slots = _slots  # init_passwords may swap in a new semaphore meanwhile
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy(retry_after)
+    try:
+        future = get_executor().submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # The slot comes back when the job leaves the pool (finished, failed or
+    # cancelled), not when this request gives up waiting, so abandoned hashes
+    # still count against the queue limit
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=hash_timeout)
+    except FutureTimeoutError:
+        future.cancel()  # Drops it if still queued; a running hash frees its slot when done
+        raise PasswordHasherBusy(retry_after)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool next time
+        shutdown_pool()
+        raise
+
+def hash_password(password):
+    return run_hashing(generate_password_hash, password, hash_method)
+
+def needs_rehash(pwhash):
+    """True if pwhash was made with a different method or cost than configured"""
+    return pwhash.split('$', 1)[0] != hash_prefix
+
+def verify_password(pwhash, password):
+    """Check a password; returns (matches, needs_rehash)"""
+    matches = run_hashing(check_password_hash, pwhash, password)
+    return matches, matches and needs_rehash(pwhash)
+
+def hash_many(passwords, chunksize=16):
+    """Hash a list of passwords for bulk imports on the shared worker pool
+
+    Bypasses the login queue limit, so one bulk job at a time per process
+    holds the pool; concurrent imports wait their turn.
+    """
+    # Daemonic processes (Celery prefork children) cannot start a pool
+    if not hash_workers or multiprocessing.current_process().daemon:
+        return [generate_password_hash(password, hash_method) for password in passwords]
+    with _bulk_lock:
+        return list(get_executor().map(generate_password_hash, passwords, repeat(hash_method), chunksize=chunksize))
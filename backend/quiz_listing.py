@@ -0,0 +1,119 @@
+# backend/quiz_listing.py - Batched quiz listing for a subject
+
+from sqlalchemy import and_, or_
+from backend.models.models import db, Chapter, Quiz, Score
+from backend.cache import get_cache, set_cache, versioned_key, CacheKeys, CacheExpiry
+
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(chapter_id, quiz_id):
+    """Encode the position of a quiz in the (chapter_id, quiz_id) ordering"""
+    return f"{chapter_id}:{quiz_id}"
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    chapter_id, quiz_id = cursor.split(':')
+    return int(chapter_id), int(quiz_id)
+
+def subject_quiz_query(subject_id):
+    """All quizzes of a subject joined with their chapter, in a stable order"""
+    return db.session.query(Quiz, Chapter.name).join(
+        Chapter, Quiz.chapter_id == Chapter.chapter_id
+    ).filter(
+        Chapter.subject_id == subject_id
+    ).order_by(Quiz.chapter_id, Quiz.quiz_id)
+
+def load_user_attempts(user_id, quiz_ids):
+    """The user's Score per quiz with one IN query"""
+    if not quiz_ids:
+        return {}
+    attempts = {}
+    scores = Score.query.filter(
+        Score.user_id == user_id,
+        Score.quiz_id.in_(quiz_ids)
+    ).order_by(Score.score_id).all()
+    for score in scores:
+        attempts.setdefault(score.quiz_id, score)
+    return attempts
+
+def quiz_summary(quiz, chapter_name):
+    """The user-independent part of a quiz listing entry"""
+    return {
+        'quiz_id': quiz.quiz_id,
+        'title': quiz.title,
+        'chapter_name': chapter_name,
+        'chapter_id': quiz.chapter_id,
+        'date_of_quiz': quiz.date_of_quiz.isoformat() if quiz.date_of_quiz else None,
+        'time_duration': quiz.time_duration,
+        'remarks': quiz.remarks,
+        'question_count': quiz.question_count or 0,
+        'is_active': quiz.is_active,
+        'is_anytime_quiz': quiz.is_anytime_quiz
+    }
+
+def merge_attempts(summaries, user_id):
+    """Add the user's attempt fields to quiz summaries"""
+    attempts = load_user_attempts(user_id, [summary['quiz_id'] for summary in summaries])
+
+    quiz_list = []
+    for summary in summaries:
+        user_score = attempts.get(summary['quiz_id'])
+        quiz_list.append(dict(
+            summary,
+            attempted=user_score is not None,
+            user_score=user_score.total_score if user_score else None,
+            attempt_date=user_score.attempt_datetime.isoformat() if user_score else None
+        ))
+    return quiz_list
+
+def build_quiz_list(rows, user_id):
+    """Merge quiz rows with the user's attempts in memory"""
+    return merge_attempts([quiz_summary(quiz, chapter_name) for quiz, chapter_name in rows], user_id)
+
+def subject_quizzes_key(subject_id):
+    """Lives in the subject list namespace, which every quiz write invalidates"""
+    return versioned_key(CacheKeys.SUBJECT_LIST, subject_id, 'quizzes')
+
+def refresh_subject_quiz_summaries(subject_id):
+    """Load a subject's quiz summaries from the database and cache them"""
+    summaries = [quiz_summary(quiz, chapter_name) for quiz, chapter_name in subject_quiz_query(subject_id).all()]
+    set_cache(subject_quizzes_key(subject_id), summaries, CacheExpiry.LONG)
+    return summaries
+
+def get_subject_quiz_summaries(subject_id):
+    """A subject's quiz summaries, served from cache when possible"""
+    cached = get_cache(subject_quizzes_key(subject_id))
+    if cached is not None:
+        return cached
+    return refresh_subject_quiz_summaries(subject_id)
+
+def list_subject_quizzes(subject_id, user_id):
+    """Every quiz of a subject for a user"""
+    return merge_attempts(get_subject_quiz_summaries(subject_id), user_id)
+
+def list_subject_quizzes_page(subject_id, user_id, page=1, per_page=20):
+    """Offset-paginated quizzes of a subject; returns (quiz_list, total)"""
+    query = subject_quiz_query(subject_id)
+    total = query.order_by(None).count()
+    rows = query.offset((page - 1) * per_page).limit(per_page).all()
+    return build_quiz_list(rows, user_id), total
+
+def list_subject_quizzes_after(subject_id, user_id, cursor=None, limit=20):
+    """Keyset-paginated quizzes of a subject; returns (quiz_list, next_cursor)"""
+    query = subject_quiz_query(subject_id)
+    if cursor:
+        chapter_id, quiz_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            Quiz.chapter_id > chapter_id,
+            and_(Quiz.chapter_id == chapter_id, Quiz.quiz_id > quiz_id)
+        ))
+
+    # Fetch one extra row to find out whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_quiz = rows[-1][0]
+        next_cursor = encode_cursor(last_quiz.chapter_id, last_quiz.quiz_id)
+
+    return build_quiz_list(rows, user_id), next_cursor
@@ -0,0 +1,53 @@
+# backend/quiz_payloads.py - Prebuilt question payloads for quiz attempts
+
+from backend.models.models import db, Question, Chapter, Subject
+from backend.cache import get_cache, set_cache, versioned_key, CacheKeys, CacheExpiry
+from backend.answer_keys import answer_key_version
+
+def quiz_payload_key(quiz):
+    """Keyed by the answer key version, so question edits never serve stale options"""
+    return versioned_key(CacheKeys.QUIZ_DETAILS, quiz.quiz_id, answer_key_version(quiz))
+
+def build_quiz_payload(quiz):
+    """The time-independent part of the start_quiz response (no correct options)"""
+    questions = db.session.query(
+        Question.question_id, Question.question_statement,
+        Question.option1, Question.option2, Question.option3, Question.option4
+    ).filter(Question.quiz_id == quiz.quiz_id).order_by(Question.question_id).all()
+
+    names = db.session.query(Chapter.name, Subject.name).join(
+        Subject, Chapter.subject_id == Subject.subject_id
+    ).filter(Chapter.chapter_id == quiz.chapter_id).first()
+
+    return {
+        'quiz_id': quiz.quiz_id,
+        'title': quiz.title,
+        'duration': quiz.time_duration,
+        'total_questions': len(questions),
+        'questions': [{
+            'id': question.question_id,
+            'statement': question.question_statement,
+            'options': [question.option1, question.option2] + [
+                option for option in (question.option3, question.option4) if option
+            ]
+        } for question in questions],
+        'chapter_name': names[0] if names else None,
+        'subject_name': names[1] if names else None,
+        'show_results_immediately': quiz.show_results_immediately,
+        'auto_expire_enabled': quiz.auto_expire,
+        'is_anytime_quiz': quiz.is_anytime_quiz
+    }
+
+def refresh_quiz_payload(quiz):
+    """Build a quiz's payload and cache it; returns (key, payload)"""
+    payload = build_quiz_payload(quiz)
+    key = quiz_payload_key(quiz)
+    set_cache(key, payload, CacheExpiry.VERY_LONG, tags=[f"quiz:{quiz.quiz_id}"])
+    return key, payload
+
+def get_quiz_payload(quiz):
+    """A quiz's question payload, served from cache when possible"""
+    cached = get_cache(quiz_payload_key(quiz))
+    if cached is not None:
+        return cached
+    return refresh_quiz_payload(quiz)[1]
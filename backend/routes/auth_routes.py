@@ -1,12 +1,33 @@
 from flask import Blueprint, request, jsonify, render_template,redirect
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_jwt_extended import create_access_token, jwt_required
 from backend.models.models import db, User
+from backend.identity import current_user_profile, current_user_row
+from backend.passwords import PasswordHasherBusy, hash_password, verify_password
 from datetime import datetime, timedelta
 from sqlalchemy.exc import IntegrityError
 
 auth_bp = Blueprint('auth', __name__,url_prefix='/api/auth')
 
+def hashing_busy(error):
+    """Fast 503 while the password hashing pool is saturated"""
+    db.session.rollback()
+    headers = {'Retry-After': str(error.retry_after)}
+    if request.is_json:
+        return jsonify({
+            'error': 'Server is busy, please try again shortly',
+            'retry_after': error.retry_after
+        }), 503, headers
+    return "Server is busy, please try again shortly", 503, headers
+
+def upgrade_password_hash(user, password):
+    """Re-hash a verified password with the configured cost"""
+    try:
+        user.password_hash = hash_password(password)
+        db.session.commit()
+    except PasswordHasherBusy:
+        # Keep the old hash; the next login upgrades it
+        db.session.rollback()
+
 @auth_bp.route('/register', methods=['GET', 'POST'])
 def register():
     """Register a new user"""
@@ -68,7 +89,14 @@ def register():
         
         db.session.add(user)
         db.session.commit()
-        access_token = create_access_token(identity=user.user_name)
+        access_token = create_access_token(
+            identity=user.user_name,
+            additional_claims={
+                'user_id': user.user_id,
+                'is_admin': user.is_admin,
+                'full_name': user.full_name
+            }
+        )
         
         # Return appropriate response based on request type
         if request.is_json:
@@ -81,6 +109,8 @@ def register():
             # For HTML form, redirect to login page
             return redirect('/api/auth/login')
         
+    except PasswordHasherBusy as e:
+        return hashing_busy(e)
     except IntegrityError:
         db.session.rollback()
         if request.is_json:
@@ -123,13 +153,17 @@ def login():
         
         # Find user
         user = User.query.filter_by(user_name=data['user_name']).first()
+        matches, rehash = verify_password(user.password_hash, data['password']) if user else (False, False)
         
-        if not user or not user.check_password(data['password']):
+        if not matches:
             if request.is_json:
                 return jsonify({'error': 'Invalid credentials'}), 401
             else:
                 return "Invalid credentials", 401
         
+        if rehash:
+            upgrade_password_hash(user, data['password'])
+        
         # Create JWT token with user info
         additional_claims = {
             'user_id': user.user_id,
@@ -154,6 +188,8 @@ def login():
             # or set the token in a cookie/session for web app usage
             return f"Login successful! Welcome {user.full_name}"
         
+    except PasswordHasherBusy as e:
+        return hashing_busy(e)
     except Exception as e:
         print(f"Exception duing Login: {e}")
         if request.is_json:
@@ -174,10 +210,14 @@ def admin_login():
         
         # Find user and check if admin
         user = User.query.filter_by(user_name=data['user_name'], is_admin=True).first()
+        matches, rehash = verify_password(user.password_hash, data['password']) if user else (False, False)
         
-        if not user or not user.check_password(data['password']):
+        if not matches:
             return jsonify({'error': 'Invalid admin credentials'}), 401
         
+        if rehash:
+            upgrade_password_hash(user, data['password'])
+        
         # Create JWT token with admin info
         additional_claims = {
             'user_id': user.user_id,
@@ -196,6 +236,8 @@ def admin_login():
             'user': user.to_dict()
         }), 200
         
+    except PasswordHasherBusy as e:
+        return hashing_busy(e)
     except Exception as e:
         return jsonify({'error': 'Admin login failed', 'details': str(e)}), 500
 
@@ -222,14 +264,13 @@ def logout():
 def get_profile():
     """Get current user profile"""
     try:
-        current_user = get_jwt_identity()
-        user = User.query.filter_by(user_name=current_user).first()
+        profile = current_user_profile()
         
-        if not user:
+        if not profile:
             return jsonify({'error': 'User not found'}), 404
             
         return jsonify({
-            'user': user.to_dict()
+            'user': profile
         }), 200
         
     except Exception as e:
@@ -240,13 +281,12 @@ def get_profile():
 def change_password():
     """Change user password"""
     try:
-        current_user = get_jwt_identity()
         data = request.get_json()
         
         if not data.get('old_password') or not data.get('new_password'):
             return jsonify({'error': 'Old password and new password are required'}), 400
         
-        user = User.query.filter_by(user_name=current_user).first()
+        user = current_user_row()
         
         if not user or not user.check_password(data['old_password']):
             return jsonify({'error': 'Invalid old password'}), 401
@@ -256,6 +296,8 @@ def change_password():
         
         return jsonify({'message': 'Password changed successfully'}), 200
         
+    except PasswordHasherBusy as e:
+        return hashing_busy(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to change password', 'details': str(e)}), 500
@@ -1,14 +1,23 @@
 # routes/user_routes.py 
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from backend.models.models import db, User, Subject, Chapter, Quiz, Question, Score
-from datetime import datetime, timedelta
+from flask_jwt_extended import jwt_required
+from backend.models.models import db, Subject, Chapter, Quiz, Question, Score, UserSubjectStats
+from datetime import datetime
 from sqlalchemy import func
 import traceback
 from utils.decorators import user_required
 from backend.api.notification_tasks import export_user_quiz_csv
-from backend.cache import cache_decorator, CacheKeys, CacheExpiry, invalidate_user_cache
+from backend.identity import current_identity, current_writer, current_user_profile
+from backend.cache import response_cache, CacheKeys, CacheExpiry, invalidate_user_cache
+from backend.dashboard import get_subject_summaries
+from backend.answer_keys import get_answer_key
+from backend.quiz_payloads import get_quiz_payload
+from backend.ingestion import is_queue_enabled, enqueue_submission, get_receipt
+from backend.leaderboards import is_leaderboard_enabled, record_score, leaderboard_page, leaderboard_around, quiz_standing
+from backend.user_stats import record_user_stats, score_row, load_user_stats, recent_attempt_count
+from backend.score_history import list_user_scores, parse_fields, MAX_HISTORY_LIMIT
+from backend.quiz_listing import list_subject_quizzes, list_subject_quizzes_page, list_subject_quizzes_after, MAX_PAGE_SIZE
 
 user_bp = Blueprint('user', __name__, url_prefix='/api/user')
 
@@ -17,35 +26,14 @@ user_bp = Blueprint('user', __name__, url_prefix='/api/user')
 def user_dashboard():
     """Get user dashboard data with subjects"""
     try:
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
         print("Fetching user dashboard data for:", user.user_name)
 
-        # Get active subjects with chapter and quiz counts
-        subjects = Subject.query.filter_by(is_active=True).all()
-        subject_list = []
-        print("Found subjects:", len(subjects))
-        for subj in subjects:
-            # Count chapters and available quizzes for this subject
-            chapter_count = Chapter.query.filter_by(subject_id=subj.subject_id).count()
-            
-            # Count quizzes that are currently available (date <= now)
-            available_quizzes = db.session.query(Quiz).join(Chapter).filter(
-                Chapter.subject_id == subj.subject_id,
-                Quiz.is_active == True,
-                Quiz.date_of_quiz <= datetime.utcnow()
-            ).count()
-            
-            subject_list.append({
-                'id': subj.subject_id,
-                'name': subj.name,
-                'description': subj.description,
-                'chapter_count': chapter_count,
-                'available_quizzes': available_quizzes
-            })
+        # Chapter and available-quiz counts for all active subjects in one grouped query
+        subject_list = get_subject_summaries()
         print("Subjects processed:", len(subject_list))
 
         return jsonify({'subjects': subject_list}), 200
@@ -60,32 +48,20 @@ def user_dashboard():
 def get_profile():
     """Get user profile and stats"""
     try:
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        # Calculate user stats
-        scores = Score.query.filter_by(user_id=user.user_id).all()
-        total_attempts = len(scores)
-        
-        if total_attempts > 0:
-            total_score = sum([s.total_score for s in scores])
-            average_score = round(total_score / total_attempts, 2)
-            best_score = max([s.total_score for s in scores])
-            recent_attempts = len([s for s in scores if s.attempt_datetime >= datetime.utcnow() - timedelta(days=7)])
-        else:
-            average_score = 0
-            best_score = 0
-            recent_attempts = 0
+        # Rolled-up stats: one row instead of every score
+        stats = load_user_stats(user.user_id)
 
         return jsonify({
-            'user': user.to_dict(),
+            'user': current_user_profile(),
             'stats': {
-                'quizzes_attempted': total_attempts,
-                'average_score': average_score,
-                'recent_attempts': recent_attempts,
-                'best_score': best_score
+                'quizzes_attempted': stats.attempt_count if stats else 0,
+                'average_score': stats.average_score if stats else 0,
+                'recent_attempts': recent_attempt_count(stats),
+                'best_score': stats.best_score if stats else 0
             }
         }), 200
         
@@ -105,8 +81,7 @@ def check_answer_instantly(question_id):
         
         print(f"Selected option (0-based): {selected_option}")
         
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -151,54 +126,59 @@ def check_answer_instantly(question_id):
 @user_bp.route('/subjects/<int:subject_id>/quizzes', methods=['GET'])
 @jwt_required()
 def get_quizzes_by_subject(subject_id):
-    """Get all available quizzes for a subject"""
+    """Get all available quizzes for a subject
+
+    Pass page/per_page for offset pagination or cursor/limit for keyset
+    pagination on very large subjects; with neither, every quiz is returned.
+    """
     try:
-        print("Inside get all quiz functions")
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
         # Get subject
         subject = Subject.query.get_or_404(subject_id)
-        
-        # Get chapters for this subject
-        chapters = Chapter.query.filter_by(subject_id=subject_id).all()
-        quiz_list = []
-        print(subject,chapters)
-
-        for chapter in chapters:
-            for quiz in chapter.quizzes:
-                # Check if user has already attempted this quiz
-                user_score = Score.query.filter_by(
-                    user_id=user.user_id, 
-                    quiz_id=quiz.quiz_id
-                ).first()
-                
-                # Get question count
-                question_count = Question.query.filter_by(quiz_id=quiz.quiz_id).count()
-                print(f"Question count {question_count}")
-                
-                quiz_data = {
-                    'quiz_id': quiz.quiz_id,
-                    'title': quiz.title,
-                    'chapter_name': chapter.name,
-                    'chapter_id': chapter.chapter_id,
-                    'date_of_quiz': quiz.date_of_quiz.isoformat() if quiz.date_of_quiz else None,
-                    'time_duration': quiz.time_duration,
-                    'remarks': quiz.remarks,
-                    'question_count': question_count,
-                    'is_active': quiz.is_active,
-                    'is_anytime_quiz': quiz.is_anytime_quiz,
-                    'attempted': user_score is not None,
-                    'user_score': user_score.total_score if user_score else None,
-                    'attempt_date': user_score.attempt_datetime.isoformat() if user_score else None
-                }
-                quiz_list.append(quiz_data)
+
+        page = request.args.get('page', type=int)
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
+
+        if page is not None:
+            per_page = request.args.get('per_page', 20, type=int)
+            if page < 1:
+                return jsonify({'error': 'page must be positive'}), 400
+            if not 1 <= per_page <= MAX_PAGE_SIZE:
+                return jsonify({'error': f'per_page must be between 1 and {MAX_PAGE_SIZE}'}), 400
+
+            quiz_list, total = list_subject_quizzes_page(subject_id, user.user_id, page, per_page)
+            return jsonify({
+                'subject': subject.to_dict(),
+                'quizzes': quiz_list,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page,
+                'current_page': page,
+                'per_page': per_page
+            }), 200
+
+        if cursor is not None or limit is not None:
+            if limit is None:
+                limit = 20
+            if not 1 <= limit <= MAX_PAGE_SIZE:
+                return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+            try:
+                quiz_list, next_cursor = list_subject_quizzes_after(subject_id, user.user_id, cursor, limit)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+            return jsonify({
+                'subject': subject.to_dict(),
+                'quizzes': quiz_list,
+                'next_cursor': next_cursor
+            }), 200
 
         return jsonify({
             'subject': subject.to_dict(),
-            'quizzes': quiz_list
+            'quizzes': list_subject_quizzes(subject_id, user.user_id)
         }), 200
         
     except Exception as e:
@@ -209,8 +189,7 @@ def get_quizzes_by_subject(subject_id):
 def check_quiz_status(quiz_id):
     """Check current quiz status (useful for live updates)"""
     try:
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -218,21 +197,21 @@ def check_quiz_status(quiz_id):
         if not quiz:
             return jsonify({'error': 'Quiz not found'}), 404
         
-        # Check if quiz should be auto-locked
-        was_locked = quiz.auto_lock_if_expired()
-        if was_locked:
-            db.session.commit()
+        # Expiry is computed here; the background sweep persists the lock
+        now = datetime.utcnow()
+        was_locked = quiz.is_active and quiz.is_expired(now)
+        effective_end = quiz.get_effective_end_time()
         
-        is_available, message = quiz.is_available_for_attempt(user.user_id)
+        is_available, message = quiz.is_available_for_attempt(user.user_id, now)
         
         return jsonify({
             'quiz_id': quiz.quiz_id,
             'title': quiz.title,
-            'status': quiz.get_status(),
+            'status': quiz.get_status(now),
             'is_available': is_available,
             'availability_message': message,
-            'time_remaining': quiz.get_time_remaining(),
-            'expires_at': quiz.get_effective_end_time().isoformat() if quiz.get_effective_end_time() else None,
+            'time_remaining': quiz.get_time_remaining(now),
+            'expires_at': effective_end.isoformat() if effective_end else None,
             'was_auto_locked': was_locked,
             'current_time': datetime.now().isoformat()
         }), 200
@@ -249,8 +228,7 @@ def start_quiz(quiz_id):
         print(f"Quiz ID: {quiz_id}")
         print(f"Timestamp: {datetime.now()}")
         
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -263,7 +241,7 @@ def start_quiz(quiz_id):
         print(f"Quiz active: {quiz.is_active}")
         print(f"Quiz expired: {quiz.is_expired()}")
         
-        # AUTO-EXPIRY CHECK: This will automatically lock quiz if expired
+        # AUTO-EXPIRY CHECK: Expired quizzes are reported as locked
         is_available, message = quiz.is_available_for_attempt(user.user_id)
         
         if not is_available:
@@ -276,39 +254,16 @@ def start_quiz(quiz_id):
         
         print(f"✅ Quiz available for attempt")
         
-        # Get questions
-        questions = Question.query.filter_by(quiz_id=quiz_id).all()
-        if not questions:
+        # Questions come prebuilt from the cache (see backend/quiz_payloads.py)
+        payload = get_quiz_payload(quiz)
+        if not payload['total_questions']:
             return jsonify({'error': 'No questions available for this quiz'}), 404
 
-        question_data = []
-        for q in questions:
-            options = [q.option1, q.option2]
-            if q.option3:
-                options.append(q.option3)
-            if q.option4:
-                options.append(q.option4)
-                
-            question_data.append({
-                'id': q.question_id,
-                'statement': q.question_statement,
-                'options': options
-            })
-
-        response_data = {
-            'quiz_id': quiz.quiz_id,
-            'title': quiz.title,
-            'duration': quiz.time_duration,
-            'total_questions': len(questions),
-            'questions': question_data,
-            'chapter_name': quiz.chapter.name if quiz.chapter else None,
-            'subject_name': quiz.chapter.subject.name if quiz.chapter and quiz.chapter.subject else None,
-            'time_remaining_until_expiry': quiz.get_time_remaining(),
-            'quiz_expires_at': quiz.get_effective_end_time().isoformat() if quiz.get_effective_end_time() else None,
-            'show_results_immediately': quiz.show_results_immediately,
-            'auto_expire_enabled': quiz.auto_expire,
-            'is_anytime_quiz': quiz.is_anytime_quiz
-        }
+        response_data = dict(
+            payload,
+            time_remaining_until_expiry=quiz.get_time_remaining(),
+            quiz_expires_at=quiz.get_effective_end_time().isoformat() if quiz.get_effective_end_time() else None
+        )
     
         print(f"Time until expiry: {quiz.get_time_remaining()} minutes")
         return jsonify(response_data), 200
@@ -331,8 +286,8 @@ def submit_quiz(quiz_id):
         user_answers = data.get('answers', {})
         time_taken = data.get('time_taken', 0)
 
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        # Deleted since login? The token alone would still let them add scores
+        user = current_writer()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -372,41 +327,40 @@ def submit_quiz(quiz_id):
                 print(f"❌ User {user.user_id} already attempted quiz {quiz_id}")
                 return jsonify({'error': 'You have already attempted this quiz'}), 403
 
-        # Process submission (existing logic)
-        questions = Question.query.filter_by(quiz_id=quiz_id).all()
-        if not questions:
+        # Grade against the cached answer key (no Question rows loaded)
+        answer_key = get_answer_key(quiz)
+        if not len(answer_key):
             return jsonify({'error': 'No questions found for this quiz'}), 404
 
-        total_questions = len(questions)
-        correct_answers = 0
-        detailed_results = []
-
-        for question in questions:
-            question_id = str(question.question_id)
-            user_answer_index = user_answers.get(question_id)
-            
-            is_correct = False
-            user_option = None
-            
-            if user_answer_index is not None:
-                user_option = user_answer_index + 1
-                is_correct = (user_option == question.correct_option)
-                if is_correct:
-                    correct_answers += 1
-            
-            detailed_results.append({
-                'question_id': question.question_id,
-                'question_text': question.question_statement,
-                'correct_option': question.correct_option,
-                'user_answer': user_option,
-                'is_correct': is_correct,
-                'options': [question.option1, question.option2, 
-                           question.option3 if question.option3 else None,
-                           question.option4 if question.option4 else None]
-            })
+        total_questions = len(answer_key)
+        correct_answers, detailed_results = answer_key.grade(user_answers)
 
         percentage_score = round((correct_answers / total_questions) * 100, 2) if total_questions > 0 else 0
         
+        # Queue mode: acknowledge now, a Celery consumer writes the Score in batches
+        if is_queue_enabled():
+            receipt_id = enqueue_submission(
+                quiz_id, user.user_id, total_questions, correct_answers, percentage_score, time_taken
+            )
+            if not receipt_id:
+                return jsonify({'error': 'Your submission for this quiz is already being processed'}), 409
+            
+            response_data = {
+                'message': 'Quiz submission received',
+                'receipt_id': receipt_id,
+                'status': 'queued',
+                'score': {
+                    'total_questions': total_questions,
+                    'correct_answers': correct_answers,
+                    'percentage_score': percentage_score,
+                    'time_taken': time_taken,
+                    'detailed_results': detailed_results
+                }
+            }
+            if submission_warning:
+                response_data['warning'] = submission_warning
+            return jsonify(response_data), 202
+        
         # Save score
         score_entry = Score(
             quiz_id=quiz_id,
@@ -414,11 +368,15 @@ def submit_quiz(quiz_id):
             total_questions=total_questions,
             correct_answers=correct_answers,
             total_score=percentage_score,
-            time_taken=time_taken
+            time_taken=time_taken,
+            attempt_datetime=datetime.utcnow()
         )
         
         db.session.add(score_entry)
+        record_user_stats([score_row(score_entry)])
         db.session.commit()
+        invalidate_user_cache(user.user_id)
+        record_score(user, quiz, percentage_score)
 
         print(f"✅ Quiz submitted successfully: {correct_answers}/{total_questions} = {percentage_score}%")
         if submission_warning:
@@ -448,60 +406,105 @@ def submit_quiz(quiz_id):
         return jsonify({'error': str(e)}), 500
 
 
+@user_bp.route('/submissions/<receipt_id>', methods=['GET'])
+@jwt_required()
+def get_submission_status(receipt_id):
+    """Get the status of a queued quiz submission"""
+    try:
+        if not is_queue_enabled():
+            return jsonify({'error': 'Submission queue is not enabled'}), 404
+        
+        user = current_identity()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        receipt = get_receipt(receipt_id)
+        if not receipt or receipt['user_id'] != user.user_id:
+            return jsonify({'error': 'Submission not found'}), 404
+        
+        receipt['receipt_id'] = receipt_id
+        return jsonify(receipt), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @user_bp.route('/scores', methods=['GET'])
 @jwt_required()
 def get_user_scores():
-    """Get user's quiz attempt history"""
+    """Get user's quiz attempt history, newest first
+
+    Pass limit (and the previous page's next_cursor) for keyset pagination
+    and fields=a,b,c to return only some fields; with no limit the whole
+    history is returned.
+    """
     try:
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
-        print(f"Fetching scores for user: {user.user_name} (ID: {user.user_id})")
-
-        # Get scores with quiz details
-        scores = db.session.query(Score, Quiz, Chapter, Subject).join(
-            Quiz, Score.quiz_id == Quiz.quiz_id
-        ).join(
-            Chapter, Quiz.chapter_id == Chapter.chapter_id
-        ).join(
-            Subject, Chapter.subject_id == Subject.subject_id
-        ).filter(
-            Score.user_id == user.user_id
-        ).order_by(Score.attempt_datetime.desc()).all()
-
-        print(f"Found {len(scores)} scores for user {user.user_name}")
-
-        result = []
-        for score, quiz, chapter, subject in scores:
-            result.append({
-                'score_id': score.score_id,
-                'quiz_id': score.quiz_id,
-                'quiz_title': quiz.title,
-                'chapter_name': chapter.name,
-                'subject_name': subject.name,
-                'total_questions': score.total_questions,
-                'correct_answers': score.correct_answers,
-                'total_score': score.total_score,
-                'time_taken': score.time_taken,
-                'attempted_on': score.attempt_datetime.isoformat()
-            })
 
-        print("Scores fetched successfully")
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
+        if cursor is not None and limit is None:
+            limit = 20
+        if limit is not None and not 1 <= limit <= MAX_HISTORY_LIMIT:
+            return jsonify({'error': f'limit must be between 1 and {MAX_HISTORY_LIMIT}'}), 400
 
-        return jsonify({'scores': result}), 200
+        try:
+            fields = parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        try:
+            scores, next_cursor = list_user_scores(user.user_id, fields, cursor, limit)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+        return jsonify({'scores': scores, 'next_cursor': next_cursor}), 200
         
     except Exception as e:
         print(f"Error while getting scores {e}")
         return jsonify({'error': str(e)}), 500
 
+@user_bp.route('/leaderboards/global', methods=['GET'], defaults={'kind': 'global', 'board_id': None})
+@user_bp.route('/leaderboards/<any(subject, quiz):kind>/<int:board_id>', methods=['GET'])
+@jwt_required()
+def get_leaderboard(kind, board_id):
+    """Get one page of the global, subject or quiz leaderboard"""
+    try:
+        if not is_leaderboard_enabled():
+            return jsonify({'error': 'Leaderboards are not available'}), 503
+
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        return jsonify(leaderboard_page(kind, board_id, page, per_page)), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@user_bp.route('/leaderboards/global/around-me', methods=['GET'], defaults={'kind': 'global', 'board_id': None})
+@user_bp.route('/leaderboards/<any(subject, quiz):kind>/<int:board_id>/around-me', methods=['GET'])
+@jwt_required()
+def get_leaderboard_around_me(kind, board_id):
+    """Get the current user's rank and the entries around it"""
+    try:
+        if not is_leaderboard_enabled():
+            return jsonify({'error': 'Leaderboards are not available'}), 503
+
+        user = current_identity()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+
+        radius = request.args.get('radius', 5, type=int)
+        return jsonify(leaderboard_around(kind, board_id, user.user_id, radius)), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @user_bp.route('/quiz-summary/<int:quiz_id>', methods=['GET'])
 @jwt_required()
 def get_quiz_summary(quiz_id):
     """Get detailed summary of a quiz attempt"""
     try:
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -530,7 +533,8 @@ def get_quiz_summary(quiz_id):
             'total_questions': score.total_questions,
             'percentage_score': score.total_score,
             'time_taken': score.time_taken,
-            'attempted_on': score.attempt_datetime.isoformat()
+            'attempted_on': score.attempt_datetime.isoformat(),
+            **quiz_standing(quiz_id, score.total_score)
         }), 200
         
     except Exception as e:
@@ -544,8 +548,7 @@ def get_quiz_results(quiz_id):
         print(f"=== QUIZ RESULTS ENDPOINT HIT ===")
         print(f"Quiz ID: {quiz_id}")
         
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -602,7 +605,8 @@ def get_quiz_results(quiz_id):
                 'correct_answers': score.correct_answers,
                 'total_score': score.total_score,
                 'time_taken': score.time_taken,
-                'attempted_on': score.attempt_datetime.isoformat()
+                'attempted_on': score.attempt_datetime.isoformat(),
+                **quiz_standing(quiz_id, score.total_score)
             },
             'questions': question_results
         }
@@ -621,14 +625,13 @@ def get_quiz_results(quiz_id):
 def get_score_summary():
     """Get user's overall score statistics"""
     try:
-        user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=user_name).first()
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        scores = Score.query.filter_by(user_id=user.user_id).all()
+        stats = load_user_stats(user.user_id)
         
-        if not scores:
+        if not stats:
             return jsonify({
                 'total_quizzes_attempted': 0,
                 'total_score': 0,
@@ -637,18 +640,12 @@ def get_score_summary():
                 'total_time_spent': 0
             }), 200
 
-        total_score = sum([s.total_score for s in scores])
-        quiz_count = len(scores)
-        average_score = round(total_score / quiz_count, 2) if quiz_count > 0 else 0
-        best_score = max([s.total_score for s in scores]) if scores else 0
-        total_time_spent = sum([s.time_taken or 0 for s in scores])
-
         return jsonify({
-            'total_quizzes_attempted': quiz_count,
-            'total_score': total_score,
-            'average_score': average_score,
-            'best_score': best_score,
-            'total_time_spent': total_time_spent  # in seconds
+            'total_quizzes_attempted': stats.attempt_count,
+            'total_score': round(stats.score_sum, 2),
+            'average_score': stats.average_score,
+            'best_score': stats.best_score,
+            'total_time_spent': stats.total_time  # in seconds
         }), 200
         
     except Exception as e:
@@ -675,9 +672,7 @@ def debug_schema():
 def trigger_user_csv_export():
     """Trigger CSV export for user"""
     try:
-        current_user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=current_user_name).first()
-        
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
@@ -693,70 +688,36 @@ def trigger_user_csv_export():
         return jsonify({'error': str(e)}), 500
 
 @user_bp.route('/stats', methods=['GET'])
-@user_required
-@cache_decorator(CacheKeys.USER_DASHBOARD, CacheExpiry.MEDIUM)
+@jwt_required()
+@response_cache(CacheKeys.USER_DASHBOARD, CacheExpiry.MEDIUM)
 def get_user_stats():
     """Get user dashboard statistics"""
     try:
-        current_user_name = get_jwt_identity()
-        user = User.query.filter_by(user_name=current_user_name).first()
-        
+        user = current_identity()
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        # Get user's scores
-        scores = Score.query.filter_by(user_id=user.user_id).all()
-        
-        if scores:
-            total_quizzes = len(scores)
-            avg_score = sum(s.total_score for s in scores) / total_quizzes
-            best_score = max(s.total_score for s in scores)
-            total_time = sum(s.time_taken or 0 for s in scores)
-            
-            # Recent activity (last 7 days)
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            recent_scores = [s for s in scores if s.attempt_datetime >= week_ago]
-            recent_quizzes = len(recent_scores)
-            
-            # Subject-wise performance
-            subject_stats = {}
-            for score in scores:
-                quiz = score.quiz
-                chapter = quiz.chapter
-                subject_name = chapter.subject.name
-                
-                if subject_name not in subject_stats:
-                    subject_stats[subject_name] = {
-                        'quizzes_taken': 0,
-                        'total_score': 0,
-                        'best_score': 0
-                    }
-                
-                subject_stats[subject_name]['quizzes_taken'] += 1
-                subject_stats[subject_name]['total_score'] += score.total_score
-                subject_stats[subject_name]['best_score'] = max(
-                    subject_stats[subject_name]['best_score'],
-                    score.total_score
-                )
-            
-            # Calculate averages
-            for subject in subject_stats.values():
-                subject['avg_score'] = round(subject['total_score'] / subject['quizzes_taken'], 2)
-                subject['total_score'] = round(subject['total_score'], 2)
-        else:
-            total_quizzes = 0
-            avg_score = 0
-            best_score = 0
-            total_time = 0
-            recent_quizzes = 0
-            subject_stats = {}
+        # Rolled-up totals plus one row per subject; no Score rows are loaded
+        user_stats = load_user_stats(user.user_id)
+        subject_rows = db.session.query(UserSubjectStats, Subject.name).join(
+            Subject, UserSubjectStats.subject_id == Subject.subject_id
+        ).filter(UserSubjectStats.user_id == user.user_id).all()
+        
+        subject_stats = {
+            subject_name: {
+                'quizzes_taken': subject.attempt_count,
+                'total_score': round(subject.score_sum, 2),
+                'best_score': subject.best_score,
+                'avg_score': subject.average_score
+            } for subject, subject_name in subject_rows
+        }
         
         stats = {
-            'total_quizzes': total_quizzes,
-            'avg_score': round(avg_score, 2),
-            'best_score': best_score,
-            'total_time_minutes': round(total_time / 60, 2),
-            'recent_quizzes': recent_quizzes,
+            'total_quizzes': user_stats.attempt_count if user_stats else 0,
+            'avg_score': user_stats.average_score if user_stats else 0,
+            'best_score': user_stats.best_score if user_stats else 0,
+            'total_time_minutes': round(user_stats.total_time / 60, 2) if user_stats else 0,
+            'recent_quizzes': recent_attempt_count(user_stats),
             'subject_stats': subject_stats
         }
         
@@ -0,0 +1,91 @@
+# backend/score_history.py - Keyset-paginated quiz attempt history for a user
+
+from datetime import datetime
+from sqlalchemy import and_, or_
+from backend.models.models import db, Subject, Chapter, Quiz, Score
+
+MAX_HISTORY_LIMIT = 100
+
+# Response field -> column; Score columns are all in ix_scores_user_history,
+# so a projection without names is answered from the index alone
+HISTORY_FIELDS = {
+    'score_id': Score.score_id,
+    'quiz_id': Score.quiz_id,
+    'quiz_title': Quiz.title,
+    'chapter_name': Chapter.name,
+    'subject_name': Subject.name,
+    'total_questions': Score.total_questions,
+    'correct_answers': Score.correct_answers,
+    'total_score': Score.total_score,
+    'time_taken': Score.time_taken,
+    'attempted_on': Score.attempt_datetime
+}
+
+# Joins needed for a field, outermost last; a projection joins only as deep as it must
+HISTORY_JOINS = [
+    (Quiz, Score.quiz_id == Quiz.quiz_id),
+    (Chapter, Quiz.chapter_id == Chapter.chapter_id),
+    (Subject, Chapter.subject_id == Subject.subject_id)
+]
+JOIN_DEPTH = {'quiz_title': 1, 'chapter_name': 2, 'subject_name': 3}
+
+def encode_cursor(attempt_datetime, score_id):
+    """Encode the position of a score in the (attempt_datetime, score_id) ordering"""
+    return f"{score_id}:{attempt_datetime.isoformat()}"
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    score_id, attempt_datetime = cursor.split(':', 1)
+    return datetime.fromisoformat(attempt_datetime), int(score_id)
+
+def parse_fields(fields):
+    """Field names from a comma-separated list (all fields if empty); ValueError on unknown names"""
+    names = [name.strip() for name in (fields or '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in HISTORY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return names or list(HISTORY_FIELDS)
+
+def list_user_scores(user_id, fields=None, cursor=None, limit=None):
+    """The user's attempts, newest first, with fields (a parse_fields() list, default all)
+
+    Returns (scores, next_cursor).
+    With a limit, pages are keyset-paginated on (attempt_datetime, score_id),
+    so every page costs one index range scan however deep the user scrolls.
+    Without one, the whole history is returned and next_cursor is None.
+    """
+    names = fields or list(HISTORY_FIELDS)
+    # The cursor columns are always read, whether or not they are returned
+    query = db.session.query(
+        Score.attempt_datetime.label('cursor_datetime'), Score.score_id.label('cursor_id'),
+        *[HISTORY_FIELDS[name].label(name) for name in names]
+    )
+    for model, condition in HISTORY_JOINS[:max([JOIN_DEPTH.get(name, 0) for name in names])]:
+        query = query.join(model, condition)
+    query = query.filter(Score.user_id == user_id).order_by(
+        Score.attempt_datetime.desc(), Score.score_id.desc()
+    )
+
+    if cursor:
+        attempt_datetime, score_id = decode_cursor(cursor)
+        # The first condition bounds the index range; the second only breaks ties
+        query = query.filter(
+            Score.attempt_datetime <= attempt_datetime,
+            or_(Score.attempt_datetime < attempt_datetime,
+                and_(Score.attempt_datetime == attempt_datetime, Score.score_id < score_id))
+        )
+
+    # Fetch one extra row to find out whether another page exists
+    rows = query.limit(limit + 1).all() if limit else query.all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].cursor_datetime, rows[-1].cursor_id)
+
+    scores = []
+    for row in rows:
+        score = {name: getattr(row, name) for name in names}
+        if 'attempted_on' in score:
+            score['attempted_on'] = score['attempted_on'].isoformat()
+        scores.append(score)
+    return scores, next_cursor
@@ -0,0 +1,202 @@
+# backend/search.py - Ranked full-text search over users, subjects, quizzes and questions
+
+import re
+from abc import ABC, abstractmethod
+from sqlalchemy import event, inspect, text, select, literal, and_, or_, Integer, Float
+from sqlalchemy.exc import OperationalError
+from backend.models.models import db, User, Subject, Quiz, Question
+
+SEARCH_TABLE = "search_index"
+REBUILD_BATCH_SIZE = 1000
+MAX_QUERY_TERMS = 8
+
+# kind -> (model, title fields, body fields); titles weigh more in the ranking
+SEARCH_FIELDS = {
+    'users': (User, ('full_name',), ('user_name',)),
+    'subjects': (Subject, ('name',), ('description',)),
+    'quizzes': (Quiz, ('title',), ('remarks',)),
+    'questions': (Question, ('question_statement',), ('option1', 'option2', 'option3', 'option4')),
+}
+KIND_CODES = {kind: code for code, kind in enumerate(SEARCH_FIELDS)}
+
+def primary_key(model):
+    return model.__mapper__.primary_key[0]
+
+def document(kind, source):
+    """(title, body) text for a model instance or a row with the same attribute names"""
+    _, title_fields, body_fields = SEARCH_FIELDS[kind]
+    join = lambda fields: ' '.join(str(value) for value in (getattr(source, field) for field in fields) if value)
+    return join(title_fields), join(body_fields)
+
+def query_terms(query):
+    """Words of a user query, lower-cased; punctuation is ignored"""
+    return re.findall(r'\w+', (query or '').lower())[:MAX_QUERY_TERMS]
+
+class SearchBackend(ABC):
+    """Base class: keeps the index in step with the tables and answers matches()
+
+    The index hooks default to no-ops for backends that search the source
+    tables directly; matches() is required.
+    """
+
+    def setup(self, connection):
+        """Create index storage; returns True if it did not exist before"""
+        return False
+
+    def index(self, connection, kind, doc_id, title, body):
+        pass
+
+    def remove(self, connection, kind, doc_id):
+        pass
+
+    def clear(self, connection):
+        pass
+
+    @abstractmethod
+    def matches(self, kind, terms):
+        """Subquery of (doc_id, rank) for rows matching every term; lower rank is better"""
+
+class LikeSearchBackend(SearchBackend):
+    """Fallback for databases without a native index: ILIKE on the source columns
+
+    Unranked and unindexed (results come back in primary key order).
+    """
+
+    def matches(self, kind, terms):
+        model, title_fields, body_fields = SEARCH_FIELDS[kind]
+        columns = [getattr(model, field) for field in title_fields + body_fields]
+        return select(primary_key(model).label('doc_id'), literal(0).label('rank')).where(and_(*[
+            or_(*[column.ilike(f'%{term}%') for column in columns]) for term in terms
+        ])).subquery()
+
+class SQLiteSearchBackend(SearchBackend):
+    """SQLite FTS5 table ranked with bm25; rowid = doc_id * kinds + kind code
+
+    Prefix indexes on 2 and 3 characters keep typeahead lookups cheap.
+    """
+
+    def setup(self, connection):
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': SEARCH_TABLE}
+        ).first()
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "kind UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+        return not exists
+
+    def rowid(self, kind, doc_id):
+        return doc_id * len(KIND_CODES) + KIND_CODES[kind]
+
+    def index(self, connection, kind, doc_id, title, body):
+        rowid = self.rowid(kind, doc_id)
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), {'rowid': rowid})
+        connection.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (rowid, kind, title, body) VALUES (:rowid, :kind, :title, :body)"),
+            {'rowid': rowid, 'kind': kind, 'title': title, 'body': body}
+        )
+
+    def remove(self, connection, kind, doc_id):
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), {'rowid': self.rowid(kind, doc_id)})
+
+    def clear(self, connection):
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+
+    def matches(self, kind, terms):
+        # Every term is a quoted prefix query, so "alg cal" finds "Algebra and Calculus"
+        match = ' '.join('"%s"*' % term for term in terms)
+        return text(
+            f"SELECT rowid / {len(KIND_CODES)} AS doc_id, bm25({SEARCH_TABLE}, 0.0, 10.0, 1.0) AS rank "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match AND kind = :kind"
+        ).bindparams(match=match, kind=kind).columns(doc_id=Integer, rank=Float).subquery()
+
+# Native backends by SQLAlchemy dialect name; anything else uses LikeSearchBackend
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteSearchBackend
+}
+
+backend = None
+
+def init_search(app):
+    """Pick the backend for the app's database and create its index
+
+    A freshly created index is filled from the existing rows; the model
+    hooks below keep it current from then on.
+    """
+    global backend
+    with app.app_context():
+        backend_class = SEARCH_BACKENDS.get(db.engine.dialect.name, LikeSearchBackend)
+        try:
+            with db.engine.begin() as connection:
+                created = backend_class().setup(connection) and backend_class is not LikeSearchBackend
+            backend = backend_class()
+        except OperationalError as e:
+            # e.g. SQLite built without FTS5
+            print(f"⚠️  Search index not available, falling back to LIKE search: {e}")
+            backend, created = LikeSearchBackend(), False
+
+        if created and inspect(db.engine).has_table(User.__tablename__):
+            counts = rebuild_search_index()
+            print(f"✅ Search index built: {counts}")
+
+def reindex(kind, *criteria):
+    """Index every row of kind matching criteria (all rows if none) and commit
+
+    Reads and writes share the session's connection so SQLite never waits on itself.
+    """
+    model, title_fields, body_fields = SEARCH_FIELDS[kind]
+    query = db.session.query(primary_key(model).label('doc_id'), *[
+        getattr(model, field) for field in title_fields + body_fields
+    ]).filter(*criteria).order_by(primary_key(model))
+
+    connection = db.session.connection()
+    count = 0
+    for row in query.yield_per(REBUILD_BATCH_SIZE):
+        backend.index(connection, kind, row.doc_id, *document(kind, row))
+        count += 1
+    db.session.commit()
+    return count
+
+def rebuild_search_index():
+    """Drop every index entry and re-read all searchable rows; returns counts per kind"""
+    backend.clear(db.session.connection())
+    return {kind: reindex(kind) for kind in SEARCH_FIELDS}
+
+def search_query(kind, query):
+    """Model query for rows matching query, best match first (None if no words)
+
+    Chain filters, limit() or paginate() on the result as with Model.query.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    model = SEARCH_FIELDS[kind][0]
+    hits = (backend or LikeSearchBackend()).matches(kind, terms)
+    return model.query.join(hits, hits.c.doc_id == primary_key(model)).order_by(hits.c.rank, primary_key(model))
+
+# ============= INDEX MAINTENANCE HOOKS =============
+
+def register_hooks(kind):
+    model, title_fields, body_fields = SEARCH_FIELDS[kind]
+    fields = title_fields + body_fields
+
+    def on_insert(mapper, connection, target):
+        if backend is not None:
+            backend.index(connection, kind, getattr(target, primary_key(model).key), *document(kind, target))
+
+    def on_update(mapper, connection, target):
+        # Skip flushes that only touched unindexed columns (counts, timestamps)
+        state = inspect(target)
+        if backend is not None and any(state.attrs[field].history.has_changes() for field in fields):
+            backend.index(connection, kind, getattr(target, primary_key(model).key), *document(kind, target))
+
+    def on_delete(mapper, connection, target):
+        if backend is not None:
+            backend.remove(connection, kind, getattr(target, primary_key(model).key))
+
+    event.listen(model, 'after_insert', on_insert)
+    event.listen(model, 'after_update', on_update)
+    event.listen(model, 'after_delete', on_delete)
+
+for search_kind in SEARCH_FIELDS:
+    register_hooks(search_kind)
@@ -0,0 +1,230 @@
+# backend/suggestions.py - In-memory prefix index for search-box typeahead
+
+import re
+import threading
+from bisect import bisect_left, insort
+from heapq import nsmallest
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from backend.models.models import db, User, Subject, Quiz
+from backend import cache
+
+SUGGEST_CHANNEL = "suggest:update"
+SUGGEST_LIMIT = 10
+MAX_SCAN = 2000  # Index keys examined per lookup, so one-letter prefixes stay cheap
+
+# kind -> (model, label field, detail field)
+SUGGEST_FIELDS = {
+    'subjects': (Subject, 'name', None),
+    'quizzes': (Quiz, 'title', None),
+    'users': (User, 'full_name', 'user_name'),
+}
+
+def words(value):
+    return re.findall(r'\w+', (value or '').lower())
+
+class PrefixIndex:
+    """Sorted (token, kind, doc_id) keys with bisect lookups
+
+    Every word of a label (and detail) is a key, so "calc" finds
+    "Algebra and Calculus". Thread-safe; lookups never touch the database.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._docs = {}  # (kind, doc_id) -> (label, detail, tokens, normalized label)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _entry(self, kind, doc_id, label, detail):
+        tokens = tuple(sorted(set(words(label) + words(detail))))
+        return (label, detail, tokens, ' '.join(words(label))), [(token, kind, doc_id) for token in tokens]
+
+    def _remove(self, kind, doc_id):
+        entry = self._docs.pop((kind, doc_id), None)
+        if entry is None:
+            return
+        for token in entry[2]:
+            position = bisect_left(self._keys, (token, kind, doc_id))
+            if position < len(self._keys) and self._keys[position] == (token, kind, doc_id):
+                del self._keys[position]
+
+    def load(self, documents):
+        """Replace the contents with (kind, doc_id, label, detail) tuples in one sort"""
+        docs, keys = {}, []
+        for kind, doc_id, label, detail in documents:
+            docs[(kind, doc_id)], doc_keys = self._entry(kind, doc_id, label, detail)
+            keys.extend(doc_keys)
+        keys.sort()
+        with self._lock:
+            self._docs, self._keys = docs, keys
+
+    def add(self, kind, doc_id, label, detail=None):
+        entry, doc_keys = self._entry(kind, doc_id, label, detail)
+        with self._lock:
+            self._remove(kind, doc_id)
+            self._docs[(kind, doc_id)] = entry
+            for key in doc_keys:
+                insort(self._keys, key)
+
+    def remove(self, kind, doc_id):
+        with self._lock:
+            self._remove(kind, doc_id)
+
+    def suggest(self, query, limit=SUGGEST_LIMIT, kinds=None):
+        """Top matches for query: every word must prefix a word of the label or detail
+
+        Labels starting with the query rank first, then shorter labels.
+        """
+        terms = words(query)
+        if not terms:
+            return []
+        # Scan the range of the longest term; check the others per candidate
+        scan_term = max(terms, key=len)
+        query_text = ' '.join(terms)
+
+        candidates = {}
+        with self._lock:
+            position = bisect_left(self._keys, (scan_term,))
+            end = min(len(self._keys), position + MAX_SCAN)
+            while position < end and self._keys[position][0].startswith(scan_term):
+                _, kind, doc_id = self._keys[position]
+                position += 1
+                if (kinds and kind not in kinds) or (kind, doc_id) in candidates:
+                    continue
+                entry = self._docs[(kind, doc_id)]
+                if all(any(token.startswith(term) for token in entry[2]) for term in terms):
+                    candidates[(kind, doc_id)] = entry
+
+        ranked = nsmallest(limit, candidates.items(), key=lambda item: (
+            not item[1][3].startswith(query_text), len(item[1][0]), item[1][0]
+        ))
+        return [{
+            'type': kind, 'id': doc_id, 'label': label, 'detail': detail
+        } for (kind, doc_id), (label, detail, _, _) in ranked]
+
+suggestion_index = PrefixIndex()
+suggestion_listener = None
+
+def document(kind, source):
+    _, label_field, detail_field = SUGGEST_FIELDS[kind]
+    return getattr(source, label_field), getattr(source, detail_field) if detail_field else None
+
+def load_documents(kind, *criteria):
+    """(kind, doc_id, label, detail) for rows of kind matching criteria"""
+    model, label_field, detail_field = SUGGEST_FIELDS[kind]
+    primary_key = model.__mapper__.primary_key[0]
+    columns = [primary_key.label('doc_id'), getattr(model, label_field)]
+    if detail_field:
+        columns.append(getattr(model, detail_field))
+    for row in db.session.query(*columns).filter(*criteria).yield_per(1000):
+        yield (kind, row.doc_id) + document(kind, row)
+
+def build_suggestions():
+    """Load every subject, quiz and user into the index; returns its size"""
+    suggestion_index.load(
+        doc for kind in SUGGEST_FIELDS for doc in load_documents(kind)
+    )
+    return len(suggestion_index)
+
+def init_suggestions(app):
+    """Build the index from the database and follow other workers' updates"""
+    with app.app_context():
+        if inspect(db.engine).has_table(User.__tablename__):
+            print(f"✅ Suggestion index built: {build_suggestions()} entries")
+    if cache.redis_client is not None:
+        start_suggestion_listener()
+
+# ============= INCREMENTAL UPDATES =============
+
+def apply_update(update):
+    if update.get('remove'):
+        suggestion_index.remove(update['kind'], update['id'])
+    else:
+        suggestion_index.add(update['kind'], update['id'], update['label'], update.get('detail'))
+
+def publish_updates(updates):
+    """Apply index updates here and send them to every other worker"""
+    for update in updates:
+        apply_update(update)
+    if cache.redis_client is None or not updates:
+        return
+    try:
+        cache.redis_client.publish(SUGGEST_CHANNEL, cache.serialize({
+            'origin': cache.process_id(), 'updates': updates
+        }))
+    except Exception as e:
+        print(f"Suggestion update publish error: {e}")
+
+def refresh_suggestions(kind, *criteria):
+    """Re-read rows written outside the ORM (bulk inserts) into every worker's index"""
+    publish_updates([
+        {'kind': kind, 'id': doc_id, 'label': label, 'detail': detail}
+        for kind, doc_id, label, detail in load_documents(kind, *criteria)
+    ])
+
+def start_suggestion_listener():
+    """Subscribe to index updates from other workers on a background thread"""
+    global suggestion_listener
+
+    def on_message(message):
+        data = cache.deserialize(message['data'])
+        if data.get('origin') != cache.process_id():
+            for update in data['updates']:
+                apply_update(update)
+
+    def on_error(error, pubsub, thread):
+        print(f"⚠️  Suggestion update listener stopped: {error}")
+        pubsub.close()
+        thread.stop()
+
+    try:
+        pubsub = cache.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{SUGGEST_CHANNEL: on_message})
+        suggestion_listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True, exception_handler=on_error)
+    except Exception as e:
+        print(f"⚠️  Suggestion update listener not available: {e}")
+
+# Changes are queued per session during flush and published only on commit
+PENDING_KEY = 'suggestion_updates'
+
+def register_hooks(kind):
+    model, label_field, detail_field = SUGGEST_FIELDS[kind]
+    primary_key = model.__mapper__.primary_key[0].key
+    fields = [field for field in (label_field, detail_field) if field]
+
+    def queue(target, update):
+        session = Session.object_session(target)
+        if session is not None:
+            session.info.setdefault(PENDING_KEY, []).append(dict(update, kind=kind, id=getattr(target, primary_key)))
+
+    def on_save(mapper, connection, target):
+        label, detail = document(kind, target)
+        queue(target, {'label': label, 'detail': detail})
+
+    def on_update(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[field].history.has_changes() for field in fields):
+            on_save(mapper, connection, target)
+
+    def on_delete(mapper, connection, target):
+        queue(target, {'remove': True})
+
+    event.listen(model, 'after_insert', on_save)
+    event.listen(model, 'after_update', on_update)
+    event.listen(model, 'after_delete', on_delete)
+
+@event.listens_for(Session, 'after_commit')
+def publish_committed(session):
+    updates = session.info.pop(PENDING_KEY, None)
+    if updates:
+        publish_updates(updates)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
+
+for suggest_kind in SUGGEST_FIELDS:
+    register_hooks(suggest_kind)
@@ -0,0 +1,142 @@
+# backend/user_import.py - Bulk user provisioning from a CSV stream
+
+import csv
+import time
+from datetime import datetime
+from itertools import islice
+from sqlalchemy.exc import IntegrityError
+from backend.models.models import db, User
+from backend.passwords import hash_many
+from backend.cache import invalidate_admin_cache
+from backend.search import reindex
+from backend.suggestions import refresh_suggestions
+
+# 500 names per IN (...) stays under SQLite's 999 bound-parameter limit
+IMPORT_CHUNK_SIZE = 500
+REQUIRED_COLUMNS = ('user_name', 'password', 'full_name')
+FIELD_LENGTHS = {'user_name': 50, 'full_name': 100, 'qualification': 100}
+
+def parse_row(row):
+    """Validate one CSV row; returns (record, error)"""
+    record = {field: (row.get(field) or '').strip() for field in REQUIRED_COLUMNS + ('qualification',)}
+    record['password'] = row.get('password') or ''  # Passwords are taken verbatim
+
+    for field in REQUIRED_COLUMNS:
+        if not record[field]:
+            return None, f'{field} is required'
+    for field, length in FIELD_LENGTHS.items():
+        if len(record[field]) > length:
+            return None, f'{field} is longer than {length} characters'
+
+    record['qualification'] = record['qualification'] or None
+    date_of_birth = (row.get('date_of_birth') or '').strip()
+    try:
+        record['date_of_birth'] = datetime.strptime(date_of_birth, '%Y-%m-%d').date() if date_of_birth else None
+    except ValueError:
+        return None, 'Invalid date_of_birth. Use YYYY-MM-DD'
+    return record, None
+
+def insert_users(rows, lines):
+    """Insert rows in one executemany transaction; returns (created, errors)
+
+    If a concurrent registration claimed a name, the chunk is retried row by
+    row so only the conflicting rows are reported.
+    """
+    try:
+        db.session.execute(User.__table__.insert(), rows)
+        db.session.commit()
+        return len(rows), []
+    except IntegrityError:
+        db.session.rollback()
+
+    created, errors = 0, []
+    for line, row in zip(lines, rows):
+        try:
+            db.session.execute(User.__table__.insert(), [row])
+            db.session.commit()
+            created += 1
+        except IntegrityError:
+            db.session.rollback()
+            errors.append({'line': line, 'user_name': row['user_name'], 'error': 'User already exists'})
+    return created, errors
+
+def import_chunk(chunk, seen, report):
+    """Validate, de-duplicate, hash and insert one chunk of (line, row) pairs"""
+    records = []
+    for line, row in chunk:
+        record, error = parse_row(row)
+        if error:
+            report['failed'] += 1
+            report['errors'].append({'line': line, 'user_name': row.get('user_name'), 'error': error})
+        else:
+            records.append((line, record))
+
+    # One set-based query per chunk for names that are already taken
+    names = {record['user_name'] for _, record in records}
+    existing = {
+        user_name for (user_name,) in db.session.query(User.user_name).filter(User.user_name.in_(names)).all()
+    } if names else set()
+
+    fresh = []
+    for line, record in records:
+        if record['user_name'] in existing or record['user_name'] in seen:
+            report['skipped'] += 1
+            error = 'User already exists' if record['user_name'] in existing else 'Duplicate user_name in file'
+            report['errors'].append({'line': line, 'user_name': record['user_name'], 'error': error})
+        else:
+            seen.add(record['user_name'])
+            fresh.append((line, record))
+    if not fresh:
+        return
+
+    hashes = hash_many([record['password'] for _, record in fresh])
+    now = datetime.utcnow()
+    rows = [{
+        'user_name': record['user_name'],
+        'password_hash': password_hash,
+        'full_name': record['full_name'],
+        'qualification': record['qualification'],
+        'date_of_birth': record['date_of_birth'],
+        'is_admin': False,
+        'created_at': now
+    } for (_, record), password_hash in zip(fresh, hashes)]
+
+    created, errors = insert_users(rows, [line for line, _ in fresh])
+    # Core inserts skip the ORM hooks, so index the new rows explicitly
+    if created:
+        names = [row['user_name'] for row in rows]
+        reindex('users', User.user_name.in_(names))
+        refresh_suggestions('users', User.user_name.in_(names))
+    report['created'] += created
+    report['skipped'] += len(errors)
+    report['errors'].extend(errors)
+
+def import_users(stream, chunk_size=IMPORT_CHUNK_SIZE):
+    """Create users from a CSV text stream, chunk by chunk
+
+    Columns: user_name, password, full_name and optional qualification and
+    date_of_birth (YYYY-MM-DD). Imported users are never admins. Passwords
+    are hashed on the shared pool from backend/passwords.py. Returns a
+    report with a per-row error list keyed by CSV line number.
+    """
+    start = time.perf_counter()
+    reader = csv.DictReader(stream)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+
+    report = {'total': 0, 'created': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+    seen = set()
+    rows = ((reader.line_num, row) for row in reader)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        report['total'] += len(chunk)
+        import_chunk(chunk, seen, report)
+
+    report['errors'].sort(key=lambda error: error['line'])
+    if report['created']:
+        invalidate_admin_cache()
+    report['duration_seconds'] = round(time.perf_counter() - start, 3)
+    return report
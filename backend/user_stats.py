@@ -0,0 +1,159 @@
+# backend/user_stats.py - Per-user score rollups kept in step with the scores table
+
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, delete, case, or_, func
+from sqlalchemy.dialects import sqlite, postgresql
+from backend.models.models import db, Chapter, Quiz, Score, UserStats, UserSubjectStats
+
+RECENT_DAYS = 7
+SCORE_TOLERANCE = 0.01  # Float sums drift in the last digits
+
+# INSERT ... ON CONFLICT DO UPDATE constructs by SQLAlchemy dialect name
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert
+}
+
+ROLLUPS = {
+    UserStats: ('user_id',),
+    UserSubjectStats: ('user_id', 'subject_id'),
+}
+AGGREGATE_FIELDS = ('attempt_count', 'score_sum', 'best_score', 'total_time', 'last_attempt_at')
+
+def fold(totals, key, row):
+    """Add one score row to the running aggregate for key"""
+    aggregate = totals.setdefault(key, {
+        'attempt_count': 0, 'score_sum': 0.0, 'best_score': 0.0, 'total_time': 0, 'last_attempt_at': None
+    })
+    aggregate['attempt_count'] += 1
+    aggregate['score_sum'] += row['total_score']
+    aggregate['best_score'] = max(aggregate['best_score'], row['total_score'])
+    aggregate['total_time'] += row.get('time_taken') or 0
+    if aggregate['last_attempt_at'] is None or row['attempt_datetime'] > aggregate['last_attempt_at']:
+        aggregate['last_attempt_at'] = row['attempt_datetime']
+
+def upsert(model, totals):
+    """Add aggregates to existing rollup rows (or create them) in one statement"""
+    table = model.__table__
+    key_columns = ROLLUPS[model]
+    statement = UPSERT_INSERTS[db.session.get_bind().dialect.name](table)
+    new = statement.excluded
+    statement = statement.on_conflict_do_update(index_elements=key_columns, set_={
+        'attempt_count': table.c.attempt_count + new.attempt_count,
+        'score_sum': table.c.score_sum + new.score_sum,
+        'total_time': table.c.total_time + new.total_time,
+        'best_score': case((new.best_score > table.c.best_score, new.best_score), else_=table.c.best_score),
+        'last_attempt_at': case((or_(
+            table.c.last_attempt_at.is_(None), new.last_attempt_at > table.c.last_attempt_at
+        ), new.last_attempt_at), else_=table.c.last_attempt_at)
+    })
+    db.session.execute(statement, [
+        dict(zip(key_columns, key), **aggregate) for key, aggregate in totals.items()
+    ])
+
+def record_user_stats(rows):
+    """Fold new scores into the rollups inside the caller's transaction
+
+    rows are dicts with user_id, quiz_id, total_score, time_taken and
+    attempt_datetime. Call before the commit that inserts the scores so both
+    land or neither does; the upsert's row lock orders concurrent submits.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    subjects = dict(db.session.query(Quiz.quiz_id, Chapter.subject_id).join(
+        Chapter, Quiz.chapter_id == Chapter.chapter_id
+    ).filter(Quiz.quiz_id.in_({row['quiz_id'] for row in rows})).all())
+
+    totals, subject_totals = {}, {}
+    for row in rows:
+        fold(totals, (row['user_id'],), row)
+        if row['quiz_id'] in subjects:
+            fold(subject_totals, (row['user_id'], subjects[row['quiz_id']]), row)
+    upsert(UserStats, totals)
+    if subject_totals:
+        upsert(UserSubjectStats, subject_totals)
+
+def score_row(score):
+    """record_user_stats() input for a Score instance"""
+    return {
+        'user_id': score.user_id,
+        'quiz_id': score.quiz_id,
+        'total_score': score.total_score,
+        'time_taken': score.time_taken,
+        'attempt_datetime': score.attempt_datetime
+    }
+
+# ============= READS =============
+
+def load_user_stats(user_id):
+    """The user's rollup row, or None before their first attempt"""
+    return db.session.get(UserStats, user_id)
+
+def recent_attempt_count(stats, days=RECENT_DAYS):
+    """Attempts in the last days; skips the query when the user has been idle longer"""
+    since = datetime.utcnow() - timedelta(days=days)
+    if stats is None or stats.last_attempt_at is None or stats.last_attempt_at < since:
+        return 0
+    return Score.query.filter(Score.user_id == stats.user_id, Score.attempt_datetime >= since).count()
+
+# ============= BACKFILL AND CHECKS =============
+
+def aggregate_query(model):
+    """SELECT of the rollup rows for model, computed from the scores table"""
+    columns = [
+        func.count(Score.score_id).label('attempt_count'),
+        func.sum(Score.total_score).label('score_sum'),
+        func.max(Score.total_score).label('best_score'),
+        func.sum(func.coalesce(Score.time_taken, 0)).label('total_time'),
+        func.max(Score.attempt_datetime).label('last_attempt_at')
+    ]
+    if model is UserStats:
+        return select(Score.user_id, *columns).group_by(Score.user_id)
+    return select(Score.user_id, Chapter.subject_id, *columns).join(
+        Quiz, Score.quiz_id == Quiz.quiz_id
+    ).join(Chapter, Quiz.chapter_id == Chapter.chapter_id).group_by(Score.user_id, Chapter.subject_id)
+
+def rebuild_user_stats(connection=None):
+    """Recompute both rollup tables from the scores table in one transaction
+
+    For first deploys (migration 5), restores and anything that wrote scores
+    around record_user_stats(). With a connection the rebuild joins the
+    caller's transaction and is not committed here. Returns the row count
+    of each table.
+    """
+    executor = connection if connection is not None else db.session
+    counts = {}
+    for model, key_columns in ROLLUPS.items():
+        executor.execute(delete(model))
+        executor.execute(insert(model).from_select(key_columns + AGGREGATE_FIELDS, aggregate_query(model)))
+        counts[model.__tablename__] = executor.execute(select(func.count()).select_from(model)).scalar()
+    if connection is None:
+        db.session.commit()
+    return counts
+
+def check_user_stats():
+    """Compare the rollups with the scores table without writing
+
+    Returns a list of differences: rows missing from or extra in a rollup
+    table and fields that disagree.
+    """
+    differences = []
+    for model, key_columns in ROLLUPS.items():
+        expected = {tuple(row[:len(key_columns)]): row._mapping for row in db.session.execute(aggregate_query(model))}
+        actual = {
+            tuple(getattr(stats, column) for column in key_columns): stats for stats in db.session.query(model).all()
+        }
+        for key in sorted(expected.keys() | actual.keys()):
+            base = {'table': model.__tablename__, 'key': dict(zip(key_columns, key))}
+            if key not in actual:
+                differences.append(dict(base, problem='missing'))
+            elif key not in expected:
+                differences.append(dict(base, problem='unexpected'))
+            else:
+                for field in AGGREGATE_FIELDS:
+                    want, have = expected[key][field], getattr(actual[key], field)
+                    same = abs(want - have) <= SCORE_TOLERANCE if isinstance(want, float) else want == have
+                    if not same:
+                        differences.append(dict(base, problem='mismatch', field=field, expected=want, actual=have))
+    return differences
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Backfill the user_stats and user_subject_stats rollups from the scores table
+
+Upgrades get the rollups from migration 5 (python migrate.py); run this
+to verify them with --check, or to rebuild them when it reports drift.
+Usage: python backfill_user_stats.py [--check]
+"""
+
+import argparse
+import sys
+import time
+from app import create_app
+from backend.models.models import db
+from backend.user_stats import rebuild_user_stats, check_user_stats
+
+MAX_DIFFERENCES_SHOWN = 50
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill or verify the per-user score rollups')
+    parser.add_argument('--check', action='store_true',
+                        help='compare the rollups with the scores table without writing; exits 1 on drift')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()  # Creates the rollup tables on databases that predate them
+        start = time.perf_counter()
+
+        if args.check:
+            print("🔍 Checking user stats against the scores table...")
+            differences = check_user_stats()
+            for difference in differences[:MAX_DIFFERENCES_SHOWN]:
+                detail = f" {difference['field']}: expected {difference['expected']}, found {difference['actual']}" \
+                    if difference['problem'] == 'mismatch' else ''
+                print(f"❌ {difference['table']} {difference['key']} {difference['problem']}{detail}")
+            if len(differences) > MAX_DIFFERENCES_SHOWN:
+                print(f"   ... and {len(differences) - MAX_DIFFERENCES_SHOWN} more")
+            if differences:
+                print(f"⚠️  {len(differences)} differences; run without --check to rebuild")
+                sys.exit(1)
+            print(f"✅ User stats match the scores table ({time.perf_counter() - start:.2f}s)")
+            return
+
+        print("📊 Rebuilding user stats from the scores table...")
+        counts = rebuild_user_stats()
+        for table, count in counts.items():
+            print(f"   - {table}: {count} rows")
+        print(f"✅ Backfilled in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
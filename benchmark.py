@@ -0,0 +1,762 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for Quiz Master
+Each benchmark seeds a throwaway SQLite database and reports query counts and latency.
+
+Usage: python benchmark.py <name> [<name> ...]
+       python benchmark.py all
+"""
+
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.models.models import db, User, Subject, Chapter, Quiz, Question, Score
+from testing import make_app, seed, QueryCounter
+
+# ============= HARNESS =============
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0
+    index = max(0, int(round(pct / 100.0 * len(ordered))) - 1)
+    return ordered[index]
+
+def measure(func, iterations):
+    """Run func repeatedly and return (queries per call, p50 ms, p95 ms)"""
+    latencies = []
+    with QueryCounter(db.engine) as counter:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            latencies.append((time.perf_counter() - start) * 1000)
+            db.session.remove()
+    return counter.count / iterations, percentile(latencies, 50), percentile(latencies, 95)
+
+def report(label, queries, p50, p95):
+    print(f"   {label:<28} {queries:>8.1f} queries   p50 {p50:>8.2f} ms   p95 {p95:>8.2f} ms")
+
+# ============= BENCHMARKS =============
+
+def legacy_dashboard_subjects():
+    """Per-subject COUNT loop used by user_dashboard before the aggregate layer"""
+    subject_list = []
+    for subj in Subject.query.filter_by(is_active=True).all():
+        chapter_count = Chapter.query.filter_by(subject_id=subj.subject_id).count()
+        available_quizzes = db.session.query(Quiz).join(Chapter).filter(
+            Chapter.subject_id == subj.subject_id,
+            Quiz.is_active == True,
+            Quiz.date_of_quiz <= datetime.utcnow()
+        ).count()
+        subject_list.append({
+            'id': subj.subject_id,
+            'name': subj.name,
+            'description': subj.description,
+            'chapter_count': chapter_count,
+            'available_quizzes': available_quizzes
+        })
+    return subject_list
+
+def bench_dashboard():
+    """User dashboard: per-subject COUNT loop vs single grouped query vs cached summary"""
+    from backend import cache
+    from backend.dashboard import compute_subject_summaries, get_subject_summaries
+
+    print(f"   seeded: {seed(subjects=1000, chapters_per_subject=3, quizzes_per_chapter=2)}")
+
+    legacy = legacy_dashboard_subjects()
+    aggregated, _ = compute_subject_summaries()
+    assert legacy == aggregated, "aggregate results differ from per-subject loop"
+
+    report('per-subject loop', *measure(legacy_dashboard_subjects, 5))
+    report('grouped query', *measure(compute_subject_summaries, 20))
+
+    if cache.redis_client:
+        cache.invalidate_subject_cache()
+        get_subject_summaries()
+        report('cached summary', *measure(get_subject_summaries, 200))
+    else:
+        print("   cached summary: skipped (Redis not available)")
+
+def legacy_subject_quizzes(subject_id, user_id):
+    """Per-quiz Score and Question lookups used by get_quizzes_by_subject before batching"""
+    quiz_list = []
+    for chapter in Chapter.query.filter_by(subject_id=subject_id).all():
+        for quiz in chapter.quizzes:
+            user_score = Score.query.filter_by(user_id=user_id, quiz_id=quiz.quiz_id).first()
+            question_count = Question.query.filter_by(quiz_id=quiz.quiz_id).count()
+            quiz_list.append({
+                'quiz_id': quiz.quiz_id,
+                'title': quiz.title,
+                'chapter_name': chapter.name,
+                'chapter_id': chapter.chapter_id,
+                'date_of_quiz': quiz.date_of_quiz.isoformat() if quiz.date_of_quiz else None,
+                'time_duration': quiz.time_duration,
+                'remarks': quiz.remarks,
+                'question_count': question_count,
+                'is_active': quiz.is_active,
+                'is_anytime_quiz': quiz.is_anytime_quiz,
+                'attempted': user_score is not None,
+                'user_score': user_score.total_score if user_score else None,
+                'attempt_date': user_score.attempt_datetime.isoformat() if user_score else None
+            })
+    return quiz_list
+
+def bench_subject_quizzes():
+    """Subject quiz listing: per-quiz lookups vs batched loader vs keyset page"""
+    from backend.quiz_listing import list_subject_quizzes, list_subject_quizzes_after
+
+    print(f"   seeded: {seed(subjects=1, chapters_per_subject=100, quizzes_per_chapter=3, questions_per_quiz=10, users=1, scores_per_user=150)}")
+
+    legacy = legacy_subject_quizzes(1, 1)
+    batched = list_subject_quizzes(1, 1)
+    assert legacy == batched, "batched listing differs from per-quiz loop"
+
+    report('per-quiz loop', *measure(lambda: legacy_subject_quizzes(1, 1), 5))
+    report('batched loader', *measure(lambda: list_subject_quizzes(1, 1), 20))
+    report('keyset page (50)', *measure(lambda: list_subject_quizzes_after(1, 1, '50:150', 50), 50))
+
+def legacy_quiz_to_dict(quiz):
+    """Quiz serialization before the question_count column and single-`now` serializer"""
+    return {
+        'id': quiz.quiz_id,
+        'quiz_id': quiz.quiz_id,
+        'title': quiz.title,
+        'chapter_id': quiz.chapter_id,
+        'date_of_quiz': quiz.date_of_quiz.isoformat() if quiz.date_of_quiz else None,
+        'end_date_time': quiz.end_date_time.isoformat() if quiz.end_date_time else None,
+        'effective_end_time': quiz.get_effective_end_time().isoformat() if quiz.get_effective_end_time() else None,
+        'time_duration': quiz.time_duration,
+        'is_anytime_quiz': quiz.is_anytime_quiz,
+        'is_active': quiz.is_active,
+        'auto_expire': quiz.auto_expire,
+        'grace_period': quiz.grace_period,
+        'allow_multiple_attempts': quiz.allow_multiple_attempts,
+        'show_results_immediately': quiz.show_results_immediately,
+        'remarks': quiz.remarks,
+        'created_at': quiz.created_at.isoformat() if quiz.created_at else None,
+        'updated_at': quiz.updated_at.isoformat() if quiz.updated_at else None,
+        'question_count': len(quiz.questions) if quiz.questions else 0,
+        'status': quiz.get_status(),
+        'time_remaining': quiz.get_time_remaining(),
+        'is_expired': quiz.is_expired(),
+        'is_available': quiz.is_available_for_attempt()[0]
+    }
+
+def bench_quiz_serialization():
+    """Quiz.to_dict over 10k quizzes: lazy-loaded question counts vs denormalized counter"""
+    print(f"   seeded: {seed(subjects=100, chapters_per_subject=10, quizzes_per_chapter=10, questions_per_quiz=5)}")
+
+    def legacy():
+        return [legacy_quiz_to_dict(quiz) for quiz in Quiz.query.all()]
+
+    def current():
+        now = datetime.utcnow()
+        return [quiz.to_dict(now) for quiz in Quiz.query.all()]
+
+    legacy_counts = [item['question_count'] for item in legacy()]
+    current_counts = [item['question_count'] for item in current()]
+    assert legacy_counts == current_counts, "question_count differs from len(questions)"
+
+    report('lazy-load to_dict', *measure(legacy, 1))
+    report('denormalized to_dict', *measure(current, 3))
+
+def legacy_status_poll(quiz_id, user_name):
+    """check_quiz_status before expiry moved off the read path (locks and commits inline)"""
+    user = User.query.filter_by(user_name=user_name).first()
+    quiz = db.session.get(Quiz, quiz_id)
+    if quiz.auto_lock_if_expired():
+        db.session.commit()
+    is_available, _ = quiz.is_available_for_attempt(user.user_id)
+    return is_available, quiz.get_status()
+
+def status_poll(quiz_id, user_name):
+    """check_quiz_status with read-only expiry"""
+    user = User.query.filter_by(user_name=user_name).first()
+    quiz = db.session.get(Quiz, quiz_id)
+    now = datetime.utcnow()
+    is_available, _ = quiz.is_available_for_attempt(user.user_id, now)
+    return is_available, quiz.get_status(now)
+
+def run_pollers(poll, pollers, quiz_ids, duration):
+    """Run concurrent pollers for `duration` seconds; return (polls, errors, latencies)"""
+    import random
+    import threading
+    from flask import current_app
+
+    app = current_app._get_current_object()
+    lock = threading.Lock()
+    results = {'polls': 0, 'errors': 0, 'latencies': []}
+    deadline = time.perf_counter() + duration
+
+    def worker(n):
+        rng = random.Random(n)
+        polls, errors, latencies = 0, 0, []
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    poll(rng.choice(quiz_ids), f'student{n % 10 + 1}@example.com')
+                    polls += 1
+                except Exception:
+                    errors += 1
+                    db.session.rollback()
+                latencies.append((time.perf_counter() - start) * 1000)
+                db.session.remove()
+        with lock:
+            results['polls'] += polls
+            results['errors'] += errors
+            results['latencies'].extend(latencies)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(pollers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results['polls'], results['errors'], results['latencies']
+
+def bench_status_polling():
+    """100 concurrent quiz-status pollers across quiz end times: inline auto-lock vs read-only expiry"""
+    pollers, duration = 100, 5.0
+    print(f"   seeded: {seed(subjects=1, chapters_per_subject=10, quizzes_per_chapter=10, users=10)}")
+    quiz_ids = [quiz_id for (quiz_id,) in db.session.query(Quiz.quiz_id).all()]
+
+    for label, poll in [('inline auto-lock', legacy_status_poll), ('read-only expiry', status_poll)]:
+        # Every quiz ends somewhere inside the polling window
+        now = datetime.utcnow()
+        for index, quiz in enumerate(Quiz.query.all()):
+            quiz.is_active = True
+            quiz.is_anytime_quiz = False
+            quiz.date_of_quiz = now - timedelta(hours=1)
+            quiz.end_date_time = now + timedelta(seconds=0.5 + (duration - 1) * index / len(quiz_ids))
+        db.session.commit()
+        db.session.remove()
+
+        polls, errors, latencies = run_pollers(poll, pollers, quiz_ids, duration)
+        print(f"   {label:<28} {polls / duration:>8.0f} polls/s   p95 {percentile(latencies, 95):>8.2f} ms   errors {errors}")
+
+def bench_batch_grading():
+    """5,000 submissions for one quiz: per-request submit_quiz vs batch grading"""
+    import random
+    from flask import current_app
+    from flask_jwt_extended import create_access_token
+    from backend.grading import grade_and_save_batch, np
+
+    submission_count, question_count = 5000, 20
+    print(f"   seeded: {seed(subjects=1, chapters_per_subject=1, quizzes_per_chapter=1, questions_per_quiz=question_count, users=submission_count)}")
+    print(f"   numpy: {'available' if np is not None else 'not installed (pure-Python fallback)'}")
+
+    rng = random.Random(42)
+    submissions = [{
+        'user_id': user_id,
+        'answers': {str(question_id): rng.randrange(4) for question_id in range(1, question_count + 1)},
+        'time_taken': 600
+    } for user_id in range(1, submission_count + 1)]
+
+    client = current_app.test_client()
+    tokens = [create_access_token(identity=f'student{s["user_id"]}@example.com') for s in submissions]
+
+    start = time.perf_counter()
+    with QueryCounter(db.engine) as counter:
+        for submission, token in zip(submissions, tokens):
+            client.post('/api/user/quiz/1/submit', json=submission, headers={'Authorization': f'Bearer {token}'})
+    elapsed = time.perf_counter() - start
+    per_request_scores = {score.user_id: score.correct_answers for score in Score.query.all()}
+    print(f"   {'per-request submit':<28} {counter.count:>8} queries   {elapsed:>8.2f} s   {submission_count / elapsed:>8.0f} submissions/s")
+
+    Score.query.delete()
+    db.session.commit()
+
+    quiz = db.session.get(Quiz, 1)
+    start = time.perf_counter()
+    with QueryCounter(db.engine) as counter:
+        report = grade_and_save_batch(quiz, submissions)
+    elapsed = time.perf_counter() - start
+    print(f"   {'batch grading':<28} {counter.count:>8} queries   {elapsed:>8.2f} s   {submission_count / elapsed:>8.0f} submissions/s")
+
+    batch_scores = {score.user_id: score.correct_answers for score in Score.query.all()}
+    assert report['graded'] == submission_count and batch_scores == per_request_scores, "batch grades differ"
+
+def bench_submit_spike():
+    """2,000 simultaneous submits at quiz close: synchronous commits vs queued ingestion"""
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from flask import current_app
+    from flask_jwt_extended import create_access_token
+    from backend import ingestion
+
+    submission_count, concurrency = 2000, 200
+    print(f"   seeded: {seed(subjects=1, chapters_per_subject=1, quizzes_per_chapter=1, questions_per_quiz=20, users=submission_count)}")
+
+    app = current_app._get_current_object()
+    rng = random.Random(7)
+    requests_data = [(
+        create_access_token(identity=f'student{user_id}@example.com'),
+        {'answers': {str(q): rng.randrange(4) for q in range(1, 21)}, 'time_taken': 600}
+    ) for user_id in range(1, submission_count + 1)]
+
+    def submit(item):
+        token, body = item
+        start = time.perf_counter()
+        response = app.test_client().post(
+            '/api/user/quiz/1/submit', json=body, headers={'Authorization': f'Bearer {token}'}
+        )
+        return response.status_code, (time.perf_counter() - start) * 1000
+
+    modes = ['sync']
+    app.config['SUBMISSION_INGESTION_MODE'] = 'queue'
+    ingestion.init_ingestion(app)
+    if ingestion.is_queue_enabled():
+        modes.append('queue')
+        ingestion.queue_client.delete(ingestion.SUBMISSION_STREAM)
+        ingestion.ensure_consumer_group()
+    else:
+        print("   queue mode: skipped (Redis not available)")
+
+    for mode in modes:
+        Score.query.delete()
+        db.session.commit()
+        ingestion.ingestion_mode = mode
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(submit, requests_data))
+        elapsed = time.perf_counter() - start
+
+        accepted = sum(1 for status, _ in results if status in (200, 202))
+        failed = len(results) - accepted
+        latencies = [latency for _, latency in results]
+        print(f"   {mode + ' ingestion':<28} {accepted:>6} accepted   {failed:>5} failed   "
+              f"p95 {percentile(latencies, 95):>8.2f} ms   {elapsed:>6.2f} s")
+
+        if mode == 'queue':
+            start = time.perf_counter()
+            totals = ingestion.drain_submission_stream(max_batches=100)
+            print(f"   {'queue drain':<28} {totals['saved']:>6} saved      {totals['rejected']:>5} rejected "
+                  f"{totals['batches']:>5} batches   {time.perf_counter() - start:>6.2f} s")
+
+    ingestion.ingestion_mode = 'sync'
+
+def bench_login_storm():
+    """300 logins from 64 clients: inline hashing vs the bounded process pool"""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from flask import current_app
+    from flask_jwt_extended import create_access_token
+    from backend import passwords
+
+    login_count, concurrency = 300, 64
+    cores = os.cpu_count() or 1
+    print(f"   seeded: {seed(subjects=5, chapters_per_subject=2, quizzes_per_chapter=2, users=login_count)}")
+
+    app = current_app._get_current_object()
+    # Every seeded user shares one real hash at the configured cost
+    app.config['PASSWORD_HASH_WORKERS'] = 0
+    passwords.init_passwords(app)
+    db.session.execute(User.__table__.update().values(password_hash=passwords.hash_password('benchmark-pass')))
+    db.session.commit()
+    reader_headers = {'Authorization': 'Bearer ' + create_access_token(
+        identity='student1@example.com', additional_claims={'user_id': 1, 'is_admin': False}
+    )}
+
+    def login(user_id):
+        start = time.perf_counter()
+        response = app.test_client().post('/api/auth/login', json={
+            'user_name': f'student{user_id}@example.com', 'password': 'benchmark-pass'
+        })
+        return response.status_code, (time.perf_counter() - start) * 1000
+
+    def read_until(stop, latencies):
+        # Unrelated traffic that should keep flowing during the storm
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/api/user/dashboard', headers=reader_headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    print(f"   {cores} core(s)")
+    modes = [('inline', 0, 0), ('process pool', cores, cores * 16), ('pool, queue limit 2/core', cores, cores * 2)]
+    for label, workers, queue_limit in modes:
+        app.config['PASSWORD_HASH_WORKERS'] = workers
+        app.config['PASSWORD_HASH_QUEUE_LIMIT'] = queue_limit
+        passwords.init_passwords(app)
+        if workers:
+            passwords.hash_password('warm-up')  # Start the pool outside the timing
+
+        stop, read_latencies = threading.Event(), []
+        reader = threading.Thread(target=read_until, args=(stop, read_latencies))
+        reader.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(login, range(1, login_count + 1)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        reader.join()
+
+        ok = sum(1 for status, _ in results if status == 200)
+        busy = sum(1 for status, _ in results if status == 503)
+        login_p95 = percentile([latency for status, latency in results if status == 200], 95)
+        print(f"   {label:<28} {ok / elapsed:>7.1f} logins/s   {ok / elapsed / max(workers, 1):>6.1f} /core   "
+              f"{busy:>4} busy (503)   login p95 {login_p95:>8.2f} ms   reads p95 {percentile(read_latencies, 95):>8.2f} ms")
+
+    passwords.shutdown_pool()
+
+def bench_typeahead():
+    """Search-box keystrokes: LIKE scans vs the FTS5 index vs the in-memory prefix index"""
+    from sqlalchemy import or_
+    from backend.search import rebuild_search_index, search_query
+    from backend.suggestions import build_suggestions, suggestion_index
+
+    print(f"   seeded: {seed(subjects=500, chapters_per_subject=4, quizzes_per_chapter=5, users=20000)}")
+    rebuild_search_index()
+    build_suggestions()
+    keystrokes = ['s', 'st', 'stu', 'stud', 'student1', 'student12', 'quiz 1', 'subj', 'subject 4']
+
+    def like_scans():
+        for query in keystrokes:
+            User.query.filter(or_(User.user_name.ilike(f'%{query}%'), User.full_name.ilike(f'%{query}%'))).limit(10).all()
+            Subject.query.filter(Subject.name.ilike(f'%{query}%')).limit(10).all()
+            Quiz.query.filter(Quiz.title.ilike(f'%{query}%')).limit(10).all()
+
+    def fts_queries():
+        for query in keystrokes:
+            for kind in ('users', 'subjects', 'quizzes'):
+                search_query(kind, query).limit(10).all()
+
+    def prefix_index():
+        for query in keystrokes:
+            suggestion_index.suggest(query, 10)
+
+    for label, func, iterations in [('LIKE scans', like_scans, 5), ('FTS5 index', fts_queries, 20),
+                                    ('prefix index', prefix_index, 2000)]:
+        queries, p50, p95 = measure(func, iterations)
+        print(f"   {label:<28} {queries / len(keystrokes):>8.1f} queries   "
+              f"{p50 * 1000 / len(keystrokes):>10.1f} us/keystroke p50   {p95 * 1000 / len(keystrokes):>10.1f} us p95")
+
+def run_mixed_workload(app, workers, duration, submit_ratio):
+    """Concurrent clients mixing quiz listings, dashboards and submits
+
+    Returns {'reads', 'submits', 'errors', 'locked', 'latencies'}.
+    """
+    import random
+    import threading
+    from itertools import count
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        users = [user_name for (user_name,) in db.session.query(User.user_name).all()]
+        subject_ids = [subject_id for (subject_id,) in db.session.query(Subject.subject_id).all()]
+        # Upcoming quizzes reject submits, so only target open and anytime ones
+        quiz_ids = [quiz.quiz_id for quiz in Quiz.query.all() if quiz.is_open()]
+        tokens = {user_name: create_access_token(identity=user_name) for user_name in users}
+        question_ids = {
+            quiz_id: [str(question_id) for (question_id,) in db.session.query(Question.question_id).filter_by(quiz_id=quiz_id)]
+            for quiz_id in quiz_ids
+        }
+        db.session.remove()
+
+    # Every submit takes a fresh (user, quiz) pair so none hit the duplicate check
+    pairs = [(user_name, quiz_id) for quiz_id in quiz_ids for user_name in users]
+    random.Random(11).shuffle(pairs)
+    next_pair = count()
+
+    lock = threading.Lock()
+    results = {'reads': 0, 'submits': 0, 'errors': 0, 'locked': 0, 'latencies': []}
+    deadline = time.perf_counter() + duration
+
+    def worker(n):
+        rng = random.Random(n)
+        client = app.test_client()
+        reads = submits = errors = locked = 0
+        latencies = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if rng.random() < submit_ratio:
+                user_name, quiz_id = pairs[next(next_pair) % len(pairs)]
+                body = {'answers': {q: rng.randrange(4) for q in question_ids[quiz_id]}, 'time_taken': 300}
+                response = client.post(f'/api/user/quiz/{quiz_id}/submit', json=body,
+                                       headers={'Authorization': f'Bearer {tokens[user_name]}'})
+                ok = response.status_code == 200
+                submits += ok
+            else:
+                user_name = rng.choice(users)
+                path = '/api/user/dashboard' if rng.random() < 0.25 else f'/api/user/subjects/{rng.choice(subject_ids)}/quizzes'
+                response = client.get(path, headers={'Authorization': f'Bearer {tokens[user_name]}'})
+                ok = response.status_code == 200
+                reads += ok
+            if not ok:
+                errors += 1
+                locked += 'database is locked' in response.get_data(as_text=True)
+            latencies.append((time.perf_counter() - start) * 1000)
+        with lock:
+            results['reads'] += reads
+            results['submits'] += submits
+            results['errors'] += errors
+            results['locked'] += locked
+            results['latencies'].extend(latencies)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def bench_leaderboard():
+    """Top users, one student's rank and a quiz percentile: SQL over scores vs Redis boards"""
+    from sqlalchemy import func
+    from backend import leaderboards
+
+    print(f"   seeded: {seed(subjects=10, chapters_per_subject=5, quizzes_per_chapter=10, users=5000, scores_per_user=20)}")
+    averages = db.session.query(
+        Score.user_id, func.avg(Score.total_score).label('avg_score')
+    ).group_by(Score.user_id).subquery()
+
+    def sql_top_users():
+        db.session.query(User.user_name, User.full_name, averages.c.avg_score).join(
+            averages, User.user_id == averages.c.user_id
+        ).order_by(averages.c.avg_score.desc()).limit(5).all()
+
+    def sql_rank():
+        mine = db.session.query(averages.c.avg_score).filter(averages.c.user_id == 2500).scalar()
+        db.session.query(func.count()).select_from(averages).filter(averages.c.avg_score > mine).scalar()
+
+    def sql_sorted_percentile():
+        scores = [score for (score,) in db.session.query(Score.total_score).filter(
+            Score.quiz_id == 1
+        ).order_by(Score.total_score).all()]
+        sum(1 for score in scores if score < 50.0) / len(scores), scores[len(scores) // 2]
+
+    def sql_histogram_percentile():
+        leaderboards.score_standing(dict(db.session.query(Score.total_score, func.count(Score.score_id)).filter(
+            Score.quiz_id == 1
+        ).group_by(Score.total_score).all()), 50.0)
+
+    report('SQL top 5', *measure(sql_top_users, 20))
+    report('SQL rank of one user', *measure(sql_rank, 20))
+    report('percentile, sorted rows', *measure(sql_sorted_percentile, 20))
+    report('percentile, GROUP BY', *measure(sql_histogram_percentile, 20))
+
+    if not leaderboards.is_leaderboard_enabled():
+        print("   sorted sets: skipped (Redis not available)")
+        return
+
+    start = time.perf_counter()
+    counts = leaderboards.rebuild_leaderboards()
+    print(f"   rebuild {counts} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    report('leaderboard top 5', *measure(lambda: leaderboards.leaderboard_page('global', per_page=5), 200))
+    report('leaderboard around user', *measure(lambda: leaderboards.leaderboard_around('global', None, 2500), 200))
+    report('percentile, Redis hash', *measure(lambda: leaderboards.quiz_standing(1, 50.0), 200))
+
+def legacy_user_stats(user_id):
+    """get_user_stats before the rollup tables: every Score row plus lazy-loaded subjects"""
+    scores = Score.query.filter_by(user_id=user_id).all()
+    subject_stats = {}
+    for score in scores:
+        name = score.quiz.chapter.subject.name
+        subject = subject_stats.setdefault(name, {'quizzes_taken': 0, 'total_score': 0, 'best_score': 0})
+        subject['quizzes_taken'] += 1
+        subject['total_score'] += score.total_score
+        subject['best_score'] = max(subject['best_score'], score.total_score)
+    return len(scores), sum(s.total_score for s in scores), subject_stats
+
+def bench_user_stats():
+    """Profile/stats endpoints: summing every Score row vs reading the rollup rows"""
+    from backend.models.models import UserSubjectStats
+    from backend.user_stats import load_user_stats
+
+    print(f"   seeded: {seed(subjects=10, chapters_per_subject=5, quizzes_per_chapter=10, users=200, scores_per_user=200)}")
+
+    def rollup_user_stats():
+        load_user_stats(100)
+        db.session.query(UserSubjectStats, Subject.name).join(
+            Subject, UserSubjectStats.subject_id == Subject.subject_id
+        ).filter(UserSubjectStats.user_id == 100).all()
+
+    report('legacy (200 scores)', *measure(lambda: legacy_user_stats(100), 20))
+    report('rollup rows', *measure(rollup_user_stats, 20))
+
+def legacy_user_scores(user_id):
+    """get_user_scores before keyset pagination: the whole history, every column, four tables"""
+    scores = db.session.query(Score, Quiz, Chapter, Subject).join(
+        Quiz, Score.quiz_id == Quiz.quiz_id
+    ).join(Chapter, Quiz.chapter_id == Chapter.chapter_id).join(
+        Subject, Chapter.subject_id == Subject.subject_id
+    ).filter(Score.user_id == user_id).order_by(Score.attempt_datetime.desc()).all()
+    return [{'score_id': score.score_id, 'quiz_title': quiz.title, 'total_score': score.total_score,
+             'attempted_on': score.attempt_datetime.isoformat()} for score, quiz, chapter, subject in scores]
+
+def bench_score_history():
+    """Score history: the full legacy join vs keyset pages on the covering index"""
+    from backend.score_history import list_user_scores, encode_cursor
+
+    print(f"   seeded: {seed(subjects=4, chapters_per_subject=50, quizzes_per_chapter=10, users=20, scores_per_user=2000)}")
+    db.session.execute(text('ANALYZE'))
+
+    fields = ['score_id', 'quiz_id', 'total_score', 'attempted_on']
+    deep = db.session.query(Score.attempt_datetime, Score.score_id).filter(Score.user_id == 10).order_by(
+        Score.attempt_datetime.desc(), Score.score_id.desc()
+    ).offset(1900).first()
+    deep_cursor = encode_cursor(*deep)
+
+    report('legacy (2000 scores)', *measure(lambda: legacy_user_scores(10), 20))
+    report('first page of 20', *measure(lambda: list_user_scores(10, fields, None, 20), 200))
+    report('page 96 of 20 (keyset)', *measure(lambda: list_user_scores(10, fields, deep_cursor, 20), 200))
+    report('page with quiz titles', *measure(lambda: list_user_scores(10, fields + ['quiz_title'], deep_cursor, 20), 200))
+
+def bench_index_pack():
+    """Hot lookups with and without the secondary indexes declared in models.py"""
+    from backend.answer_keys import build_answer_key
+    from backend.quiz_listing import subject_quiz_query
+    from backend.leaderboards import quiz_distribution
+
+    print(f"   seeded: {seed(subjects=50, chapters_per_subject=20, quizzes_per_chapter=10, questions_per_quiz=10, users=1000, scores_per_user=50)}")
+    now = datetime.utcnow()
+    expiry_candidates = lambda: db.session.query(Quiz.quiz_id).filter(
+        Quiz.is_active == True, Quiz.auto_expire == True,
+        Quiz.end_date_time.isnot(None), Quiz.end_date_time <= now
+    ).all()
+    lookups = [
+        ('answer key', lambda: build_answer_key(5000, 'benchmark')),
+        ('subject listing', lambda: subject_quiz_query(25).all()),
+        ('expiry candidates', expiry_candidates),
+        ('score distribution', lambda: quiz_distribution(5000)),
+    ]
+
+    for label, lookup in lookups:
+        report(f'{label}, indexed', *measure(lookup, 50))
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text(f"DROP INDEX {index.name}"))
+    db.engine.dispose()  # Pooled connections cache prepared statements and their plans
+    for label, lookup in lookups:
+        report(f'{label}, no index', *measure(lookup, 50))
+
+def bench_engine_profiles():
+    """Mixed read/submit workload (80/20, 32 clients) against each database engine profile"""
+    from backend.config import PROFILES
+
+    workers, duration, submit_ratio = 32, 5.0, 0.2
+    # The postgres profile runs only when DATABASE_URL points at a throwaway database
+    database_url = os.environ.get('DATABASE_URL')
+    profiles = [name for name in PROFILES if name != 'postgres' or database_url]
+    if 'postgres' not in profiles:
+        print("   postgres: skipped (set DATABASE_URL to a throwaway PostgreSQL database)")
+
+    for profile in profiles:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = make_app(os.path.join(tmp, 'profile.db'), profile,
+                           database_url if profile == 'postgres' else None)
+            with app.app_context():
+                db.create_all()
+                seed(subjects=20, chapters_per_subject=3, quizzes_per_chapter=2,
+                     questions_per_quiz=10, users=500)
+                db.session.remove()
+
+            results = run_mixed_workload(app, workers, duration, submit_ratio)
+
+            with app.app_context():
+                if profile == 'postgres':
+                    db.drop_all()
+                db.session.remove()
+                db.engine.dispose()
+
+        print(f"   {profile:<12} {results['reads'] / duration:>7.0f} reads/s {results['submits'] / duration:>6.0f} submits/s   "
+              f"p95 {percentile(results['latencies'], 95):>8.2f} ms   errors {results['errors']} "
+              f"({results['locked']} database is locked)")
+
+def bench_cache_multiget():
+    """1,000 cached values: per-key GET vs pipelined get_many, json vs orjson serialization"""
+    from backend import cache
+
+    keys = [f"benchmark:multiget:{n}" for n in range(1000)]
+    values = {key: {
+        'quiz_id': n, 'title': f'Quiz {n}', 'question_count': n % 50,
+        'scores': [float(n % 101)] * 10, 'updated_at': datetime.utcnow()
+    } for n, key in enumerate(keys)}
+
+    # Serializer cost needs no Redis server
+    for serializer in ['json', 'orjson']:
+        if serializer == 'orjson' and cache.orjson is None:
+            print("   orjson: skipped (not installed)")
+            continue
+        cache.cache_serializer = serializer
+        start = time.perf_counter()
+        encoded = [cache.serialize(value) for value in values.values()]
+        encode_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for text in encoded:
+            cache.deserialize(text)
+        decode_ms = (time.perf_counter() - start) * 1000
+        print(f"   {serializer + ' serializer':<28} encode {encode_ms:>8.2f} ms   decode {decode_ms:>8.2f} ms")
+
+    if not cache.redis_client:
+        print("   round trips: skipped (Redis not available)")
+        return
+
+    cache.set_many(values, cache.CacheExpiry.SHORT)
+    for label, read in [
+        ('get_cache per key', lambda: [cache.get_cache(key) for key in keys]),
+        ('get_many pipelined', lambda: cache.get_many(keys))
+    ]:
+        latencies = []
+        for _ in range(20):
+            start = time.perf_counter()
+            read()
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"   {label:<28} p50 {percentile(latencies, 50):>8.2f} ms   p95 {percentile(latencies, 95):>8.2f} ms")
+    cache.redis_client.delete(*keys)
+
+BENCHMARKS = {
+    'dashboard': bench_dashboard,
+    'subject-quizzes': bench_subject_quizzes,
+    'quiz-serialization': bench_quiz_serialization,
+    'status-polling': bench_status_polling,
+    'batch-grading': bench_batch_grading,
+    'submit-spike': bench_submit_spike,
+    'login-storm': bench_login_storm,
+    'typeahead': bench_typeahead,
+    'leaderboard': bench_leaderboard,
+    'user-stats': bench_user_stats,
+    'score-history': bench_score_history,
+    'index-pack': bench_index_pack,
+    'engine-profiles': bench_engine_profiles,
+    'cache-multiget': bench_cache_multiget,
+}
+
+def run(name):
+    """Run one benchmark against a fresh database"""
+    func = BENCHMARKS[name]
+    print(f"🏁 {name}: {func.__doc__}")
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, 'benchmark.db'))
+        with app.app_context():
+            db.create_all()
+            func()
+            db.session.remove()
+            db.engine.dispose()
+    print()
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or ['all']
+    if names == ['all']:
+        names = list(BENCHMARKS)
+
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmark(s): {', '.join(unknown)}")
+        print(f"Available: {', '.join(BENCHMARKS)}")
+        sys.exit(1)
+
+    for name in names:
+        run(name)
@@ -36,6 +36,16 @@ def make_celery(app):
             'task': 'backend.api.quiz_tasks.send_expiry_warnings',
             'schedule': crontab(minute='*/5'),
         },
+        # Persist queued submissions every 5 seconds (queue ingestion mode)
+        'drain-submissions': {
+            'task': 'backend.api.quiz_tasks.drain_submissions',
+            'schedule': 5.0,
+        },
+        # Repair leaderboard drift nightly at 3 AM
+        'rebuild-leaderboards': {
+            'task': 'backend.api.quiz_tasks.rebuild_leaderboards_task',
+            'schedule': crontab(hour=3, minute=0),
+        },
         # Daily cleanup at 2 AM
         'daily-quiz-cleanup': {
             'task': 'backend.api.quiz_tasks.daily_cleanup',
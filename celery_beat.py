@@ -39,6 +39,14 @@ def create_celery_beat():
             'task': 'backend.api.quiz_tasks.send_expiry_warnings',
             'schedule': crontab(minute='*/5'),
         },
+        'drain-submissions': {
+            'task': 'backend.api.quiz_tasks.drain_submissions',
+            'schedule': 5.0,
+        },
+        'rebuild-leaderboards': {
+            'task': 'backend.api.quiz_tasks.rebuild_leaderboards_task',
+            'schedule': crontab(hour=3, minute=0),
+        },
         'daily-quiz-cleanup': {
             'task': 'backend.api.quiz_tasks.daily_cleanup',
             'schedule': crontab(hour=2, minute=0),
@@ -62,6 +70,7 @@ if __name__ == '__main__':
     print("   - Quiz expiry check: Every 2 minutes")
     print("   - Expiry warnings: Every 5 minutes")
     print("   - Daily cleanup: 2:00 AM UTC")
+    print("   - Leaderboard rebuild: 3:00 AM UTC")
     print("")
     
     celery = create_celery_beat()
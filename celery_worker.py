@@ -31,6 +31,12 @@ if __name__ == '__main__':
     print("   - send_expiry_warnings") 
     print("   - daily_cleanup")
     print("   - expire_single_quiz")
+    print("   - grade_submission_batch")
+    print("   - drain_submissions")
+    print("   - clear_cache_pattern_task")
+    print("   - warm_cache_task")
+    print("   - import_users_task")
+    print("   - rebuild_leaderboards_task")
     print("   - send_daily_reminders")
     print("   - generate_monthly_report")
     print("   - export_user_quiz_csv")
@@ -39,7 +45,9 @@ if __name__ == '__main__':
     print("⏰ Scheduled tasks:")
     print("   - Quiz expiry check: Every 2 minutes")
     print("   - Expiry warnings: Every 5 minutes")
+    print("   - Submission drain: Every 5 seconds (queue ingestion mode)")
     print("   - Daily cleanup: 2:00 AM UTC")
+    print("   - Leaderboard rebuild: 3:00 AM UTC")
     print("   - Daily reminders: 6:00 PM UTC")
     print("   - Monthly reports: 1st of month, 9:00 AM UTC")
     print("")
@@ -0,0 +1,44 @@
+"""
+Shared pytest fixtures: a Flask app on a freshly seeded throwaway database
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask_jwt_extended import create_access_token
+from backend.models.models import db
+from testing import make_app, seed
+
+# seed() arguments; a test module overrides them with a module-level SEED dict
+DEFAULT_SEED = dict(subjects=2, chapters_per_subject=2, quizzes_per_chapter=3, questions_per_quiz=4,
+                    users=3, scores_per_user=4)
+
+@pytest.fixture
+def app(request, tmp_path):
+    """The app inside its app context, on a seeded SQLite database removed afterwards"""
+    app = make_app(str(tmp_path / 'test.db'))
+    with app.app_context():
+        db.create_all()
+        seed(**getattr(request.module, 'SEED', DEFAULT_SEED))
+        try:
+            yield app
+        finally:
+            db.session.remove()
+            db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def user_headers(app):
+    """Authorization headers for student 1 with the claims login issues"""
+    token = create_access_token(identity='student1@example.com', additional_claims={
+        'user_id': 1, 'is_admin': False, 'full_name': 'Student 1'
+    })
+    return {'Authorization': f'Bearer {token}'}
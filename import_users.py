@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Bulk-create users from a CSV file
+
+Columns: user_name, password, full_name[, qualification, date_of_birth]
+Usage: python import_users.py students.csv [--chunk-size N] [--workers N] [--async]
+"""
+
+import argparse
+import os
+import sys
+from app import create_app
+from backend.user_import import import_users, IMPORT_CHUNK_SIZE
+
+MAX_ERRORS_SHOWN = 50
+
+def print_report(report):
+    for error in report['errors'][:MAX_ERRORS_SHOWN]:
+        print(f"❌ line {error['line']} ({error['user_name']}): {error['error']}")
+    if len(report['errors']) > MAX_ERRORS_SHOWN:
+        print(f"   ... and {len(report['errors']) - MAX_ERRORS_SHOWN} more")
+    print(f"✅ {report['created']} created, {report['skipped']} skipped, {report['failed']} failed "
+          f"of {report['total']} rows in {report['duration_seconds']}s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-create users from a CSV file')
+    parser.add_argument('csv_file', help='CSV with user_name, password and full_name columns')
+    parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE,
+                        help='rows validated, hashed and inserted per transaction')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='hashing processes (default: one per core, 0 hashes inline)')
+    parser.add_argument('--async', dest='run_async', action='store_true',
+                        help='queue the import on a Celery worker instead')
+    args = parser.parse_args()
+
+    if args.workers is not None:
+        # Sizes the shared hashing pool that create_app starts
+        os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+    app = create_app()
+    with app.app_context():
+        with open(args.csv_file, encoding='utf-8-sig', newline='') as csv_file:
+            if args.run_async:
+                from backend.api.quiz_tasks import import_users_task
+                task = import_users_task.delay(csv_file.read())
+                print(f"🚀 User import queued (task {task.id})")
+                return
+
+            print(f"👥 Importing users from {args.csv_file}...")
+            try:
+                print_report(import_users(csv_file, args.chunk_size))
+            except ValueError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
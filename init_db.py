@@ -7,6 +7,7 @@ import os
 import sys
 from app import create_app
 from backend.models.models import db, create_admin_user
+from backend.migrations import run_migrations
 
 def init_database():
     """Initialize database with tables and seed data"""
@@ -15,9 +16,9 @@ def init_database():
     with app.app_context():
         print("🗄️  Initializing database...")
         
-        # Create all tables
+        # Create all tables and bring existing ones up to date
         print("📋 Creating database tables...")
-        db.create_all()
+        run_migrations()
         print("✅ Database tables created successfully!")
         
         # Create admin user
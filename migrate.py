@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Bring an existing database up to the current schema
+
+Creates missing tables, then applies pending versioned migrations
+(backend/migrations.py) in order. Safe to run on every deploy.
+Usage: python migrate.py [--status]
+"""
+
+import argparse
+import time
+from app import create_app
+from backend.migrations import run_migrations, migration_status
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply pending schema migrations')
+    parser.add_argument('--status', action='store_true',
+                        help='list migrations and whether each is applied, without changing anything')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.status:
+            for migration in migration_status():
+                state = f"applied {migration['applied_at']:%Y-%m-%d %H:%M}" if migration['applied_at'] else 'pending'
+                print(f"   {migration['version']:>3}  {migration['name']:<45} {state}")
+            return
+
+        print("🔄 Applying schema migrations...")
+        start = time.perf_counter()
+        applied = run_migrations()
+        for version, name in applied:
+            print(f"   - {version}: {name}")
+        if applied:
+            print(f"✅ Applied {len(applied)} migrations in {time.perf_counter() - start:.2f}s")
+        else:
+            print("✅ Schema is up to date")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Rebuild the admin search index from the users, subjects, quizzes and questions tables
+
+Run after restoring a backup or bulk-loading rows outside the ORM.
+Usage: python rebuild_search_index.py
+"""
+
+import time
+from app import create_app
+from backend import search
+
+def main():
+    app = create_app()
+    with app.app_context():
+        print(f"🔎 Rebuilding search index ({type(search.backend).__name__})...")
+        start = time.perf_counter()
+        counts = search.rebuild_search_index()
+        for kind, count in counts.items():
+            print(f"   - {kind}: {count}")
+        print(f"✅ Indexed {sum(counts.values())} rows in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
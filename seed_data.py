@@ -4,7 +4,7 @@ Seed data script for Quiz Master application
 """
 
 from app import create_app
-from backend.models.models import db, User, Subject, Chapter, Quiz, Question, Score, create_admin_user
+from backend.models.models import db, User, Subject, Chapter, Quiz, Question, Score, create_admin_user, sync_question_counts
 from datetime import datetime, timedelta
 
 def seed_data():
@@ -215,12 +215,33 @@ def seed_data():
             db.session.add(question)
         
         db.session.commit()
+        sync_question_counts()
         print("✅ Sample data seeded successfully!")
         print(f"📚 Created {len(subjects)} subjects")
         print(f"📖 Created {len(chapters)} chapters")
         print(f"📝 Created {len(quizzes)} quizzes (including anytime quizzes)")
         print(f"❓ Created {len(questions_data)} questions")
         print("🎯 Anytime quizzes available for immediate testing!")
+        
+        # The bulk deletes above bypass the search hooks; re-read the index from the new rows
+        from backend.search import rebuild_search_index
+        print(f"✅ Search index rebuilt: {rebuild_search_index()}")
+        
+        # Score rollups follow the scores table; recompute them from the new rows
+        from backend.user_stats import rebuild_user_stats
+        print(f"✅ User stats rebuilt: {rebuild_user_stats()}")
+        
+        # Deleted scores are still on the leaderboards until they are recomputed
+        from backend.leaderboards import is_leaderboard_enabled, rebuild_leaderboards
+        if is_leaderboard_enabled():
+            print(f"✅ Leaderboards rebuilt: {rebuild_leaderboards()}")
+        
+        # Fresh data: drop entries built from the old rows, then rebuild the hot ones
+        from backend.cache import clear_all_cache
+        from backend.cache_warmup import warm_cache
+        clear_all_cache()
+        report = warm_cache()
+        print(f"🔥 Warmed {report['warmed']} cache keys in {report['duration_seconds']}s")
 
 if __name__ == "__main__":
     seed_data() 
\ No newline at end of file
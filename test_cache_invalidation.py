@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the local-tier invalidation broadcasts (backend/cache.py)
+
+Runs against fakeredis; skipped when it is not installed.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import cache
+
+@pytest.fixture
+def channel(monkeypatch):
+    """A subscriber on the invalidation channel, as another worker would hold"""
+    fakeredis = pytest.importorskip('fakeredis')
+    monkeypatch.setattr(cache, 'redis_client', fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(cache, 'local_cache', None)
+    pubsub = cache.redis_client.pubsub()
+    pubsub.subscribe(cache.INVALIDATION_CHANNEL)
+    yield pubsub
+    pubsub.close()
+
+def published(pubsub):
+    messages = []
+    while (message := pubsub.get_message(timeout=0.1)) is not None:
+        if message['type'] == 'message':
+            messages.append(cache.deserialize(message['data']))
+    return messages
+
+def test_node_without_local_tier_still_broadcasts(channel):
+    """Writes on a node with no local tier still reach the other workers' tiers"""
+    cache.set_cache('test:broadcast', {'value': 1})
+    cache.delete_cache('test:broadcast')
+    cache.invalidate_namespace('test:namespace')
+
+    messages = published(channel)
+    assert [message.get('keys') for message in messages[:2]] == [['test:broadcast'], ['test:broadcast']]
+    assert messages[2]['namespace'] == 'test:namespace'
+    print("✅ Invalidations published without a local tier")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
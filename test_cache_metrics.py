@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Access tests for the cache metrics scrape endpoint and the admin cache stats
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask_jwt_extended import create_access_token
+
+METRICS_URL = '/api/admin/cache/metrics'
+SCRAPE_TOKEN = 'scrape-test-token'
+
+def admin_headers():
+    token = create_access_token(identity='admin@example.com', additional_claims={
+        'user_id': 1, 'is_admin': True, 'full_name': 'Admin'
+    })
+    return {'Authorization': f'Bearer {token}'}
+
+def test_metrics_require_scrape_token(app, client):
+    """Only the configured scrape token opens the metrics; an admin JWT does not"""
+    assert client.get(METRICS_URL, headers={'Authorization': f'Bearer {SCRAPE_TOKEN}'}).status_code == 403
+
+    app.config['METRICS_SCRAPE_TOKEN'] = SCRAPE_TOKEN
+    response = client.get(METRICS_URL, headers={'Authorization': f'Bearer {SCRAPE_TOKEN}'})
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain')
+
+    for headers in ({}, {'Authorization': 'Bearer wrong'}, admin_headers()):
+        assert client.get(METRICS_URL, headers=headers).status_code == 401, headers
+    print("✅ Metrics served to the scrape token only")
+
+def test_cache_stats_stay_admin_only(app, client, user_headers):
+    """The scrape token grants nothing beyond the metrics"""
+    app.config['METRICS_SCRAPE_TOKEN'] = SCRAPE_TOKEN
+    assert client.get('/api/admin/cache/stats', headers=admin_headers()).status_code == 200
+    assert client.get('/api/admin/cache/stats', headers=user_headers).status_code == 403
+    response = client.get('/api/admin/cache/stats', headers={'Authorization': f'Bearer {SCRAPE_TOKEN}'})
+    assert response.status_code in (401, 422)
+    print("✅ Cache stats still require an admin JWT")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
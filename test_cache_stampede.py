@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Concurrency tests for cache stampede protection
+
+Runs against a local Redis server when one is up, otherwise against fakeredis.
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from flask import Flask
+from backend import cache
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+CONCURRENT_REQUESTS = 200
+TEST_KEY = "test:stampede:admin_stats"
+
+def setup_cache():
+    """Connect to the test Redis DB, falling back to fakeredis without a server"""
+    app = Flask(__name__)
+    app.config['REDIS_CACHE_DB'] = 15  # Keep test keys away from the app cache
+    cache.init_cache(app)
+    if not cache.redis_client:
+        if fakeredis is None:
+            pytest.skip("Redis not available and fakeredis not installed")
+        cache.redis_client = fakeredis.FakeRedis(decode_responses=True)
+    cache.redis_client.delete(TEST_KEY, f"{cache.LOCK_PREFIX}:{TEST_KEY}")
+    if cache.local_cache is not None:
+        cache.local_cache.clear()
+
+def run_concurrently(func, count=CONCURRENT_REQUESTS):
+    """Start count threads at the same instant and collect their results"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(n):
+        barrier.wait()
+        results[n] = func()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def slow_aggregate(counter, value):
+    """Stand-in for get_admin_stats: slow enough for every miss to overlap"""
+    def compute():
+        with counter['lock']:
+            counter['calls'] += 1
+        time.sleep(0.5)
+        return value
+    return compute
+
+def test_single_recompute_on_cold_miss():
+    """200 simultaneous misses on an empty key recompute it exactly once"""
+    setup_cache()
+
+    counter = {'calls': 0, 'lock': threading.Lock()}
+    compute = slow_aggregate(counter, {'total_users': 42})
+    results = run_concurrently(lambda: cache.get_or_compute(TEST_KEY, compute, expire_seconds=60))
+
+    assert counter['calls'] == 1, f"expected 1 recomputation, got {counter['calls']}"
+    assert all(result == {'total_users': 42} for result in results)
+    print(f"✅ {CONCURRENT_REQUESTS} cold misses -> {counter['calls']} recomputation")
+
+def test_stale_value_served_during_refresh():
+    """After expiry one worker refreshes while the other 199 get the stale value"""
+    setup_cache()
+
+    cache.store_envelope(TEST_KEY, {'total_users': 1}, delta=0.5, expire_seconds=-1, stale_seconds=60)
+    counter = {'calls': 0, 'lock': threading.Lock()}
+    compute = slow_aggregate(counter, {'total_users': 2})
+
+    start = time.perf_counter()
+    results = run_concurrently(lambda: cache.get_or_compute(TEST_KEY, compute, expire_seconds=60))
+
+    assert counter['calls'] == 1, f"expected 1 recomputation, got {counter['calls']}"
+    assert results.count({'total_users': 1}) == CONCURRENT_REQUESTS - 1
+    assert results.count({'total_users': 2}) == 1
+    assert cache.get_or_compute(TEST_KEY, compute, expire_seconds=60) == {'total_users': 2}
+    print(f"✅ {CONCURRENT_REQUESTS} stale reads -> {counter['calls']} recomputation "
+          f"({time.perf_counter() - start:.2f}s)")
+
+if __name__ == "__main__":
+    print("🧪 Cache stampede protection")
+    print("=" * 30)
+    test_single_recompute_on_cold_miss()
+    test_stale_value_served_during_refresh()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Query-count tests for the claim-based identity context (backend/identity.py)
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask_jwt_extended import create_access_token
+from testing import QueryCounter
+from backend.models.models import db, Quiz, Score
+
+SEED = dict(subjects=2, chapters_per_subject=1, quizzes_per_chapter=3, questions_per_quiz=2, users=1, scores_per_user=2)
+
+# Endpoints that only need the caller's id, not profile fields
+ENDPOINTS = [
+    '/api/user/dashboard',
+    '/api/user/scores',
+    '/api/user/score-summary',
+    '/api/user/subjects/1/quizzes',
+    '/api/user/quiz/1/status',
+    '/api/user/quiz-summary/2',
+]
+
+def user_lookups(statements):
+    return [statement for statement in statements if 'FROM users' in statement]
+
+def run_requests(client, token):
+    """GET every endpoint with token; returns {path: (status, statements)}"""
+    results = {}
+    headers = {'Authorization': f'Bearer {token}'}
+    for path in ENDPOINTS:
+        with QueryCounter(db.engine) as counter:
+            response = client.get(path, headers=headers)
+        results[path] = (response.status_code, counter.statements)
+    return results
+
+def claims_token():
+    """A token as issued by login: identity plus user_id/is_admin/full_name claims"""
+    return create_access_token(identity='student1@example.com', additional_claims={
+        'user_id': 1, 'is_admin': False, 'full_name': 'Student 1'
+    })
+
+def test_claims_skip_user_lookup(app, client):
+    """Tokens carrying claims never query the users table"""
+    for path, (status, statements) in run_requests(client, claims_token()).items():
+        assert status == 200, f"{path} returned {status}"
+        assert not user_lookups(statements), f"{path} queried users: {user_lookups(statements)}"
+    print(f"✅ {len(ENDPOINTS)} endpoints served without a User lookup")
+
+def test_one_query_saved_per_request(app, client):
+    """Compared with a claim-less token, every request runs one query fewer"""
+    legacy_token = create_access_token(identity='student1@example.com')
+    legacy = run_requests(client, legacy_token)
+    current = run_requests(client, claims_token())
+    for path in ENDPOINTS:
+        assert len(user_lookups(legacy[path][1])) == 1, f"{path} resolved the user more than once"
+        saved = len(legacy[path][1]) - len(current[path][1])
+        assert saved == 1, f"{path}: expected 1 query saved, got {saved}"
+        print(f"   {path:<32} {len(legacy[path][1])} -> {len(current[path][1])} queries")
+    print("✅ One query saved on every endpoint")
+
+def test_user_required_reuses_identity(app, client):
+    """user_required and the view share one resolved identity"""
+    from flask import Blueprint
+    from utils.decorators import user_required
+    from backend.identity import current_identity
+
+    bp = Blueprint('identity_test', __name__)
+
+    @bp.route('/identity-test')
+    @user_required
+    def whoami():
+        return {'user_id': current_identity().user_id}
+
+    app.register_blueprint(bp)
+    headers = {'Authorization': f"Bearer {create_access_token(identity='student1@example.com')}"}
+    with QueryCounter(db.engine) as counter:
+        response = client.get('/identity-test', headers=headers)
+
+    assert response.status_code == 200 and response.get_json() == {'user_id': 1}
+    assert len(user_lookups(counter.statements)) == 1, counter.statements
+    print("✅ user_required + view resolved a claim-less token with a single lookup")
+
+def test_response_cache_tags_numeric_user_id(app, client, monkeypatch):
+    """A claim-less token's cached stats and profile are tagged and dropped by user id"""
+    fakeredis = pytest.importorskip('fakeredis')
+    from backend import cache
+    monkeypatch.setattr(cache, 'redis_client', fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(cache, 'local_cache', None)
+
+    headers = {'Authorization': f"Bearer {create_access_token(identity='student1@example.com')}"}
+    for path in ('/api/user/stats', '/api/user/profile'):
+        assert client.get(path, headers=headers).status_code == 200
+    tag_key = f"{cache.TAG_PREFIX}:user:1"
+    entries = cache.redis_client.smembers(tag_key)
+    assert len(entries) == 2, cache.redis_client.keys('*')
+
+    cache.invalidate_user_cache(1)
+    assert not cache.redis_client.exists(tag_key, *entries)
+    print("✅ Claim-less stats and profile entries tagged user:1 and invalidated by id")
+
+def test_deleted_user_cannot_submit(app, client):
+    """A token outliving its user row is refused on the submit write path"""
+    token = create_access_token(identity='gone@example.com', additional_claims={
+        'user_id': 999, 'is_admin': False, 'full_name': 'Deleted Student'
+    })
+    quiz = next(quiz for quiz in Quiz.query.all() if quiz.is_available_for_attempt(999)[0])
+    response = client.post(f'/api/user/quiz/{quiz.quiz_id}/submit', headers={'Authorization': f'Bearer {token}'},
+                           json={'answers': {}, 'time_taken': 5})
+    assert response.status_code == 404, response.get_json()
+    assert not db.session.query(Score).filter_by(user_id=999).count()
+    print("✅ Submit re-checks that the user still exists")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
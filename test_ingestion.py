@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched score writes behind queued submissions (backend/ingestion.py)
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, text
+from backend import ingestion
+from backend.models.models import db, Quiz, Score, UserStats
+from backend.user_stats import check_user_stats
+
+def submissions(user_ids, quiz_id):
+    return [{
+        'receipt_id': f'receipt-{user_id}', 'user_id': user_id, 'quiz_id': quiz_id,
+        'total_questions': 4, 'correct_answers': 3, 'total_score': 75.0, 'time_taken': 60,
+        'submitted_at': datetime(2024, 1, 1, 12, 0, 0).isoformat()
+    } for user_id in user_ids]
+
+def unattempted_quiz():
+    attempted = {quiz_id for (quiz_id,) in db.session.query(Score.quiz_id)}
+    return next(quiz for quiz in Quiz.query.all() if quiz.quiz_id not in attempted)
+
+def committed_scores(quiz_id):
+    """Rows another connection can see, i.e. what was actually committed"""
+    with db.engine.connect() as connection:
+        return {user_id for (user_id,) in connection.execute(
+            text("SELECT user_id FROM scores WHERE quiz_id = :quiz_id"), {'quiz_id': quiz_id}
+        )}
+
+def persist_racing_submit(quiz_id, user_ids, racing_user_id):
+    """persist_submissions while a synchronous submit by racing_user_id
+    commits right after the batch's duplicate check"""
+    raced = []
+
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if not raced and statement.lstrip().startswith('SELECT') and 'FROM scores' in statement:
+            raced.append(statement)
+            with db.engine.begin() as other:
+                other.execute(Score.__table__.insert(), [{
+                    'user_id': racing_user_id, 'quiz_id': quiz_id, 'total_questions': 4, 'correct_answers': 1,
+                    'total_score': 25.0, 'time_taken': 10, 'attempt_datetime': datetime.utcnow()
+                }])
+
+    db.session.remove()
+    event.listen(db.engine, 'after_cursor_execute', race)
+    try:
+        return ingestion.persist_submissions(submissions(user_ids, quiz_id))
+    finally:
+        event.remove(db.engine, 'after_cursor_execute', race)
+        assert raced, 'the duplicate check never ran'
+
+def test_raced_attempt_is_rejected(app):
+    """A score committed after the duplicate check rejects only its own submission"""
+    quiz_id = unattempted_quiz().quiz_id
+    saved, rejected = persist_racing_submit(quiz_id, [1, 2, 3], racing_user_id=2)
+
+    assert sorted(saved) == ['receipt-1', 'receipt-3']
+    assert rejected == {'receipt-2': 'You have already attempted this quiz'}
+    assert committed_scores(quiz_id) == {1, 2, 3}
+    # The racing insert bypassed the rollups, so only users 1 and 3 are compared
+    assert not [difference for difference in check_user_stats() if difference['key']['user_id'] != 2]
+    print("✅ Raced attempt rejected, the rest of the batch saved")
+
+def test_conflict_path_rolls_back_with_the_rollups(app, monkeypatch):
+    """After a conflict, a failed rollup write still leaves none of the batch committed"""
+    quiz_id = unattempted_quiz().quiz_id
+    attempts = db.session.get(UserStats, 1).attempt_count
+
+    def fail(rows):
+        raise RuntimeError('rollup write failed')
+
+    monkeypatch.setattr(ingestion, 'record_user_stats', fail)
+    with pytest.raises(RuntimeError):
+        persist_racing_submit(quiz_id, [1, 2, 3], racing_user_id=2)
+    db.session.rollback()
+
+    assert committed_scores(quiz_id) == {2}
+    assert db.session.get(UserStats, 1).attempt_count == attempts
+    print("✅ Scores and rollups commit together or not at all")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
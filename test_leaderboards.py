@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the student-facing leaderboards (backend/leaderboards.py)
+
+Runs against fakeredis; skipped when it is not installed.
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend import leaderboards
+from backend.models.models import db, User, Chapter, Quiz, Score
+
+def board_urls():
+    """Every board user 1 is ranked on, listed and around-me"""
+    quiz_id, subject_id = db.session.query(Score.quiz_id, Chapter.subject_id).join(
+        Quiz, Score.quiz_id == Quiz.quiz_id
+    ).join(Chapter, Quiz.chapter_id == Chapter.chapter_id).filter(Score.user_id == 1).first()
+    boards = ['global', f'subject/{subject_id}', f'quiz/{quiz_id}']
+    return [f'/api/user/leaderboards/{board}{suffix}' for board in boards for suffix in ('', '/around-me')]
+
+@pytest.fixture
+def boards(app, monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    monkeypatch.setattr(leaderboards, 'leaderboard_client', fakeredis.FakeRedis(decode_responses=True))
+    leaderboards.rebuild_leaderboards()
+
+def test_entries_never_expose_emails(app, client, user_headers, boards):
+    """A student sees other students' display names, never their user_name (email)"""
+    emails = [user_name for (user_name,) in User.query.with_entities(User.user_name)]
+    urls = board_urls()
+    for url in urls:
+        response = client.get(url, headers=user_headers)
+        assert response.status_code == 200, (url, response.get_json())
+        entries = response.get_json()['entries']
+        assert entries, url
+        assert all('user_name' not in entry and entry['full_name'] for entry in entries), entries
+        body = response.get_data(as_text=True)
+        assert not [email for email in emails if email in body], url
+    print(f"✅ {len(urls)} leaderboard responses carry no emails")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
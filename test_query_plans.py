@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN QUERY PLAN regression tests for the hot queries in routes and tasks
+
+Each hot path runs against a seeded SQLite database while its SELECTs are
+captured; the test fails if any of them scans a table it should search
+through an index.
+"""
+
+import sys
+import os
+import re
+from datetime import datetime
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, inspect, text
+from backend.models.models import db, Quiz
+from backend.migrations import run_migrations, migration_status
+from backend.quiz_payloads import build_quiz_payload
+from backend.answer_keys import build_answer_key
+from backend.quiz_listing import subject_quiz_query, load_user_attempts
+from backend.dashboard import compute_subject_summaries
+from backend.score_history import list_user_scores
+from backend.user_stats import load_user_stats, recent_attempt_count
+from backend.cache_warmup import upcoming_quiz_ids
+from backend.leaderboards import quiz_distribution, is_leaderboard_enabled
+from backend.api.quiz_tasks import check_and_expire_quizzes, send_expiry_warnings, generate_quiz_report
+
+SEED = dict(subjects=3, chapters_per_subject=4, quizzes_per_chapter=5, questions_per_quiz=5,
+            users=10, scores_per_user=8)
+
+# (label, action, tables it must never scan)
+HOT_PATHS = [
+    ('start quiz payload', lambda: build_quiz_payload(db.session.get(Quiz, 1)), {'questions', 'chapters'}),
+    ('answer key', lambda: build_answer_key(1, 'plan-test'), {'questions'}),
+    ('dashboard summaries', compute_subject_summaries, {'chapters', 'quizzes'}),
+    ('subject quiz listing', lambda: subject_quiz_query(1).all(), {'chapters', 'quizzes'}),
+    ('user attempts', lambda: load_user_attempts(1, [1, 2, 3]), {'scores'}),
+    ('score history page', lambda: list_user_scores(1, None, None, 20), {'scores', 'quizzes', 'chapters', 'subjects'}),
+    ('recent attempts', lambda: recent_attempt_count(load_user_stats(1)), {'scores'}),
+    ('quiz score distribution', lambda: quiz_distribution(1), {'scores', 'users'}),
+    ('cache warm-up', lambda: upcoming_quiz_ids(datetime.utcnow(), 24), {'quizzes'}),
+    ('expiry sweep task', lambda: check_and_expire_quizzes.apply(), {'quizzes'}),
+    ('expiry warnings task', lambda: send_expiry_warnings.apply(), {'quizzes'}),
+    ('daily report task', lambda: generate_quiz_report.apply(), {'quizzes', 'scores'}),
+]
+
+def query_plans(action):
+    """(statement, EXPLAIN QUERY PLAN details) for every SELECT action runs"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            captured.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        action()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+        db.session.remove()
+
+    with db.engine.connect() as connection:
+        return [(statement, [row[3] for row in connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()]) for statement, parameters in captured]
+
+def table_scans(details, tables):
+    """Plan lines that walk a whole table (or a whole index of it) instead of searching"""
+    return [detail for detail in details
+            if (match := re.match(r'SCAN (\w+)', detail)) and match.group(1) in tables]
+
+def test_hot_queries_use_indexes(app):
+    """No hot path scans a table it filters or joins on"""
+    failures = []
+    for label, action, tables in HOT_PATHS:
+        if label == 'quiz score distribution' and is_leaderboard_enabled():
+            continue  # Served from Redis; the SQL fallback only runs without it
+        plans = query_plans(action)
+        assert plans, f"{label}: ran no SELECT"
+        for statement, details in plans:
+            scans = table_scans(details, tables)
+            if scans:
+                failures.append(f"{label}: {scans}\n    {' '.join(statement.split())}")
+    assert not failures, "Hot queries degraded to scans:\n" + "\n".join(failures)
+    print(f"✅ {len(HOT_PATHS)} hot paths search through indexes")
+
+def test_migrations_build_declared_indexes(app):
+    """Migrating a database from before the index pack yields every index models.py declares"""
+    declared = {
+        table.name: {index.name for index in table.indexes} for table in db.metadata.sorted_tables
+    }
+    with db.engine.begin() as connection:
+        for table, names in declared.items():
+            for name in names:
+                connection.execute(text(f"DROP INDEX {name}"))
+        connection.execute(text("DELETE FROM schema_migrations"))
+
+    assert len(run_migrations()) == len(migration_status())
+    assert run_migrations() == []
+    inspector = inspect(db.engine)
+    for table, names in declared.items():
+        present = {index['name'] for index in inspector.get_indexes(table)}
+        assert names <= present, f"{table}: missing {names - present}"
+    print("✅ Migrations rebuild every declared index and are idempotent")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for the paginated subject quiz listing (backend/quiz_listing.py)
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.quiz_listing import MAX_PAGE_SIZE
+
+def test_pages_and_cursors_cover_listing(app, client, user_headers):
+    """Offset pages and cursor pages both return the full listing once"""
+    url = '/api/user/subjects/1/quizzes'
+    full = [quiz['quiz_id'] for quiz in client.get(url, headers=user_headers).get_json()['quizzes']]
+
+    page = client.get(f'{url}?page=1&per_page={MAX_PAGE_SIZE}', headers=user_headers).get_json()
+    assert [quiz['quiz_id'] for quiz in page['quizzes']] == full
+
+    seen, cursor = [], None
+    while True:
+        query = '?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url + query, headers=user_headers).get_json()
+        seen += [quiz['quiz_id'] for quiz in page['quizzes']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert seen == full, seen
+    print("✅ Pages and cursors match the full listing")
+
+def test_rejects_bad_parameters(app, client, user_headers):
+    """Non-positive or oversized page sizes and malformed cursors are 400s"""
+    for query in ('page=0', 'page=1&per_page=0', f'page=1&per_page={MAX_PAGE_SIZE + 1}',
+                  'limit=0', f'limit={MAX_PAGE_SIZE + 1}', 'cursor=garbage'):
+        response = client.get(f'/api/user/subjects/1/quizzes?{query}', headers=user_headers)
+        assert response.status_code == 400, (query, response.get_json())
+    print("✅ Bad parameters rejected")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
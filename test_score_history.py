@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyset-paginated score history (backend/score_history.py)
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.models.models import db, Quiz, Score
+
+def test_pages_cover_history_in_order(app, client, user_headers):
+    """Walking the cursors returns the full history once, ties on attempt time included"""
+    attempted = {quiz_id for (quiz_id,) in db.session.query(Score.quiz_id).filter(Score.user_id == 1)}
+    same_time = datetime(2024, 1, 1, 12, 0, 0)
+    for quiz in Quiz.query.filter(Quiz.quiz_id.notin_(attempted)).all():
+        db.session.add(Score(user_id=1, quiz_id=quiz.quiz_id, total_score=50, correct_answers=2,
+                             total_questions=4, time_taken=30, attempt_datetime=same_time))
+    db.session.commit()
+
+    full = client.get('/api/user/scores', headers=user_headers).get_json()
+    assert len(full['scores']) == 12 and full['next_cursor'] is None
+
+    seen, cursor = [], None
+    while True:
+        url = '/api/user/scores?limit=5&fields=score_id,quiz_title' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url, headers=user_headers).get_json()
+        assert all(set(score) == {'score_id', 'quiz_title'} for score in page['scores'])
+        seen += [score['score_id'] for score in page['scores']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert seen == [score['score_id'] for score in full['scores']], seen
+    print("✅ Keyset pages match the full history")
+
+def test_rejects_bad_parameters(app, client, user_headers):
+    """Unknown fields, out-of-range limits and malformed cursors are 400s"""
+    for query in ('fields=password_hash', 'limit=0', 'limit=101', 'cursor=garbage'):
+        response = client.get(f'/api/user/scores?{query}', headers=user_headers)
+        assert response.status_code == 400, (query, response.get_json())
+    print("✅ Bad parameters rejected")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-user score rollups (backend/user_stats.py)
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from testing import QueryCounter
+from backend.models.models import db, Quiz, Score, UserStats
+from backend.grading import grade_and_save_batch
+from backend.user_stats import check_user_stats, rebuild_user_stats
+from backend.migrations import run_migrations
+
+def expected_summary(user_id):
+    """What the endpoints computed from raw Score rows before the rollups"""
+    scores = Score.query.filter_by(user_id=user_id).all()
+    return {
+        'total_quizzes_attempted': len(scores),
+        'average_score': round(sum(s.total_score for s in scores) / len(scores), 2),
+        'best_score': max(s.total_score for s in scores),
+        'total_time_spent': sum(s.time_taken or 0 for s in scores)
+    }
+
+def test_endpoints_read_rollups(app, client, user_headers):
+    """Score summary matches the raw rows and reads one stats row, no scores"""
+    with QueryCounter(db.engine) as counter:
+        response = client.get('/api/user/score-summary', headers=user_headers)
+    assert response.status_code == 200
+    summary = response.get_json()
+    for field, value in expected_summary(1).items():
+        assert summary[field] == value, f"{field}: {summary[field]} != {value}"
+    assert len(counter.statements) == 1, counter.statements
+    assert 'FROM user_stats' in counter.statements[0]
+
+    stats = client.get('/api/user/stats', headers=user_headers).get_json()
+    assert stats['total_quizzes'] == 4
+    assert sum(subject['quizzes_taken'] for subject in stats['subject_stats'].values()) == 4
+    profile = client.get('/api/user/profile', headers=user_headers).get_json()
+    assert profile['stats']['quizzes_attempted'] == 4
+    assert profile['stats']['recent_attempts'] == 4
+    print("✅ Summary, stats and profile served from the rollups")
+
+def test_writes_keep_rollups_consistent(app, client, user_headers):
+    """Submit and batch grading update the rollups in the same transaction"""
+    attempted = {quiz_id for (quiz_id,) in db.session.query(Score.quiz_id).filter(Score.user_id == 1)}
+    quiz = next(quiz for quiz in Quiz.query.all()
+                if quiz.quiz_id not in attempted and quiz.is_available_for_attempt(1)[0])
+    response = client.post(f'/api/user/quiz/{quiz.quiz_id}/submit', headers=user_headers,
+                           json={'answers': {}, 'time_taken': 42})
+    assert response.status_code == 200, response.get_json()
+    assert db.session.get(UserStats, 1).attempt_count == 5
+
+    graded = {quiz_id for (quiz_id,) in db.session.query(Score.quiz_id).filter(Score.user_id.in_([2, 3]))}
+    quiz = next(quiz for quiz in Quiz.query.all() if quiz.quiz_id not in graded)
+    report = grade_and_save_batch(quiz, [{'user_id': 2, 'answers': {}}, {'user_id': 3, 'answers': {}}])
+    assert report['graded'] == 2
+
+    assert check_user_stats() == []
+    print("✅ Rollups match the scores table after submit and batch grading")
+
+def test_checker_finds_and_backfill_repairs_drift(app, client, user_headers):
+    """check_user_stats reports drift; rebuild_user_stats clears it"""
+    db.session.get(UserStats, 2).attempt_count += 1
+    db.session.delete(db.session.get(UserStats, 3))
+    db.session.commit()
+
+    problems = {(difference['key']['user_id'], difference['problem']) for difference in check_user_stats()}
+    assert (2, 'mismatch') in problems and (3, 'missing') in problems, problems
+
+    rebuild_user_stats()
+    assert check_user_stats() == []
+    print("✅ Checker found the drift and the backfill repaired it")
+
+def test_migration_backfills_upgraded_database(app, client, user_headers):
+    """Upgrading a database whose rollup tables are new and empty fills them"""
+    run_migrations()
+    db.session.query(UserStats).delete()
+    db.session.execute(db.text("DELETE FROM user_subject_stats"))
+    db.session.execute(db.text("DELETE FROM schema_migrations WHERE version = 5"))
+    db.session.commit()
+    assert check_user_stats() != []
+
+    assert (5, 'backfill user_stats and user_subject_stats rollups') in run_migrations()
+    assert check_user_stats() == []
+    print("✅ Migration backfilled the rollups")
+
+def test_batch_grading_reports_malformed_entries(app):
+    """Malformed batch entries are reported per item and leave the rollups alone"""
+    graded = {quiz_id for (quiz_id,) in db.session.query(Score.quiz_id).filter(Score.user_id == 2)}
+    quiz = next(quiz for quiz in Quiz.query.all() if quiz.quiz_id not in graded)
+    report = grade_and_save_batch(quiz, [
+        [2, {}],
+        {'user_id': '2', 'answers': {}},
+        {'user_id': True, 'answers': {}},
+        {'user_id': 2, 'answers': {'1': True}},
+        {'user_id': 2, 'answers': {}, 'time_taken': 'slow'},
+        {'user_id': 2, 'answers': {}},
+    ])
+    assert report['graded'] == 1
+    assert [(error['index'], error['error']) for error in report['errors']] == [
+        (0, 'Submission must be an object'),
+        (1, 'user_id must be an integer'),
+        (2, 'user_id must be an integer'),
+        (3, 'answers must map question ids to option indexes'),
+        (4, 'time_taken must be a non-negative integer'),
+    ]
+    assert check_user_stats() == []
+    print("✅ Malformed entries reported per item")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -0,0 +1,139 @@
+# testing.py - Throwaway apps and bulk seed data for the tests and benchmark.py
+
+import os
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from sqlalchemy import event
+from backend.models.models import db, User, Subject, Chapter, Quiz, Question, Score
+from backend.config import load_config, init_database
+from backend.cache import init_cache
+from backend.search import init_search
+from backend.leaderboards import init_leaderboards
+
+def make_app(db_path, profile='sqlite', database_url=None):
+    """Create a Flask app bound to a throwaway SQLite database (or database_url)"""
+    from backend.routes.auth_routes import auth_bp
+    from backend.routes.user_routes import user_bp
+    from backend.routes.admin_routes import admin_bp
+
+    app = Flask(__name__)
+    load_config(app, profile)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url or f'sqlite:///{db_path}'
+    app.config['JWT_SECRET_KEY'] = 'benchmark-secret-key'
+    app.config['REDIS_HOST'] = os.environ.get('REDIS_HOST', 'localhost')
+    app.config['REDIS_PORT'] = int(os.environ.get('REDIS_PORT', 6379))
+    app.config['REDIS_CACHE_DB'] = 15  # Keep benchmark keys away from the app cache
+    app.config['REDIS_LEADERBOARD_DB'] = 14
+
+    init_database(app, db)
+    JWTManager(app)
+    init_cache(app)
+    init_search(app)
+    init_leaderboards(app)
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(user_bp)
+    app.register_blueprint(admin_bp)
+    return app
+
+class QueryCounter:
+    """Count SQL statements executed on an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+def seed(subjects=10, chapters_per_subject=3, quizzes_per_chapter=2, questions_per_quiz=0,
+         users=0, scores_per_user=0):
+    """Bulk-seed a dataset of the requested shape and return the row counts"""
+    now = datetime.utcnow()
+
+    db.session.execute(Subject.__table__.insert(), [{
+        'subject_id': s, 'name': f'Subject {s}', 'description': f'Benchmark subject {s}',
+        'is_active': True, 'created_at': now, 'updated_at': now
+    } for s in range(1, subjects + 1)])
+
+    chapter_rows = []
+    for s in range(1, subjects + 1):
+        for c in range(chapters_per_subject):
+            chapter_rows.append({
+                'chapter_id': len(chapter_rows) + 1, 'name': f'Chapter {c}', 'description': '',
+                'subject_id': s, 'created_at': now, 'updated_at': now
+            })
+    if chapter_rows:
+        db.session.execute(Chapter.__table__.insert(), chapter_rows)
+
+    quiz_rows = []
+    for chapter in chapter_rows:
+        for q in range(quizzes_per_chapter):
+            # Alternate between open, upcoming and anytime quizzes
+            kind = len(quiz_rows) % 3
+            quiz_rows.append({
+                'quiz_id': len(quiz_rows) + 1, 'title': f'Quiz {len(quiz_rows) + 1}',
+                'chapter_id': chapter['chapter_id'],
+                'date_of_quiz': now + timedelta(days=1) if kind == 1 else now - timedelta(hours=1),
+                'end_date_time': now + timedelta(days=2) if kind != 2 else None,
+                'time_duration': 30, 'is_anytime_quiz': kind == 2, 'is_active': True,
+                'auto_expire': True, 'grace_period': 0, 'allow_multiple_attempts': False,
+                'show_results_immediately': True, 'remarks': '', 'question_count': questions_per_quiz,
+                'created_at': now, 'updated_at': now
+            })
+    if quiz_rows:
+        db.session.execute(Quiz.__table__.insert(), quiz_rows)
+
+    question_rows = []
+    for quiz in quiz_rows:
+        for n in range(questions_per_quiz):
+            question_rows.append({
+                'question_id': len(question_rows) + 1, 'quiz_id': quiz['quiz_id'],
+                'question_statement': f'Question {n}?', 'option1': 'A', 'option2': 'B',
+                'option3': 'C', 'option4': 'D', 'correct_option': n % 4 + 1,
+                'created_at': now, 'updated_at': now
+            })
+    if question_rows:
+        db.session.execute(Question.__table__.insert(), question_rows)
+
+    user_rows = [{
+        'user_id': u, 'user_name': f'student{u}@example.com', 'password_hash': 'x',
+        'full_name': f'Student {u}', 'is_admin': False, 'created_at': now
+    } for u in range(1, users + 1)]
+    if user_rows:
+        db.session.execute(User.__table__.insert(), user_rows)
+
+    score_rows = []
+    for u in range(1, users + 1):
+        for n in range(min(scores_per_user, len(quiz_rows))):
+            quiz_id = (u + n) % len(quiz_rows) + 1
+            score_rows.append({
+                'quiz_id': quiz_id, 'user_id': u, 'total_questions': questions_per_quiz,
+                'correct_answers': 0, 'total_score': float((u * 7 + n * 13) % 101),
+                'time_taken': 60 + n, 'attempt_datetime': now - timedelta(minutes=n)
+            })
+    if score_rows:
+        db.session.execute(Score.__table__.insert(), score_rows)
+
+    db.session.commit()
+    if score_rows:
+        from backend.user_stats import rebuild_user_stats
+        rebuild_user_stats()
+    return {
+        'subjects': subjects,
+        'chapters': len(chapter_rows),
+        'quizzes': len(quiz_rows),
+        'questions': len(question_rows),
+        'users': users,
+        'scores': len(score_rows)
+    }
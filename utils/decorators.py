@@ -1,7 +1,8 @@
+import hmac
 from functools import wraps
-from flask import jsonify
+from flask import current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from backend.models.models import User
+from backend.identity import current_identity, current_user_row
 
 def admin_required(f):
     """Decorator to require admin role"""
@@ -22,17 +23,37 @@ def admin_required(f):
     
     return decorated_function
 
+def metrics_token_required(f):
+    """Decorator to require the static METRICS_SCRAPE_TOKEN as a Bearer token
+
+    For metrics scrapers, which cannot log in; the endpoint is closed while
+    no token is configured.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        expected = current_app.config.get('METRICS_SCRAPE_TOKEN')
+        if not expected:
+            return jsonify({'error': 'Metrics scraping is not configured'}), 403
+
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme != 'Bearer' or not hmac.compare_digest(token.encode(), expected.encode()):
+            return jsonify({'error': 'Invalid metrics token'}), 401
+
+        return f(*args, **kwargs)
+
+    return decorated_function
+
 def user_required(f):
     """Decorator to require authenticated user (admin or regular user)"""
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
         try:
-            current_user = get_jwt_identity()
-            if not current_user:
+            if not get_jwt_identity():
                 return jsonify({'error': 'Invalid token'}), 401
                 
-            user = User.query.filter_by(user_name=current_user).first()
+            # Resolved from the token claims and reused by the view
+            user = current_identity()
             
             if not user:
                 return jsonify({'error': 'User not found'}), 404
@@ -46,9 +67,8 @@ def user_required(f):
 def get_current_user():
     """Helper function to get current user object"""
     try:
-        current_user = get_jwt_identity()
-        if not current_user:
+        if not get_jwt_identity():
             return None
-        return User.query.filter_by(user_name=current_user).first()
+        return current_user_row()
     except:
         return None
\ No newline at end of file
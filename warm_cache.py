@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Warm the cache after a deploy or seed run
+
+Usage: python warm_cache.py [--hours N] [--concurrency N] [--async]
+"""
+
+import argparse
+from app import create_app
+from backend.cache_warmup import warm_cache, WARMUP_HOURS_AHEAD, WARMUP_CONCURRENCY
+
+def print_report(report):
+    for error in report['errors']:
+        print(f"❌ {error}")
+    print(f"✅ Warmed {report['warmed']} cache keys in {report['duration_seconds']}s")
+    for key in report['keys']:
+        print(f"   - {key}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Prefetch hot cache entries')
+    parser.add_argument('--hours', type=int, default=WARMUP_HOURS_AHEAD,
+                        help='warm payloads of quizzes starting within this many hours')
+    parser.add_argument('--concurrency', type=int, default=WARMUP_CONCURRENCY,
+                        help='maximum warm-up jobs running at once')
+    parser.add_argument('--async', dest='run_async', action='store_true',
+                        help='queue the warm-up on a Celery worker instead')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.run_async:
+            from backend.api.quiz_tasks import warm_cache_task
+            task = warm_cache_task.delay(args.hours, args.concurrency)
+            print(f"🚀 Cache warm-up queued (task {task.id})")
+            return
+
+        print("🔥 Warming cache...")
+        print_report(warm_cache(args.hours, args.concurrency))
+
+if __name__ == "__main__":
+    main()